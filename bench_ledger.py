@@ -0,0 +1,100 @@
+""" ledger history query -- before/after the (account_id|destination_account_id, created_at) indexes
+
+usage: DATABASE_URL=postgresql://... python bench_ledger.py --rows 10000000
+without DATABASE_URL it seeds a sqlite file in the system temp dir (<tmp>/bench_ledger.db, reused across runs)
+"""
+import os
+import time
+import random
+import argparse
+import statistics
+import tempfile
+from datetime import datetime, timedelta
+
+if not os.environ.get('DATABASE_URL'): os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'bench_ledger.db')}" # never in the cwd/repo
+
+from sqlalchemy import text, insert, func
+from src.app import create_app
+from src.models import db, User, Account, Transaction
+from src.managers.AccountManager import AccountManager
+
+LEDGER_INDEXES = {
+    'ix_transactions_account_created': '(account_id, created_at)',
+    'ix_transactions_destination_created': '(destination_account_id, created_at)',
+}
+CHUNK = 50000
+
+def seed(n_rows, n_accounts):
+    have = db.session.query(func.count(Transaction.transaction_id)).scalar()
+    if have >= n_rows: print(f" === ledger alr seeded -- {have} rows ==="); return Account.query.with_entities(Account.account_id).limit(n_accounts).all()
+
+    user = User(username='bench', password='$2b$12$not_a_real_hash', email='bench@bankingsystem.com', full_name='Bench User')
+    db.session.add(user)
+    db.session.commit()
+    accIds = [f"bench-acc-{i:07d}" for i in range(n_accounts)]
+    db.session.execute(insert(Account), [{'account_id': a, 'user_id': user.user_id, 'account_type': 'Checking', 'balance': 0, 'account_number': f"9{i:09d}", 'active': True} for i, a in enumerate(accIds)])
+    db.session.commit()
+
+    start = datetime(2022, 1, 1)
+    rnd = random.Random(42)
+    t0 = time.perf_counter()
+    for off in range(0, n_rows, CHUNK):
+        rows = []
+        for i in range(off, min(off + CHUNK, n_rows)):
+            isTransfer = rnd.random() < 0.3
+            rows.append({
+                'transaction_id': f"bench-tr-{i:09d}",
+                'account_id': rnd.choice(accIds),
+                'transaction_type': 'transfer' if isTransfer else rnd.choice(['deposit', 'withdrawal']),
+                'amount': round(rnd.uniform(1, 500), 2),
+                'description': 'bench',
+                'destination_account_id': rnd.choice(accIds) if isTransfer else None,
+                'created_at': start + timedelta(seconds=rnd.randrange(3 * 365 * 86400)),
+            })
+        db.session.execute(insert(Transaction), rows)
+        db.session.commit()
+        done = off + len(rows)
+        print(f" -- seeded {done}/{n_rows} rows | {done / (time.perf_counter() - t0):.0f} rows/s", end='\r')
+    print()
+    return [(a,) for a in accIds]
+
+def set_indexes(on):
+    for name, cols in LEDGER_INDEXES.items():
+        db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON transactions {cols}" if on else f"DROP INDEX IF EXISTS {name}"))
+    db.session.commit()
+    if db.engine.dialect.name == 'postgresql': db.session.execute(text("ANALYZE transactions")); db.session.commit()
+
+def time_ms(fn, samples):
+    res = []
+    for accId in samples:
+        t0 = time.perf_counter()
+        fn(accId)
+        res.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(res), max(res)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--accounts', type=int, default=20_000)
+    parser.add_argument('--samples', type=int, default=50)
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        accs = seed(args.rows, args.accounts)
+        samples = [a[0] for a in random.Random(7).sample(accs, min(args.samples, len(accs)))]
+        acc_manager = AccountManager()
+
+        or_query = lambda accId: Transaction.query.filter((Transaction.account_id == accId) | (Transaction.destination_account_id == accId)).order_by(Transaction.created_at.desc()).limit(args.limit).all()
+        union_page = lambda accId: acc_manager.get_transactions_page(account_id=accId, limit=args.limit)
+
+        print(f"\n ==== {db.engine.dialect.name} | {args.rows} rows | {len(samples)} accounts sampled | page of {args.limit} ====")
+        set_indexes(False)
+        print(" -- before | OR query, no indexes      -- median %.2f ms | max %.2f ms" % time_ms(or_query, samples))
+        set_indexes(True)
+        print(" -- after  | OR query, indexed         -- median %.2f ms | max %.2f ms" % time_ms(or_query, samples))
+        print(" -- after  | UNION ALL page, indexed   -- median %.2f ms | max %.2f ms" % time_ms(union_page, samples))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+""" gunicorn settings -- picked up from the cwd by any `gunicorn run:app` (Procfile, render start cmd..)
+
+gthread → a login waiting on bcrypt holds one thread, not the whole worker, so deposits/transfers keep flowing
+n the hasher's queue cap (threads per worker) can actually fill n shed. WEB_CONCURRENCY (workers) is read by gunicorn itself
+"""
+import os
+
+worker_class = os.environ.get('WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('WEB_THREADS', 4))
+
+# workers fork from this process → db_pool + password_hasher size themselves for the same class/threads
+os.environ.setdefault('WORKER_CLASS', worker_class)
+os.environ.setdefault('WEB_THREADS', str(threads))
+
+# bcrypt cost measured once here, before the fork → all workers share it (per worker calibration → differing costs → rehash churn)
+from src.utils.password_hasher import calibrate_from_env
+calibrate_from_env()
+
+
+def on_starting(server): # master, once per start → migrations + seed before workers fork | INIT_DB_ON_START=0 → only via `flask init-db`
+    if os.environ.get('INIT_DB_ON_START', '1') == '0': return
+    from src.app import bootstrap_once
+    bootstrap_once()
+
+
+def child_exit(server, worker): # worker gone → its metric file folded into the archive (METRICS_MULTIPROC_DIR) | pid may be reused next
+    from src.utils.metrics import REGISTRY
+    REGISTRY.mark_process_dead(worker.pid)
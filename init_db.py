@@ -1,4 +1,4 @@
-from src.app import create_app, init_database
+from src.app import create_app, bootstrap_database
 from src.models import db
 
 def main():
@@ -16,7 +16,7 @@ def main():
 			db.drop_all() # to recreate
 			print("dropped old tables")
 
-		init_database()
+		bootstrap_database() # migrations to head + seed
 
 		print("\n ========= DB INIT IS DONE ========= ")
 		print("NOW data migration is possible -- python migrate_data.py")
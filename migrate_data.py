@@ -1,134 +1,189 @@
-import json
+""" json files → db | parallel + resumable: each input is cut into CHUNK_SIZE chunks, a process pool imports them
+stages run in fk order (users → accounts → transactions + loans), chunks of a stage fan out over the pool.
+a chunk is one txn: fk lookup for the whole chunk, bulk INSERT .. ON CONFLICT DO NOTHING, checkpoint row → commit.
+rerun after a crash → committed chunks are skipped (still parsed, the stream cant seek), the rest go in.
+inputs are streamed (top level array or .ndjson) → the parent holds at most 2 chunks per worker in memory
+usage: python migrate_data.py [--workers N] [--chunk-size N] """
 import os
+import time
+import argparse
 from datetime import datetime
+from itertools import zip_longest
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from sqlalchemy import select
 from src.app import create_app
-from src.models import db, User, Account, Transaction, Loan
+from src.models import db, User, Account, Transaction, Loan, MigrationCheckpoint
+from src.managers.AccountManager import AccountManager
+from src.utils.password_hasher import hash_password
+from src.utils.json_utils import iter_json
 
-def load_json_data(file_path):
-    if os.path.exists(file_path):
-        with open(file_path, 'r') as f: return json.load(f)
-    return []
-
-def migrate_users():
-    usrData = load_json_data('data/users.json')
-    migrCnt = 0
-    skipCnt = 0
-
-    for udata in usrData:
-        xstUsr = User.query.filter((User.user_id == udata['user_id']) | (User.username == udata['username'])).first()
-        if xstUsr: print(f" ==== SKIPPI USER -- '{udata['username']}' | alr exists ==== "); skipCnt += 1; continue
-
-        try:
-            user = User(
-                username=udata['username'],
-                password=udata['password'],
-                email=udata['email'],
-                full_name=udata['full_name'],
-                role=udata.get('role', 'user'))
-            user.user_id = udata['user_id']
-            user.created_at = datetime.fromisoformat(udata['created_at'])
-
-            db.session.add(user)
-            migrCnt += 1
-            print(f" ==== MIGRATED USER -- {udata['username']} ==== ")
+CHUNK_SIZE = int(os.environ.get('MIGRATE_CHUNK_SIZE', 5000))
+WORKERS = int(os.environ.get('MIGRATE_WORKERS', os.cpu_count() or 1)) # 0 → inline, no pool
 
-        except Exception as e: print(f" === EROR MIGRATING USER -- {udata['username']}: {e} === "); continue
+def data_file(name): return f'data/{name}.ndjson' if os.path.exists(f'data/{name}.ndjson') else f'data/{name}.json'
 
-    if migrCnt>0: db.session.commit()
-    print(f" ===== USERS: {migrCnt} migrated | {skipCnt} skipped")
-
-def migrate_accounts():
-    accsData = load_json_data('data/accounts.json')
-    migrCnt = 0
-    skipCnt = 0
-
-    for accdata in accsData:
-        xstAcc = Account.query.filter_by(account_id=accdata['account_id']).first()
-        if xstAcc: print(f" === SKIPPING ACC -- '{accdata['account_number']}' | alr exists === "); skipCnt += 1; continue
-
-        usrXst = User.query.filter_by(user_id=accdata['user_id']).first()
-        if not usrXst: print(f" === SKIPPING ACC -- '{accdata['account_number']}' | user not found === "); skipCnt += 1; continue
+def load_json_data(file_path): # lazy → records stream into the chunker while the file is still being read
+    if os.path.exists(file_path): return iter_json(file_path)
+    return []
 
+def _parse_dt(val): return datetime.fromisoformat(val) if val else datetime.utcnow()
+
+def _user_row(u): return {
+    'user_id': u['user_id'],
+    'username': u['username'],
+    'password': u['password'] if u['password'].startswith('$2b$') else hash_password(u['password']), # bcrypt runs in the workers
+    'email': u['email'],
+    'full_name': u['full_name'],
+    'role': u.get('role', 'user'),
+    'created_at': _parse_dt(u.get('created_at'))}
+
+def _account_row(a): return {
+    'account_id': a['account_id'],
+    'user_id': a['user_id'],
+    'account_type': a['account_type'],
+    'balance': a['balance'],
+    'account_number': a['account_number'],
+    'created_at': _parse_dt(a.get('created_at')),
+    'active': a.get('active', True)}
+
+def _transaction_row(t): return {
+    'transaction_id': t['transaction_id'],
+    'account_id': t['account_id'],
+    'transaction_type': t['transaction_type'],
+    'amount': t['amount'],
+    'description': t.get('description'),
+    'destination_account_id': t.get('destination_account_id'),
+    'created_at': _parse_dt(t.get('created_at'))}
+
+def _loan_row(l): return {
+    'loan_id': l['loan_id'],
+    'user_id': l['user_id'],
+    'loan_type': l['loan_type'],
+    'amount': l['amount'],
+    'interest_rate': l['interest_rate'],
+    'term_months': l['term_months'],
+    'purpose': l.get('purpose'),
+    'status': l.get('status', 'pending'),
+    'created_at': _parse_dt(l.get('created_at')),
+    'approved_at': _parse_dt(l['approved_at']) if l.get('approved_at') else None,
+    'balance': l.get('balance', l['amount'])}
+
+TABLES = { # name → (label, model, record → row, fk fields → parent pk they must exist in)
+    'users': ("USERS", User, _user_row, {}),
+    'accounts': ("ACCS", Account, _account_row, {'user_id': User.user_id}),
+    'transactions': ("TRANSACTIONS", Transaction, _transaction_row, {'account_id': Account.account_id, 'destination_account_id': Account.account_id}),
+    'loans': ("LOANS", Loan, _loan_row, {'user_id': User.user_id}),
+}
+STAGES = (('users',), ('accounts',), ('transactions', 'loans')) # a stage only points at earlier ones → its tables run side by side
+
+def _present(records, fks): # fk field → keys that exist | one IN query per parent table per chunk, not per row
+    found = {}
+    for col in set(fks.values()):
+        fields = [f for f, c in fks.items() if c is col]
+        wanted = {rec[f] for rec in records for f in fields if isinstance(rec.get(f), str)}
+        keys = {k for (k,) in db.session.execute(select(col).where(col.in_(wanted)))} if wanted else set()
+        for f in fields: found[f] = keys
+    return found
+
+def import_chunk(name, source, chunk_no, records):
+    """ one chunk, one txn → rows n checkpoint commit together, a chunk is either fully done or not at all
+    rows hitting any unique key (pk, username, account_number..) are dropped by the db → concurrent chunks n reruns are safe
+    returns (name, rows, inserted, bad) """
+    label, model, to_row, fks = TABLES[name]
+    table = model.__table__
+    stmt = AccountManager._dialect_insert(table).on_conflict_do_nothing().returning(table.primary_key.columns.values()[0]) # returned pks = rows that went in
+    found = _present(records, fks)
+    rows, bad = [], 0
+    for rec in records:
         try:
-            acc = Account(user_id=accdata['user_id'],account_type=accdata['account_type'],balance=accdata['balance'],account_number=accdata['account_number'])
-            acc.account_id = accdata['account_id']
-            acc.created_at = datetime.fromisoformat(accdata['created_at'])
-            acc.active = accdata.get('active', True)
-
-            db.session.add(acc)
-            migrCnt += 1
-            print(f" ==== MIGRATED ACCS -- {accdata['account_number']} ==== ")
+            if any(rec.get(f) is not None and rec[f] not in found[f] for f in fks): continue # orphan → counted as skipped
+            rows.append(to_row(rec))
+        except (KeyError, ValueError, TypeError, AttributeError) as e: print(f" !!! BAD {label} RECORD -- {e!r} !!! "); bad += 1
 
-        except Exception as e:
-            print(f" === EROR MIGRAING ACC {accdata['account_number']}: {e} === ")
-            continue
-
-    if migrCnt>0: db.session.commit()
-    print(f" ===== ACCS: {migrCnt} migrated | {skipCnt} skipped ===== ")
-
-def migrate_transactions():
-    transacData = load_json_data('data/transactions.json')
-    migrCnt = 0
-    skipCnt = 0
-
-    for trdata in transacData:
-        xstTrsc = Transaction.query.filter_by(transaction_id=trdata['transaction_id']).first()
-        if xstTrsc: skipCnt += 1; continue
-
-        accXsts = Account.query.filter_by(account_id=trdata['account_id']).first()
-        if not accXsts: print(f" !!!!!! SKIPPIN TRANSAC CUZ ACC NOT FOUND !!!!!!"); skipCnt += 1; continue
-
-        try:
-            transac = Transaction(
-                account_id=trdata['account_id'],
-                transaction_type=trdata['transaction_type'],
-                amount=trdata['amount'],
-                description=trdata.get('description'),
-                destination_account_id=trdata.get('destination_account_id'))
-            transac.transaction_id = trdata['transaction_id']
-            transac.created_at = datetime.fromisoformat(trdata['created_at'])
-            db.session.add(transac)
-            migrCnt += 1
-
-        except Exception as e: print(f" !!!!!! Error migrating transaction -- {e}"); continue
-
-    if migrCnt>0: db.session.commit()
-    print(f" ===== TRANSACTOINS: {migrCnt} migrated | {skipCnt} skipped")
-
-def migrate_loans():
-    loansData = load_json_data('data/loans.json')
-    migrCnt = 0
-    skipCnt = 0
-
-    for ldata in loansData:
-        xstLoan = Loan.query.filter_by(loan_id=ldata['loan_id']).first()
-        if xstLoan: skipCnt += 1; continue
-
-        usrXst = User.query.filter_by(user_id=ldata['user_id']).first()
-        if not usrXst: print(f" === SKIPPING LOAN | user not found === "); skipCnt += 1; continue
+    try:
+        inserted = len(db.session.execute(stmt, rows).all()) if rows else 0
+        db.session.add(MigrationCheckpoint(source=source, chunk=chunk_no, rows=len(records), inserted=inserted))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return name, len(records), inserted, bad
+
+def _source(name, path): # checkpoint key | file identity by size + mtime (a rewritten file gets imported again, no-op rows are cheap) @ chunk size
+    st = os.stat(path)
+    return f"{name}:{os.path.basename(path)}:{st.st_size}:{int(st.st_mtime)}"[:240] + f"@{CHUNK_SIZE}"
+
+def _chunks(name, path):
+    """ (name, source, chunk_no, records) for every chunk not checkpointed yet | skipped ones are still read past
+    chunk numbers only mean something at one chunk size → resuming w another one raises instead of skipping the wrong rows """
+    source = _source(name, path)
+    fileId = source.rsplit('@', 1)[0]
+    done = set()
+    for src, c in db.session.execute(select(MigrationCheckpoint.source, MigrationCheckpoint.chunk).where(MigrationCheckpoint.source.startswith(fileId + '@', autoescape=True))):
+        if src != source: raise ValueError(f"{path} was partly imported w chunk size {src.rsplit('@', 1)[1]} -- resume w --chunk-size {src.rsplit('@', 1)[1]}")
+        done.add(c)
+    db.session.commit() # end the read txn → sqlite writers in the pool arent blocked by it
+    chunk, chunk_no = [], 0
+    for rec in load_json_data(path):
+        chunk.append(rec)
+        if len(chunk) < CHUNK_SIZE: continue
+        if chunk_no not in done: yield name, source, chunk_no, chunk
+        chunk, chunk_no = [], chunk_no + 1
+    if chunk and chunk_no not in done: yield name, source, chunk_no, chunk
+
+def _interleave(*gens): # round robin → tables of one stage share the pool instead of queueing behind each other
+    gap = object()
+    return (job for jobs in zip_longest(*gens, fillvalue=gap) for job in jobs if job is not gap)
+
+def _run_stage(jobs, workers, pool, done):
+    if pool is None:
+        for job in jobs: done(import_chunk(*job))
+        return
+    inflight = set()
+    for job in jobs:
+        inflight.add(pool.submit(import_chunk, *job))
+        if len(inflight) < 2 * workers: continue # bounded → streaming parent keeps constant memory
+        finished, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+        for f in finished: done(f.result())
+    for f in wait(inflight).done: done(f.result())
+
+def _init_worker(): # own app → own engine → own connections | nothing inherited from the parents pool is touched
+    os.environ['AUTO_INIT_DB'] = '0' # the parent alr has the schema → no alembic/seed per worker, even if set for local dev
+    create_app().app_context().push()
+
+def run_pipeline(paths, workers=WORKERS):
+    """ {table name: json path} → {table name: (inserted, skipped)} | needs an app ctx (reads checkpoints in the parent)
+    a failed chunk stops the run after the in flight ones land → rerun picks up from the checkpoints """
+    totals = {name: [0, 0, 0] for name in paths} # rows, inserted, bad
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker) if workers else None
+    t0 = time.perf_counter()
+
+    def done(res):
+        name, rows, inserted, bad = res
+        tot = totals[name]
+        tot[0] += rows; tot[1] += inserted; tot[2] += bad
+        rowCnt = sum(t[0] for t in totals.values())
+        print(f" -- {TABLES[name][0]}: {tot[0]} rows | {rowCnt / (time.perf_counter() - t0):.0f} rows/s overall", end='\r')
 
-        try:
-            loan = Loan(
-                user_id=ldata['user_id'],
-                loan_type=ldata['loan_type'],
-                amount=ldata['amount'],
-                interest_rate=ldata['interest_rate'],
-                term_months=ldata['term_months'],
-                purpose=ldata.get('purpose'),
-                status=ldata.get('status', 'pending'),
-                balance=ldata.get('balance', ldata['amount']))
-            loan.loan_id = ldata['loan_id']
-            loan.created_at = datetime.fromisoformat(ldata['created_at'])
-            if ldata.get('approved_at'): loan.approved_at = datetime.fromisoformat(ldata['approved_at'])
-
-            db.session.add(loan)
-            migrCnt += 1
-            print(f" ==== MIGRATED LOAN -- {ldata['loan_type']} - ${ldata['amount']} ==== ")
-
-        except Exception as e: print(f" === ERROR MIGRATNG LOAN {e} === "); continue
-
-    if migrCnt>0: db.session.commit()
-    print(f" ==== LOANS -- {migrCnt} migrated | {skipCnt} skipped")
+    try:
+        for stage in STAGES:
+            names = [n for n in stage if n in paths]
+            _run_stage(_interleave(*(_chunks(n, paths[n]) for n in names)), workers, pool, done)
+            print()
+            for n in names: print(f" ===== {TABLES[n][0]}: {totals[n][1]} migrated | {totals[n][0] - totals[n][1]} skipped" + (f" ({totals[n][2]} bad)" if totals[n][2] else ''))
+    finally:
+        if pool: pool.shutdown(cancel_futures=True)
+
+    secs = time.perf_counter() - t0
+    rowCnt = sum(t[0] for t in totals.values())
+    print(f" -- {rowCnt} rows in {secs:.2f}s | {rowCnt / secs if secs else 0:.0f} rows/s | {workers or 'no'} workers")
+    return {name: (t[1], t[0] - t[1]) for name, t in totals.items()}
+
+# single table, inline -- for scripts n tests | same chunks n checkpoints as the pipeline
+def migrate_users(path=None): return run_pipeline({'users': path or data_file('users')}, workers=0)['users']
+def migrate_accounts(path=None): return run_pipeline({'accounts': path or data_file('accounts')}, workers=0)['accounts']
+def migrate_transactions(path=None): return run_pipeline({'transactions': path or data_file('transactions')}, workers=0)['transactions']
+def migrate_loans(path=None): return run_pipeline({'loans': path or data_file('loans')}, workers=0)['loans']
 
 def show_database_summary(): # show curr DB state
     try:
@@ -150,34 +205,42 @@ def show_database_summary(): # show curr DB state
 
     except Exception as e: print(f" !!! EEROR DISPLAYING DB SUMMARY -- {e} !!!")
 
-def main():
+def main(argv=None):
+    global CHUNK_SIZE
+    parser = argparse.ArgumentParser(description="json files → db, parallel n resumable")
+    parser.add_argument('--workers', type=int, default=None, help=f"import processes (default {WORKERS}, sqlite 0 → inline)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="records per chunk = per txn n checkpoint")
+    args = parser.parse_args(argv)
+    CHUNK_SIZE = args.chunk_size
+
     print(" Starting data migration from JSON to DB...")
 
-    json_files = ['data/users.json', 'data/accounts.json', 'data/transactions.json', 'data/loans.json']
-    xstFls = [f for f in json_files if os.path.exists(f)]
-    missFls = [f for f in json_files if not os.path.exists(f)]
+    json_files = {n: data_file(n) for n in TABLES}
+    xstFls = {n: f for n, f in json_files.items() if os.path.exists(f)}
+    missFls = [f for f in json_files.values() if not os.path.exists(f)]
 
     if missFls: print(f" !!! missing JSON files -- {missFls} !!! ")
 
     if not xstFls: print(" ##### no json files found ##### "); return
 
-    print(f" ===== FOUND JSON FILES -- {xstFls} =====")
+    print(f" ===== FOUND JSON FILES -- {list(xstFls.values())} =====")
     app = create_app()
     with app.app_context():
         try:
             User.query.count()  # test query
+            MigrationCheckpoint.query.count()
             print(" ===== DB connection verified =====") # db prperly inited
         except Exception as e:
             print(f" !!! DB NOT PROPERLY INITTED -- {e}")
             print(" !!! FIX -- run: `python init_db.py`")
             return
 
+        workers = args.workers
+        if workers is None: workers = 0 if db.engine.dialect.name == 'sqlite' else WORKERS # one sqlite writer at a time → a pool only adds lock waits
+
         print("\n === migrating data... === ")
 
-        migrate_users()
-        migrate_accounts()
-        migrate_transactions()
-        migrate_loans()
+        run_pipeline(xstFls, workers)
         show_database_summary()
 
         print(" ++++++++++++++++++++++++++++++++++++++")
@@ -185,4 +248,4 @@ def main():
         print(" ++++++++++++++++++++++++++++++++++++++")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,12 +1,16 @@
 import os
+import sys
 import logging
-from src.app import create_app
+from src.utils.startup_profile import startup_profiler # 1st → its import hook sees everything below load
+if '--profile-startup' in sys.argv: startup_profiler.enable() # or PROFILE_STARTUP=1 (gunicorn)
 
 # for prod
 logging.basicConfig(level=logging.INFO,format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-app = create_app()
+with startup_profiler.phase('import_app'): from src.app import create_app
+with startup_profiler.phase('create_app'): app = create_app()
+startup_profiler.report()
 
 if __name__ == '__main__':
     # for local
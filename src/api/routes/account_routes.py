@@ -1,4 +1,8 @@
-from flask import Blueprint, request, jsonify
+import io
+import csv
+import json
+from datetime import datetime, timedelta, time
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from flask_jwt_extended import jwt_required
 from src.managers.AccountManager import AccountManager
 from src.utils.jwt_auth import admin_required, get_current_user
@@ -135,6 +139,33 @@ def transfer():
     except ValueError as e: return jsonify(error=str(e)), 400
 
 
+@account_bp.route('/transfers/batch', methods=['POST'])
+@jwt_required()
+def batch_transfer(): # payroll style -- one source, many dests, one db transac
+    currUser = get_current_user()
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict): return jsonify(error="request body must be a JSON object"), 400
+    required_fields = ['from_account_id', 'transfers']
+    for ff in required_fields:
+        if ff not in data: return jsonify(error=f"missing required field: {ff}"), 400
+    if not isinstance(data['from_account_id'], str): return jsonify(error="from_account_id must be a string"), 400
+    if not isinstance(data['transfers'], list) or not data['transfers']: return jsonify(error="transfers must be a non-empty list"), 400
+    for i, item in enumerate(data['transfers']): # structure → 400 | bad amounts / unknown dests stay per item results
+        if not isinstance(item, dict): return jsonify(error=f"transfers[{i}] must be an object"), 400
+        if 'to_account_id' in item and not isinstance(item['to_account_id'], str): return jsonify(error=f"transfers[{i}].to_account_id must be a string"), 400
+    if data.get('description') is not None and not isinstance(data['description'], str): return jsonify(error="description must be a string"), 400
+
+    from_account = account_manager.get_account_by_id(data['from_account_id'])
+    if not from_account: return jsonify(error="source account not found"), 404
+    if currUser['role'] != 'admin' and from_account.user_id != currUser['user_id']: return jsonify(error="unauthorized access to source account"), 403
+
+    try:
+        res = account_manager.batch_transfer(data['from_account_id'], data['transfers'], data.get('description'))
+        okCnt = sum(1 for rr in res if rr['status'] == 'ok')
+        return jsonify(message="batch transfer processed", succeeded=okCnt, failed=len(res)-okCnt, results=res), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+
 @account_bp.route('/<account_id>/transactions', methods=['GET'])
 @jwt_required()
 def get_account_transactions(account_id):
@@ -142,17 +173,90 @@ def get_account_transactions(account_id):
     acc = account_manager.get_account_by_id(account_id)
     if not acc: return jsonify(error="account not found"), 404
     if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
-    transcs = account_manager.get_transactions(account_id=account_id)
-    res = []
-    for tr in transcs: res.append(tr.to_dict())
-    return jsonify(transactions=res),200
+    return _transactions_page(account_id=account_id)
 
 
 @account_bp.route('/user/transactions', methods=['GET'])
 @jwt_required()
 def get_user_transactions():
     currUser = get_current_user()
-    transcs = account_manager.get_transactions(user_id=currUser['user_id'])
+    return _transactions_page(user_id=currUser['user_id'])
+
+
+@account_bp.route('/<account_id>/balance', methods=['GET'])
+@jwt_required()
+def get_account_balance(account_id): # ?as_of= date (end of that day) or timestamp | no as_of → current balance
+    currUser = get_current_user()
+    acc = account_manager.get_account_by_id(account_id)
+    if not acc: return jsonify(error="account not found"), 404
+    if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
+
+    if not request.args.get('as_of'): return jsonify(account_id=account_id, as_of=None, balance=float(acc.balance)), 200
+    try: as_of = _parse_as_of(request.args['as_of'])
+    except ValueError: return jsonify(error="as_of must be an ISO date (YYYY-MM-DD) or timestamp"), 400
+    return jsonify(account_id=account_id, as_of=as_of.isoformat(), balance=account_manager.get_balance_as_of(account_id, as_of)), 200
+
+
+def _parse_as_of(value): # bare date → closing balance of that day
+    dt = datetime.fromisoformat(value)
+    return datetime.combine(dt.date(), time.max) if len(value) == 10 else dt
+
+
+@account_bp.route('/<account_id>/statement', methods=['GET'])
+@jwt_required()
+def get_account_statement(account_id): # ?format=ndjson|csv&from=&to= | streamed, one row at a time
+    currUser = get_current_user()
+    acc = account_manager.get_account_by_id(account_id)
+    if not acc: return jsonify(error="account not found"), 404
+    if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
+
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in STATEMENT_FORMATS: return jsonify(error=f"format must be one of {list(STATEMENT_FORMATS)}"), 400
+    try:
+        date_from = _parse_statement_date(request.args.get('from'))
+        date_to = _parse_statement_date(request.args.get('to'), end=True)
+    except ValueError: return jsonify(error="from/to must be ISO dates (YYYY-MM-DD or full timestamp)"), 400
+
+    rows = account_manager.iter_statement(account_id, date_from, date_to)
+    mimetype, lines = STATEMENT_FORMATS[fmt]
+    headers = {'Content-Disposition': f"attachment; filename=statement-{acc.account_number}.{fmt}"}
+    return Response(stream_with_context(lines(rows)), mimetype=mimetype, headers=headers)
+
+
+def _parse_statement_date(value, end=False): # bare date as `to` → whole day included
+    if not value: return None
+    dt = datetime.fromisoformat(value)
+    return dt + timedelta(days=1) if end and len(value) == 10 else dt
+
+
+def _ndjson_lines(rows):
+    for tr in rows: yield json.dumps(tr.to_dict()) + '\n'
+
+
+def _csv_lines(rows):
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=STATEMENT_CSV_FIELDS)
+
+    def drain(): # one csv line out of the reused buffer
+        line = buf.getvalue()
+        buf.seek(0); buf.truncate()
+        return line
+
+    writer.writeheader()
+    yield drain() # header goes out before the first row is even fetched
+    for tr in rows:
+        writer.writerow(tr.to_dict())
+        yield drain()
+
+
+STATEMENT_CSV_FIELDS = ['transaction_id', 'account_id', 'transaction_type', 'amount', 'description', 'destination_account_id', 'created_at']
+STATEMENT_FORMATS = {'ndjson': ('application/x-ndjson', _ndjson_lines), 'csv': ('text/csv', _csv_lines)}
+
+
+def _transactions_page(**filters): # ?limit=&cursor= → one page + next_cursor (null on last page)
+    try:
+        transcs, nextCursor = account_manager.get_transactions_page(limit=request.args.get('limit', type=int), cursor=request.args.get('cursor'), **filters)
+    except ValueError as e: return jsonify(error=str(e)), 400
     res = []
     for tr in transcs: res.append(tr.to_dict())
-    return jsonify(transactions=res),200
\ No newline at end of file
+    return jsonify(transactions=res, next_cursor=nextCursor),200
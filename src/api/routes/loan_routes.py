@@ -1,10 +1,12 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from src.managers.LoanManager import LoanManager
+from src.managers.AccountManager import AccountManager
 from src.utils.jwt_auth import admin_required, get_current_user
 
 loan_bp = Blueprint('loans', __name__)
 loan_manager = LoanManager()
+account_manager = AccountManager()
 
 
 @loan_bp.route('', methods=['GET'])
@@ -70,25 +72,16 @@ def make_payment(loan_id):
         amount = float(data['amount'])
         accId = data['account_id']
 
-        from src.managers.AccountManager import AccountManager
-        acc_manager = AccountManager()
-        acc = acc_manager.get_account_by_id(accId) # get bank acc -- funds to pay the loan
+        acc = account_manager.get_account_by_id(accId) # get bank acc -- funds to pay the loan
 
         if not acc: return jsonify(error="account not found"), 404
         if curUser['role'] != 'admin' and acc.user_id != curUser['user_id']: return jsonify(error="unauthorized access to loan"), 403
         if acc.balance < amount: return jsonify(error="insufficient funds in selected account"), 400
 
-        # withdrawing from acc first
-        try: acc_manager.withdraw(accId, amount, f"Payment  for {loan.loan_type} loan")
-        except ValueError as e: return jsonify(error=str(e)), 400
-
-        # AND THEEEEEEEN MAKE LOAN PAYMENT
-        newBlnc = loan_manager.make_payment(loan_id, amount)
-        if newBlnc is not None:
-            return jsonify(message="payment successful", balance=newBlnc), 200
-        else:
-            acc_manager.deposit(accId, amount, f"Refund for failed {loan.loan_type} loan payment")
-            return jsonify(error="failed to process payment"), 500 # UPD -- if loan payment fails → refund to the account
+        # UPD -- withdrawal n loan payment commit together → no refund needed if one side fails
+        newBlnc = loan_manager.make_payment(loan_id, amount, account_id=accId, description=f"Payment  for {loan.loan_type} loan")
+        if newBlnc is not None: return jsonify(message="payment successful", balance=newBlnc), 200
+        else: return jsonify(error="failed to process payment"), 500
     except ValueError as e: return jsonify(error=str(e)), 400
 
 
@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required
 
 from src.managers.UserManager import UserManager
 from src.utils.jwt_auth import generate_token, admin_required, get_current_user
+from src.utils.rate_limiter import login_limiter
 
 user_bp = Blueprint('users', __name__)
 user_manager = UserManager()
@@ -29,9 +30,11 @@ def login():
     data = request.get_json()
     if 'username' not in data or 'password' not in data: return jsonify(error="username and password are required"), 400
 
+    login_limiter.check(request.remote_addr, data['username']) # before any db/bcrypt work → 429
     user = user_manager.authenticate_user(data['username'], data['password'])
 
     if user: # generate jwt token
+        login_limiter.login_succeeded(data['username'])
         token = generate_token(user.user_id, user.username, user.role)
         return jsonify(
             message="login successful",
@@ -51,18 +54,10 @@ def login():
 @jwt_required()
 def get_profile():
     cUser = get_current_user()
-    user = user_manager.get_user_by_id(cUser['user_id'])
+    profile = user_manager.get_user_profile(cUser['user_id'])
 
-    if not user: return jsonify(error="user not found"), 404
-
-    return jsonify(
-        user_id=user.user_id,
-        username=user.username,
-        email=user.email,
-        full_name=user.full_name,
-        role=user.role,
-        created_at=user.created_at
-    ), 200
+    if not profile: return jsonify(error="user not found"), 404
+    return jsonify(**profile), 200
 
 
 @user_bp.route('/profile', methods=['PUT'])
@@ -104,17 +99,9 @@ def get_all_users(): # ADMIN ONLY
 @jwt_required()
 @admin_required
 def get_user(user_id): # ADMIN ONLY
-    user = user_manager.get_user_by_id(user_id)
-    if not user: return jsonify(error="user not found"), 404
-
-    return jsonify(
-        user_id=user.user_id,
-        username=user.username,
-        email=user.email,
-        full_name=user.full_name,
-        role=user.role,
-        created_at=user.created_at
-    ), 200
+    profile = user_manager.get_user_profile(user_id)
+    if not profile: return jsonify(error="user not found"), 404
+    return jsonify(**profile), 200
 
 
 @user_bp.route('/<user_id>', methods=['PUT'])
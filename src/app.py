@@ -1,17 +1,35 @@
-""" UPD -- no shell access in free tier of render → impl auto db init"""
+""" UPD -- no shell access in free tier of render → impl auto db init
+UPD -- create_app only checks the schema version, bootstrap (migrations + seed) runs once per deploy:
+`flask init-db` (Procfile release) or the gunicorn master's on_starting hook (render free tier → no release step).
+AUTO_INIT_DB=1 → create_app bootstraps too | local dev convenience, never in workers
+"""
 
 import os
 import logging
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, send_from_directory, jsonify, current_app
+from flask.cli import AppGroup
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
-from src.models import db, User, Account, Loan, Transaction
+from werkzeug.middleware.proxy_fix import ProxyFix
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from src.models import db, User, Account, Loan, Transaction, SCHEMA_VERSION
+from src.utils.db_lock import advisory_lock
+from src.utils.jwt_auth import admin_required
+from src.utils.health import ping_database, HealthDetails
 from src.utils.keepalive import setup_keepalive
+from src.utils import password_hasher
+from src.utils.password_hasher import HasherBusy
+from src.utils.rate_limiter import RateLimited
+from src.utils.startup_profile import startup_profiler
+from src.utils.query_metrics import init_query_metrics, metrics_view
+from src.utils.db_pool import engine_options, init_pool_metrics
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
 
 def create_app():
 	app = Flask(__name__, static_folder='../static', static_url_path='')
@@ -19,37 +37,45 @@ def create_app():
 	# prod configs
 	app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY')
 	app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY')
-
-	dbUrl = os.environ.get('DATABASE_URL')
-	if dbUrl:
-		if dbUrl.startswith('postgres://'): dbUrl = dbUrl.replace('postgres://', 'postgresql://', 1)
-		app.config['SQLALCHEMY_DATABASE_URI'] = dbUrl
-		logger.info(" === using pqsl db === ")
-	else: # for local dev
-		app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///banking.db'
-		logger.info(" === using SQLITE DB -- local === ")
-
-	app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-	app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_pre_ping': True,'pool_recycle': 300,}
-
-	CORS(app, origins="*")
-	jwt = JWTManager(app)
-	db.init_app(app)
-	migrate = Migrate(app, db)
-
-	# UPD -- AUTO INIT DB on first run
-	with app.app_context():
-		try: auto_initialize_database()
-		except Exception as e: logger.error(f" !!! DB INIT ERRROR --  {e} !!! ")
+	app.config['TRUSTED_PROXY_HOPS'] = int(os.environ.get('TRUSTED_PROXY_HOPS', 1 if os.environ.get('RENDER') else 0)) # render (sets RENDER) → 1 proxy in front | else 0: direct clients could forge X-Forwarded-For
+	if app.config['TRUSTED_PROXY_HOPS']: # remote_addr = real client, not the proxy → per ip login buckets arent one shared bucket
+		hops = app.config['TRUSTED_PROXY_HOPS']
+		app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops, x_host=hops)
+
+	_configure_db(app)
+
+	password_hasher.calibrate_from_env() # BCRYPT_CALIBRATE → highest cost under target latency | under gunicorn the master alr did it → no-op
+
+	with startup_profiler.phase('extensions'):
+		CORS(app, origins="*")
+		jwt = JWTManager(app)
+		db.init_app(app)
+		with app.app_context(): init_pool_metrics(db.engine)
+		app.cli.add_command(_lazy_migrate_cli(app), name='db') # alembic only loads when `flask db ...` runs
+		if os.environ.get('DB_METRICS'): init_query_metrics(app, db) # X-DB-* headers + per route histograms
+		if os.environ.get('METRICS_TOKEN') or os.environ.get('METRICS_PUBLIC') == '1': # off unless scrapers auth w the token, or explicitly public
+			app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+	with startup_profiler.phase('db_check'), app.app_context():
+		if os.environ.get('AUTO_INIT_DB') == '1':
+			try: bootstrap_database()
+			except Exception as e: logger.error(f" !!! DB INIT ERRROR --  {e} !!! ")
+		else: check_schema_version()
+
+	@app.cli.command('init-db')
+	def init_db_command(): # one-shot bootstrap -- migrations to head + seed if empty
+		res = bootstrap_database()
+		print(f" === {res['status']} -- {res['data']} === ") # cli output → stdout, alembic.ini sets root logging to WARN
 
 	# api routes
-	from src.api.routes.user_routes import user_bp
-	from src.api.routes.account_routes import account_bp
-	from src.api.routes.loan_routes import loan_bp
+	with startup_profiler.phase('blueprints'):
+		from src.api.routes.user_routes import user_bp
+		from src.api.routes.account_routes import account_bp
+		from src.api.routes.loan_routes import loan_bp
 
-	app.register_blueprint(user_bp, url_prefix='/api/v1/users')
-	app.register_blueprint(account_bp, url_prefix='/api/v1/accounts')
-	app.register_blueprint(loan_bp, url_prefix='/api/v1/loans')
+		app.register_blueprint(user_bp, url_prefix='/api/v1/users')
+		app.register_blueprint(account_bp, url_prefix='/api/v1/accounts')
+		app.register_blueprint(loan_bp, url_prefix='/api/v1/loans')
 
 	@app.route('/')
 	def index(): return send_from_directory(app.static_folder, 'index.html')
@@ -62,33 +88,113 @@ def create_app():
 	@app.errorhandler(404)
 	def not_found(e): return send_from_directory(app.static_folder, 'index.html'), 200
 
-	@app.route('/health')
-	def health(): # UPD -- added stability check endpoint for render
+	@app.errorhandler(HasherBusy) # bcrypt pool saturated → shed instead of queueing behind it
+	def hasher_busy(e): return jsonify(error="server busy, try again shortly"), 503, {'Retry-After': str(e.retry_after)}
+
+	@app.errorhandler(DBAPIError) # conn died under us (w/o pre_ping) → pool alr invalidated, a retry gets a fresh one
+	def db_error(e):
+		if not e.connection_invalidated: raise e
+		db.session.rollback()
+		return jsonify(error="database connection reset, retry"), 503, {'Retry-After': '1'}
+
+	@app.errorhandler(RateLimited)
+	def rate_limited(e): return jsonify(error=str(e)), 429, {'Retry-After': str(e.retry_after)}
+
+	@app.route('/livez')
+	def livez(): return {'status': 'alive', 'service': 'banking-system'}, 200 # no io -- process answers → alive
+
+	@app.route('/readyz')
+	@app.route('/health') # UPD -- render health check | was a COUNT(*) on users per probe
+	def readyz():
 		try:
-			user_count = User.query.count()
-			return {'status': 'healthy','service': 'banking-system','database': 'connected','users': user_count}, 200
+			ms = ping_database(db)
+			return {'status': 'healthy', 'service': 'banking-system', 'database': 'connected', 'db_ms': ms}, 200
 		except Exception as e:
-			return {
-				'status': 'unhealthy',
-				'service': 'banking-system',
-				'error': str(e)},500
+			return {'status': 'unhealthy', 'service': 'banking-system', 'error': str(e)}, 503
+
+	health_details = HealthDetails(app, db, {'users': User, 'accounts': Account, 'transactions': Transaction, 'loans': Loan})
+
+	@app.route('/health/details')
+	def health_details_view(): # counts from the bg refresh -- maybe up to a min old, null till the first one lands
+		return {'status': 'ok', 'service': 'banking-system', 'details': health_details.get()}, 200
 
-	# manual init endpoint | backup method
-	@app.route('/init-database')
+	# manual init endpoint | backup method -- runs alembic → admins only, never on a plain GET
+	@app.route('/init-database', methods=['POST'])
+	@admin_required
 	def manual_init():
 		try:
-			res = auto_initialize_database()
+			res = bootstrap_database()
 			return jsonify(res), 200
 		except Exception as e:
 			return jsonify({'error': str(e), 'retry': 'try again in 30 seconds'}), 500
 
 	# keep alive to prevent server from going to sleep (ihu render _-_)
 	if not app.config.get('TESTING'):
-		setup_keepalive(app)
+		with startup_profiler.phase('keepalive'): setup_keepalive(app)
 
 	return app
 
 
+def _configure_db(app):
+	dbUrl = os.environ.get('DATABASE_URL')
+	if dbUrl:
+		if dbUrl.startswith('postgres://'): dbUrl = dbUrl.replace('postgres://', 'postgresql://', 1)
+		app.config['SQLALCHEMY_DATABASE_URI'] = dbUrl
+		logger.info(" === using pqsl db === ")
+	else: # for local dev
+		app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///banking.db'
+		logger.info(" === using SQLITE DB -- local === ")
+
+	app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+	app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI']) # DB_POOL_* env
+
+
+def bootstrap_once(): # gunicorn master → bootstrap before any worker forks | bare app: db only, no blueprints/keepalive
+	app = Flask(__name__)
+	_configure_db(app)
+	db.init_app(app)
+	with app.app_context():
+		try: return bootstrap_database()
+		except Exception as e: logger.error(f" !!! DB INIT ERRROR --  {e} !!! ") # workers still boot → check_schema_version warns
+		finally: db.engine.dispose() # no master conns leak into the forked workers
+
+
+def _ensure_migrate(app): # Migrate pulls in alembic (~150ms) → only when a migration actually runs
+	if 'migrate' not in app.extensions:
+		from flask_migrate import Migrate
+		Migrate(app, db, directory=MIGRATIONS_DIR)
+
+
+def _lazy_migrate_cli(app): # stand-in for flask_migrate's `db` group | resolves the real one on first use
+	class LazyMigrateGroup(AppGroup):
+		def _real(self):
+			_ensure_migrate(app)
+			from flask_migrate.cli import db as db_group
+			return db_group
+
+		def list_commands(self, ctx): return self._real().list_commands(ctx)
+		def get_command(self, ctx, name): return self._real().get_command(ctx, name)
+
+	return LazyMigrateGroup(help="Perform database migrations.")
+
+
+def check_schema_version(): # boot check -- one pk read, no ddl | never blocks startup
+	try:
+		with db.engine.connect() as conn: current = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+	except Exception: current = None # no table (fresh / create_all-ed db) or db unreachable
+
+	if current != SCHEMA_VERSION: logger.warning(f" !!! DB SCHEMA AT {current} | CODE EXPECTS {SCHEMA_VERSION} → run `flask --app run:app init-db` !!! ")
+	return current
+
+
+def bootstrap_database(): # migrations + seed under a db wide lock → concurrent releases/workers queue instead of racing
+	from flask_migrate import upgrade
+	_ensure_migrate(current_app)
+	with advisory_lock(db.engine):
+		upgrade(directory=MIGRATIONS_DIR)
+		return auto_initialize_database()
+
+
 def auto_initialize_database():
 	try:
 		logger.info("checking db init...")
@@ -0,0 +1,118 @@
+""" in memory, indexed view of a json data file -- point lookups w/o parse n scan
+
+each file is loaded once into dicts + hash indexes (pk, unique fields, one to many fields).
+the file version (snapshot + log mtime/size) is checked per call → writes by other workers trigger a reload,
+own writes append one log line under the stores flock: state is caught up first (rebuilt if anyone else wrote,
+unique fields checked against it), then the indexes are patched in place.
+reads hand out fresh core objects → mutating one doesnt touch the cache until it's saved
+"""
+import logging
+import threading
+from src.core.User import User
+from src.core.Account import Account
+from src.core.Transaction import Transaction
+from src.core.Loan import Loan
+from src.utils.json_utils import get_store
+
+
+class JsonRepository:
+    def __init__(self, file_name, model, key, unique=(), multi=()):
+        self.file_name = file_name
+        self.model = model
+        self.key = key
+        self.unique = tuple(unique) # field → one record (username)
+        self.multi = tuple(multi) # field → many records (user_id, account_id)
+        self._rows = {} # pk → record dict
+        self._idx = {}
+        self._store = None
+        self._version = None
+        self._lock = threading.RLock()
+
+    def _index(self, rec):
+        for f in self.unique:
+            if rec.get(f) is not None: self._idx[f][rec[f]] = rec[self.key]
+        for f in self.multi:
+            if rec.get(f) is not None: self._idx[f].setdefault(rec[f], {})[rec[self.key]] = None # dict as an ordered set
+
+    def _unindex(self, rec):
+        for f in self.unique:
+            if self._idx[f].get(rec.get(f)) == rec[self.key]: del self._idx[f][rec.get(f)]
+        for f in self.multi: self._idx[f].get(rec.get(f), {}).pop(rec[self.key], None)
+
+    def _fresh(self): # reload only if the file changed since we last looked (or DATA_FOLDER points elsewhere now)
+        store = get_store(self.file_name)
+        version = store.version()
+        if store is self._store and version == self._version: return
+        self._store = store
+        self._rebuild(store.load(), version) # version taken before the load → a write racing it shows up as a change next call
+
+    def _rebuild(self, records, version):
+        self._rows = {rec[self.key]: dict(rec) for rec in records if isinstance(rec, dict) and rec.get(self.key)}
+        self._idx = {f: {} for f in self.unique + self.multi}
+        for rec in self._rows.values(): self._index(rec)
+        self._version = version
+
+    def _catch_up(self, version): # store guard → under its log lock, store.records is current n nobody can write till we're done
+        if version != self._version: self._rebuild(list(self._store.records.values()), version)
+
+    def _obj(self, rec): return self.model.from_dict(rec) if rec is not None else None
+
+    def get(self, pk):
+        with self._lock:
+            self._fresh()
+            return self._obj(self._rows.get(pk))
+
+    def find_one(self, field, value): # unique index
+        with self._lock:
+            self._fresh()
+            return self._obj(self._rows.get(self._idx[field].get(value)))
+
+    def find(self, field, value): # one to many index, file order
+        with self._lock:
+            self._fresh()
+            return [self._obj(self._rows[pk]) for pk in self._idx[field].get(value, ())]
+
+    def all(self):
+        with self._lock:
+            self._fresh()
+            return [self._obj(rec) for rec in self._rows.values()]
+
+    def save(self, obj): #return bool -- False on io errors | insert or update | raises ValueError on a taken unique field or a bad key
+        rec = obj.to_dict()
+
+        def guard(version):
+            self._catch_up(version)
+            for f in self.unique:
+                owner = self._idx[f].get(rec.get(f))
+                if owner is not None and owner != rec[self.key]: raise ValueError(f"{f} already exists")
+
+        with self._lock:
+            self._fresh()
+            try: version = self._store.put(rec, guard)
+            except OSError as e:
+                logging.error(f"error saving {self.file_name} record: {str(e)}")
+                return False
+            old = self._rows.get(rec[self.key])
+            if old is not None: self._unindex(old)
+            self._rows[rec[self.key]] = rec
+            self._index(rec)
+            self._version = version # only our write since _catch_up → no reload
+            return True
+
+    def delete(self, pk): #return bool
+        with self._lock:
+            self._fresh()
+            try: version = self._store.delete(pk, self._catch_up)
+            except Exception as e:
+                logging.error(f"error deleting {self.file_name} record: {str(e)}")
+                return False
+            rec = self._rows.pop(pk, None)
+            if rec is not None: self._unindex(rec)
+            self._version = version
+            return rec is not None
+
+
+users = JsonRepository('users.json', User, 'user_id', unique=('username',))
+accounts = JsonRepository('accounts.json', Account, 'account_id', multi=('user_id',))
+transactions = JsonRepository('transactions.json', Transaction, 'transaction_id', multi=('account_id', 'destination_account_id'))
+loans = JsonRepository('loans.json', Loan, 'loan_id', multi=('user_id',))
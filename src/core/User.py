@@ -1,5 +1,5 @@
 import uuid
-import bcrypt
+from src.utils.password_hasher import hash_password, check_password
 from datetime import datetime
 
 class User:
@@ -12,16 +12,8 @@ class User:
         self.created_at = created_at if created_at else datetime.now().isoformat()
         self.password = self._hash_password(password) if not password.startswith('$2b$') else password
 
-    def _hash_password(self, password):
-        password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        return hashed.decode('utf-8')
-
-    def verify_password(self, password):
-        password_bytes = password.encode('utf-8')
-        hashed_bytes = self.password.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+    def _hash_password(self, password): return hash_password(password) # configured work factor, same as db mode
+    def verify_password(self, password): return check_password(password, self.password)
 
     def to_dict(self):
         return {
@@ -1,10 +1,28 @@
-from src.models import db, Account, Transaction, User
+import math
+import time
+import uuid
+import random
+from datetime import datetime, timedelta, time as time_of_day
+from sqlalchemy import update, select, insert, bindparam, tuple_, literal, func, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DBAPIError
+from src.models import db, Account, Transaction, User, DailyBalance, InsufficientFunds, InactiveError
+from src.utils.business_metrics import track_money_op
+from src.utils.pagination import encode_cursor, decode_cursor
 
 class AccountManager: # mng acc ops w DB
+	MAX_CONFLICT_RETRIES = 3
+	MAX_BATCH_SIZE = 10000
+	MAX_AMOUNT = 10 ** 13 # Numeric(15, 2) ceiling → bigger amounts would fail in the db, not here
+	MAX_DESCRIPTION_LEN = 500
+	DEFAULT_PAGE_SIZE = 100
+	MAX_PAGE_SIZE = 500
+	STATEMENT_CHUNK_SIZE = 1000
 
 	# ===== getters ===== #
 	def get_all_accounts(self): return Account.query.all()
-	def get_account_by_id(self, account_id): return Account.query.filter_by(account_id=account_id).first()
+	def get_account_by_id(self, account_id): return db.session.get(Account, account_id) # identity map first → route ownership check n manager share one fetch
 	def get_user_accounts(self, user_id): return Account.query.filter_by(user_id=user_id).all()
 	# =================== #
 
@@ -12,8 +30,12 @@ class AccountManager: # mng acc ops w DB
 		try:
 			acc = Account(user_id=account_data['user_id'],account_type=account_data['account_type'],balance=account_data.get('balance', 0.0),account_number=account_data.get('account_number'))
 			db.session.add(acc)
+			if acc.balance>0:
+				now = datetime.utcnow()
+				db.session.flush() # need acc id for ledger row
+				self._create_transaction(acc.account_id,'deposit',acc.balance,'initial deposit',created_at=now)
+				self._snapshot_balances([acc.account_id], now)
 			db.session.commit()
-			if acc.balance>0: self._create_transaction(acc.account_id,'deposit',acc.balance,'initial deposit')
 			return acc.account_id
 		except Exception as e:
 			db.session.rollback()
@@ -46,84 +68,239 @@ class AccountManager: # mng acc ops w DB
 			db.session.rollback()
 			return False
 
+	@track_money_op('deposit')
 	def deposit(self, account_id, amount, description=None): # new balance
 		try:
-			acc = self.get_account_by_id(account_id)
-			if not acc: raise ValueError("account not found")
-			if not acc.active: raise ValueError("cannot deposit to inactive account")
 			if amount <= 0: raise ValueError("Deposit amount must be positive")
+			newBlnc = self._apply_balance_delta(account_id, amount)
+			if newBlnc is None: raise self._balance_error(account_id, "cannot deposit to inactive account")
 
-			acc.balance = float(acc.balance) + amount
-			db.session.commit()
-			self._create_transaction(account_id,'deposit',amount, description or 'deposit') # transac hstry
-			return float(acc.balance)
-		except ValueError: raise
+			now = datetime.utcnow()
+			self._create_transaction(account_id,'deposit',amount, description or 'deposit',created_at=now) # transac hstry
+			self._snapshot_balances([account_id], now)
+			db.session.commit() # balance + ledger row in one commit
+			return newBlnc
+		except ValueError:
+			db.session.rollback()
+			raise
 		except Exception as e:
 			db.session.rollback()
 			raise e
 
-	def withdraw(self, account_id, amount, description=None): # new balance if succs else none
+	@track_money_op('withdraw')
+	def withdraw(self, account_id, amount, description=None, commit=True): # new balance if succs else none | commit=False → caller finishes the db transac
 		try:
-			acc = self.get_account_by_id(account_id)
-			if not acc: raise ValueError("account not found")
-			if not acc.active: raise ValueError("cannot withdraw from inactive account")
 			if amount <= 0: raise ValueError("Withdrawal amount must be positive")
-			if amount>acc.balance: raise ValueError("Insufficient funds")
-
-			acc.balance = float(acc.balance) - amount
-			db.session.commit()
+			newBlnc = self._apply_balance_delta(account_id, -amount) # overdraft check happens in the UPDATE itself
+			if newBlnc is None: raise self._balance_error(account_id, "cannot withdraw from inactive account")
 
-			# create transaction record
-			self._create_transaction(account_id,'withdrawal',amount,description or 'withdrawal')
-			return float(acc.balance)
-		except ValueError: raise
+			now = datetime.utcnow()
+			self._create_transaction(account_id,'withdrawal',amount,description or 'withdrawal',created_at=now) # create transaction record
+			self._snapshot_balances([account_id], now)
+			if commit: db.session.commit()
+			return newBlnc
+		except ValueError:
+			db.session.rollback()
+			raise
 		except Exception as e:
 			db.session.rollback()
 			raise e
 
+	@track_money_op('transfer')
 	def transfer(self, from_account_id, to_account_id, amount, description=None): #bpol
+		if amount <= 0: raise ValueError("transfer amount must be POSITIVE")
+		return self._retry_on_conflict(lambda: self._transfer_once(from_account_id, to_account_id, amount, description))
+
+	def _transfer_once(self, from_account_id, to_account_id, amount, description):
 		try:
-			from_account = self.get_account_by_id(from_account_id)
-			to_account = self.get_account_by_id(to_account_id)
+			# transfer -- minus from "from" acc | plus to "to" acc | both conditional UPDATEs in one db transac
+			# rows are touched in account_id order → A→B n B→A grab row locks in the same order n cant deadlock each other
+			legs = sorted([(from_account_id, -amount), (to_account_id, amount)], key=lambda leg: leg[0])
+			for accId, delta in legs:
+				if self._apply_balance_delta(accId, delta) is None: raise self._balance_error(accId, "cannot transfer to/from inactive account", "one or both accounts not found")
 
-			if not from_account or not to_account: raise ValueError("one or both accounts not found")
-			if not from_account.active or not to_account.active: raise ValueError("cannot transfer to/from inactive account")
-			if amount <= 0: raise ValueError("transfer amount must be POSITIVE")
-			if amount>from_account.balance: raise ValueError("Insufficient funds")
+			now = datetime.utcnow()
+			self._create_transaction(from_account_id,'transfer',amount,description or 'transfer',to_account_id,created_at=now) # create transaction record
+			self._snapshot_balances([from_account_id, to_account_id], now)
+			db.session.commit()
+			return True
+		except ValueError:
+			db.session.rollback() # undo debit if credit side failed
+			raise
+		except Exception as e:
+			db.session.rollback()
+			raise e
 
-			# transfer -- minus from "from" acc | plus to "to" acc
-			from_account.balance = float(from_account.balance)-amount
-			to_account.balance = float(to_account.balance)+amount
+	def batch_transfer(self, from_account_id, transfers, description=None): # one source → many dests in one db transac | list of per item results
+		if len(transfers) > self.MAX_BATCH_SIZE: raise ValueError(f"batch cannot exceed {self.MAX_BATCH_SIZE} transfers")
+		results, items = [], []
+		for i, item in enumerate(transfers): # shape checks first | bad items get reported, not fail the whole batch
+			res = {'index': i, 'to_account_id': item.get('to_account_id') if isinstance(item, dict) else None, 'status': 'failed'}
+			results.append(res)
+			if not res['to_account_id']: res['error'] = "missing required field: to_account_id"; continue
+			if not isinstance(res['to_account_id'], str): res['error'] = "to_account_id must be a string"; continue # lists/dicts would break the IN (...) set
+			amount = item.get('amount')
+			if isinstance(amount, bool) or not isinstance(amount, (int, float)) or not math.isfinite(amount) or abs(amount) >= self.MAX_AMOUNT: res['error'] = "invalid amount"; continue # json numbers only -- no "50", NaN, Infinity
+			amount = round(amount, 2)
+			if amount <= 0: res['error'] = "transfer amount must be POSITIVE"; continue
+			desc = item.get('description')
+			if desc is not None and (not isinstance(desc, str) or len(desc) > self.MAX_DESCRIPTION_LEN): res['error'] = f"description must be a string of at most {self.MAX_DESCRIPTION_LEN} chars"; continue
+			res['amount'] = amount
+			items.append((res, desc or description or 'transfer'))
 
-			db.session.commit()
+		if items: self._retry_on_conflict(lambda: self._batch_transfer_once(from_account_id, items))
+		return results
 
-			# create transaction record
-			self._create_transaction(from_account_id,'transfer',amount,description or 'transfer',to_account_id)
-			return True
-		except ValueError: raise
+	def _batch_transfer_once(self, from_account_id, items):
+		try:
+			# every dest + source in one IN (...) query | locked in account_id order (pg) → same lock order as single transfers
+			accIds = {res['to_account_id'] for res, _ in items} | {from_account_id}
+			rows = db.session.execute(select(Account.account_id, Account.active).where(Account.account_id.in_(accIds)).order_by(Account.account_id).with_for_update()).all()
+			active = {r.account_id: r.active for r in rows}
+			if from_account_id not in active: raise ValueError("source account not found")
+			if not active[from_account_id]: raise InactiveError("cannot transfer to/from inactive account")
+
+			ok, failed = [], []
+			for res, desc in items:
+				if res['to_account_id'] not in active: failed.append((res, "destination account not found"))
+				elif not active[res['to_account_id']]: failed.append((res, "cannot transfer to/from inactive account"))
+				else: ok.append((res, desc))
+
+			trIds = []
+			if ok:
+				# total checked against source balance once -- by the conditional debit itself
+				total = round(sum(res['amount'] for res, _ in ok), 2)
+				if self._apply_balance_delta(from_account_id, -total) is None: raise self._balance_error(from_account_id, "cannot transfer to/from inactive account", "source account not found")
+
+				credits = {}
+				for res, _ in ok: credits[res['to_account_id']] = credits.get(res['to_account_id'], 0) + res['amount']
+				accs = Account.__table__
+				db.session.execute(update(accs).where(accs.c.account_id == bindparam('acc_id')).values(balance=accs.c.balance + bindparam('delta')),
+				                   [{'acc_id': accId, 'delta': round(delta, 2)} for accId, delta in sorted(credits.items())]) # executemany
+
+				now = datetime.utcnow()
+				trIds = [str(uuid.uuid4()) for _ in ok]
+				db.session.execute(insert(Transaction), [{'transaction_id': trId, 'account_id': from_account_id, 'transaction_type': 'transfer', 'amount': res['amount'], 'description': desc, 'destination_account_id': res['to_account_id'], 'created_at': now} for trId, (res, desc) in zip(trIds, ok)])
+				self._snapshot_balances([from_account_id, *credits], now)
+			db.session.commit()
+		except ValueError:
+			db.session.rollback()
+			raise
 		except Exception as e:
 			db.session.rollback()
 			raise e
 
+		for (res, _), trId in zip(ok, trIds): res.update(status='ok', transaction_id=trId)
+		for res, err in failed: res['error'] = err
+
+	def _retry_on_conflict(self, fn): # rerun whole db transac on deadlock / serialization failure | bounded w jittered backoff
+		for attempt in range(self.MAX_CONFLICT_RETRIES + 1):
+			try: return fn()
+			except DBAPIError as e:
+				if attempt == self.MAX_CONFLICT_RETRIES or not self._is_conflict(e): raise
+				time.sleep(random.uniform(0, 0.01 * 2 ** attempt))
+
+	@staticmethod
+	def _is_conflict(e):
+		if getattr(e.orig, 'pgcode', None) in ('40001', '40P01'): return True # serialization_failure | deadlock_detected
+		return 'database is locked' in str(e.orig) # sqlite busy timeout
+
+	def _apply_balance_delta(self, account_id, delta):
+		# `balance = balance + delta` done by the db → no read-modify-write race between workers
+		# debits only match while funds cover them | returns new balance or None if no row matched
+		stmt = update(Account).where(Account.account_id == account_id, Account.active.is_(True))
+		if delta < 0: stmt = stmt.where(Account.balance >= -delta)
+		stmt = stmt.values(balance=Account.balance + delta).execution_options(synchronize_session=False)
+
+		if db.session.get_bind().dialect.update_returning:
+			row = db.session.execute(stmt.returning(Account.balance)).first()
+			return float(row[0]) if row else None
+		if db.session.execute(stmt).rowcount != 1: return None
+		return float(db.session.execute(select(Account.balance).where(Account.account_id == account_id)).scalar_one())
+
+	def _balance_error(self, account_id, inactive_msg, missing_msg="account not found"): # why a conditional upd matched no row
+		acc = db.session.execute(select(Account.active).where(Account.account_id == account_id)).first()
+		if not acc: return ValueError(missing_msg)
+		if not acc.active: return InactiveError(inactive_msg)
+		return InsufficientFunds("Insufficient funds")
+
+	def _snapshot_balances(self, account_ids, now):
+		# upsert todays closing balance for the accs just touched | same db transac as the balance UPDATE
+		# `now` is also the ledger rows created_at → snapshot day n delta scan agree on which day a row belongs to
+		sel = select(Account.account_id, literal(now.date(), db.Date), Account.balance).where(Account.account_id.in_(account_ids))
+		ins = self._dialect_insert(DailyBalance).from_select(['account_id', 'day', 'balance'], sel)
+		db.session.execute(ins.on_conflict_do_update(index_elements=['account_id', 'day'], set_={'balance': ins.excluded.balance}))
+
+	@staticmethod
+	def _dialect_insert(model): # INSERT .. ON CONFLICT flavour for the bound db
+		return (pg_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert)(model)
+
+	def get_balance_as_of(self, account_id, as_of): # balance incl every transac w created_at <= as_of
+		# nearest snapshot before as_of's day + delta scan from there → reads O(days) not O(history)
+		day = as_of.date()
+		if as_of.time() == time_of_day.max: # end of day → that days snapshot already is the answer
+			snap = self._latest_snapshot(account_id, DailyBalance.day == day)
+			if snap: return float(snap.balance)
+
+		snap = self._latest_snapshot(account_id, DailyBalance.day < day)
+		if snap: return round(float(snap.balance) + self._ledger_delta(account_id, Transaction.created_at >= datetime.combine(snap.day + timedelta(days=1), time_of_day.min), Transaction.created_at <= as_of), 2)
+
+		# no earlier snapshot → walk back from a known balance instead of up from 0: imported/seeded accs hold money no ledger row explains
+		acc = db.session.execute(select(Account.balance).where(Account.account_id == account_id)).first()
+		if not acc: return 0.0
+		nxt = db.session.execute(select(DailyBalance.day, DailyBalance.balance).where(DailyBalance.account_id == account_id, DailyBalance.day >= day).order_by(DailyBalance.day.asc()).limit(1)).first()
+		if nxt: anchor, window = nxt.balance, [Transaction.created_at <= datetime.combine(nxt.day, time_of_day.max)] # closing balance of a later day
+		else: anchor, window = acc.balance, [] # no snapshot after either → the live balance
+		return round(float(anchor) - self._ledger_delta(account_id, Transaction.created_at > as_of, *window), 2)
+
+	def _latest_snapshot(self, account_id, day_filter):
+		return db.session.execute(select(DailyBalance.day, DailyBalance.balance).where(DailyBalance.account_id == account_id, day_filter).order_by(DailyBalance.day.desc()).limit(1)).first()
+
+	def _ledger_delta(self, account_id, *window): # net effect on the acc of the transacs matching window (created_at conds)
+		outgoing = select(func.coalesce(func.sum(case((Transaction.transaction_type == 'deposit', Transaction.amount), (Transaction.destination_account_id == account_id, 0), else_=-Transaction.amount)), 0)).where(Transaction.account_id == account_id, *window)
+		incoming = select(func.coalesce(func.sum(Transaction.amount), 0)).where(Transaction.destination_account_id == account_id, Transaction.account_id != account_id, *window)
+		return float(db.session.execute(outgoing).scalar()) + float(db.session.execute(incoming).scalar())
+
 	def get_transactions(self, account_id=None, user_id=None): #list of transac objs
-		#filer transacs of user
+		return self._transactions_query(account_id, user_id).order_by(Transaction.created_at.desc()).all()
+
+	def get_transactions_page(self, account_id=None, user_id=None, limit=None, cursor=None): # (transacs, next_cursor)
+		# keyset pagination on (created_at, transaction_id) → cost per page doesnt grow w history length
+		limit = max(1, min(int(limit or self.DEFAULT_PAGE_SIZE), self.MAX_PAGE_SIZE))
+		q = self._transactions_query(account_id, user_id)
+		if cursor:
+			created_at, trId = decode_cursor(cursor)
+			q = q.filter(tuple_(Transaction.created_at, Transaction.transaction_id) < tuple_(created_at, trId))
+
+		rows = q.order_by(Transaction.created_at.desc(), Transaction.transaction_id.desc()).limit(limit+1).all() # +1 → tells if theres a next page
+		if len(rows) <= limit: return rows, None
+		rows = rows[:limit]
+		return rows, encode_cursor(rows[-1].created_at, rows[-1].transaction_id)
+
+	def iter_statement(self, account_id, date_from=None, date_to=None): # generator of transacs oldest first | date_to exclusive
+		# yield_per → server side cursor on pg, rows come in chunks instead of one big list
+		q = self._transactions_query(account_id)
+		if date_from: q = q.filter(Transaction.created_at >= date_from)
+		if date_to: q = q.filter(Transaction.created_at < date_to)
+		yield from q.order_by(Transaction.created_at.asc(), Transaction.transaction_id.asc()).yield_per(self.STATEMENT_CHUNK_SIZE)
+
+	def _transactions_query(self, account_id=None, user_id=None):
+		# OR across 2 cols cant use one index → UNION ALL of 2 index range scans on (account_id|destination_account_id, created_at)
+		# 2nd branch drops rows the 1st alr has (self transfers) so nothing shows up twice
 		if account_id:
-			return Transaction.query.filter((Transaction.account_id == account_id) | (Transaction.destination_account_id == account_id)).order_by(Transaction.created_at.desc()).all()
-		elif user_id: # get user's accs
-			accs = self.get_user_accounts(user_id)
-			accIds = [acc.account_id for acc in accs]
-			return Transaction.query.filter((Transaction.account_id.in_(accIds)) | (Transaction.destination_account_id.in_(accIds))).order_by(Transaction.created_at.desc()).all()
+			return Transaction.query.filter(Transaction.account_id == account_id).union_all(
+				Transaction.query.filter(Transaction.destination_account_id == account_id, Transaction.account_id != account_id))
+		elif user_id: # user's accs as a subquery → one round trip, no Account objs loaded just for their ids
+			accIds = select(Account.account_id).where(Account.user_id == user_id)
+			return Transaction.query.filter(Transaction.account_id.in_(accIds)).union_all(
+				Transaction.query.filter(Transaction.destination_account_id.in_(accIds), Transaction.account_id.notin_(accIds)))
 
-		return Transaction.query.order_by(Transaction.created_at.desc()).all()
+		return Transaction.query
 
 	def get_transaction_by_id(self, transaction_id): return Transaction.query.filter_by(transaction_id=transaction_id).first()
 
-	def _create_transaction(self, account_id, transaction_type, amount, description, destination_account_id=None):
-		try:
-			transaction = Transaction(account_id=account_id,transaction_type=transaction_type,amount=amount,description=description,destination_account_id=destination_account_id)
-			db.session.add(transaction)
-			db.session.commit()
-			return transaction.transaction_id
-		except Exception as e:
-			db.session.rollback()
-			return None
\ No newline at end of file
+	def _create_transaction(self, account_id, transaction_type, amount, description, destination_account_id=None, created_at=None):
+		# only stages the ledger row | caller commits it together w the balance change → no balance upd without its transac
+		transaction = Transaction(account_id=account_id,transaction_type=transaction_type,amount=amount,description=description,destination_account_id=destination_account_id,created_at=created_at)
+		db.session.add(transaction)
+		return transaction
\ No newline at end of file
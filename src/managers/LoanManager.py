@@ -1,10 +1,12 @@
 from src.models import db, Loan
+from src.managers.AccountManager import AccountManager
+from src.utils.business_metrics import track_money_op
 # from datetime import datetime
 
 class LoanManager:
 
 	def get_all_loans(self): return Loan.query.all()
-	def get_loan_by_id(self,loan_id): return Loan.query.filter_by(loan_id=loan_id).first()
+	def get_loan_by_id(self,loan_id): return db.session.get(Loan, loan_id) # identity map first → no 2nd SELECT after the route's ownership check
 	def get_user_loans(self, user_id): return Loan.query.filter_by(user_id=user_id).all()
 
 	def create_loan_application(self,loan_data):
@@ -71,11 +73,14 @@ class LoanManager:
 			db.session.rollback()
 			raise e
 
-	def make_payment(self, loan_id, amount):
+	@track_money_op('make_payment')
+	def make_payment(self, loan_id, amount, account_id=None, description=None):
+		# account_id → funds withdrawn from that acc in the same db transac as the loan upd
 		try:
 			loan = self.get_loan_by_id(loan_id)
 			if not loan: raise ValueError("loan not found")
 			new_balance = loan.make_payment(amount)
+			if account_id: AccountManager().withdraw(account_id, amount, description or f"Payment for {loan.loan_type} loan", commit=False)
 			db.session.commit()
 			return new_balance
 		except ValueError: raise
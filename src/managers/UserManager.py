@@ -1,10 +1,27 @@
+import os
 from src.models import db, User
+from src.utils.password_hasher import HasherBusy, needs_rehash
+from src.utils.ttl_cache import TTLCache
+
+PROFILE_FIELDS = ('user_id', 'username', 'email', 'full_name', 'role', 'created_at')
+
+# user_id → profile projection | dropped on update/delete here, ttl covers other workers
+profile_cache = TTLCache(maxsize=int(os.environ.get('PROFILE_CACHE_SIZE', 4096)), ttl=int(os.environ.get('PROFILE_CACHE_TTL', 60)))
 
 class UserManager:
     def get_all_users(self): return User.query.all()
-    def get_user_by_id(self,user_id): return User.query.filter_by(user_id=user_id).first()
+    def get_user_by_id(self,user_id): return db.session.get(User, user_id)
     def get_user_by_username(self, username): return User.query.filter_by(username=username).first()
 
+    def get_user_profile(self, user_id): # cached projection -- db only on a miss | misses (unknown ids) arent cached
+        profile = profile_cache.get(user_id)
+        if profile is None:
+            user = self.get_user_by_id(user_id)
+            if not user: return None
+            profile = {f: getattr(user, f) for f in PROFILE_FIELDS}
+            profile_cache.set(user_id, profile)
+        return dict(profile)
+
     def create_user(self, user_data):
         try:
             # check if username already exists
@@ -15,7 +32,7 @@ class UserManager:
             db.session.add(user)
             db.session.commit()
             return user.user_id
-        except ValueError: raise
+        except (ValueError, HasherBusy): raise
         except Exception as e:
             db.session.rollback()
             return None
@@ -30,7 +47,11 @@ class UserManager:
                 if key == 'password' and value and not value.startswith('$2b$'): value = user._hash_password(value) # hash new password
                 if hasattr(user, key) and key != 'user_id': setattr(user, key, value)
             db.session.commit()
+            profile_cache.invalidate(user_id)
             return True
+        except HasherBusy:
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             return False
@@ -41,6 +62,7 @@ class UserManager:
             if not user: return False
             db.session.delete(user)
             db.session.commit()
+            profile_cache.invalidate(user_id)
             return True
         except Exception as e:
             db.session.rollback()
@@ -48,5 +70,14 @@ class UserManager:
 
     def authenticate_user(self, username, password):
         user = self.get_user_by_username(username)
-        if user and user.verify_password(password): return user
-        return None
\ No newline at end of file
+        if user and user.verify_password(password):
+            if needs_rehash(user.password): self._rehash_password(user, password)
+            return user
+        return None
+
+    def _rehash_password(self, user, password): # stored cost below configured cost → upgrade while we have the plaintext | never fails the login
+        try:
+            user.password = user._hash_password(password)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
\ No newline at end of file
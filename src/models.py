@@ -1,10 +1,16 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import uuid
-import bcrypt
+from src.utils.password_hasher import hash_password, check_password
 
 db = SQLAlchemy()
 
+# ValueError subclasses → every existing `except ValueError` / 400 path keeps working, metrics can tell them apart
+class InsufficientFunds(ValueError): pass
+class InactiveError(ValueError): pass
+
+SCHEMA_VERSION = 'a7c3e91d2b40' # alembic head this code expects -- bump w every new migration
+
 class User(db.Model):
 	__tablename__ = 'users'
 
@@ -26,16 +32,8 @@ class User(db.Model):
 		self.role = role
 		self.password = self._hash_password(password) if not password.startswith('$2b$') else password
 
-	def _hash_password(self, password):
-		password_bytes = password.encode('utf-8')
-		salt = bcrypt.gensalt()
-		hashed = bcrypt.hashpw(password_bytes, salt)
-		return hashed.decode('utf-8')
-
-	def verify_password(self, password):
-		password_bytes = password.encode('utf-8')
-		hashed_bytes = self.password.encode('utf-8')
-		return bcrypt.checkpw(password_bytes, hashed_bytes)
+	def _hash_password(self, password): return hash_password(password) # bcrypt runs in the bounded hasher pool, not on this thread
+	def verify_password(self, password): return check_password(password, self.password)
 
 	def to_dict(self):
 		return {
@@ -71,6 +69,8 @@ class Account(db.Model):
 	                                           backref='destination_account',
 	                                           lazy=True)
 
+	daily_balances = db.relationship('DailyBalance', lazy=True, cascade='all, delete-orphan')
+
 	def __init__(self, user_id, account_type, balance=0.0, account_number=None):
 		self.user_id = user_id
 		self.account_type = account_type
@@ -94,6 +94,10 @@ class Account(db.Model):
 
 class Transaction(db.Model):
 	__tablename__ = 'transactions'
+	__table_args__ = ( # history reads are `WHERE account_id = X` / `WHERE destination_account_id = X` newest first
+		db.Index('ix_transactions_account_created', 'account_id', 'created_at'),
+		db.Index('ix_transactions_destination_created', 'destination_account_id', 'created_at'),
+	)
 
 	transaction_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
 	account_id = db.Column(db.String(36), db.ForeignKey('accounts.account_id'), nullable=False)
@@ -115,6 +119,21 @@ class Transaction(db.Model):
 		}
 
 
+class DailyBalance(db.Model): # closing balance per acc per day w activity | kept in step by AccountManager on every money movement
+	__tablename__ = 'daily_balances'
+
+	account_id = db.Column(db.String(36), db.ForeignKey('accounts.account_id'), primary_key=True)
+	day = db.Column(db.Date, primary_key=True)
+	balance = db.Column(db.Numeric(15, 2), nullable=False)
+
+	def to_dict(self):
+		return {
+			'account_id': self.account_id,
+			'day': self.day.isoformat(),
+			'balance': float(self.balance)
+		}
+
+
 class Loan(db.Model):
 	__tablename__ = 'loans'
 
@@ -155,7 +174,7 @@ class Loan(db.Model):
 			raise ValueError("Payment amount must be positive")
 
 		if self.status != 'active':
-			raise ValueError(f"Cannot make payment on loan with status '{self.status}'")
+			raise InactiveError(f"Cannot make payment on loan with status '{self.status}'")
 
 		self.balance = float(self.balance) - amount
 
@@ -200,4 +219,14 @@ class Loan(db.Model):
 			'created_at': self.created_at.isoformat(),
 			'approved_at': self.approved_at.isoformat() if self.approved_at else None,
 			'balance': float(self.balance)
-		}
\ No newline at end of file
+		}
+
+
+class MigrationCheckpoint(db.Model): # migrate_data.py -- one row per committed chunk, written in the chunks own txn → reruns skip whats done
+	__tablename__ = 'migration_checkpoints'
+
+	source = db.Column(db.String(255), primary_key=True) # table:file:size:mtime → an edited file starts over
+	chunk = db.Column(db.Integer, primary_key=True)
+	rows = db.Column(db.Integer, nullable=False)
+	inserted = db.Column(db.Integer, nullable=False)
+	finished_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
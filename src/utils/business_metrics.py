@@ -0,0 +1,47 @@
+""" money movement counters + latency histograms, labelled by operation n outcome
+
+outcome: ok | insufficient_funds | inactive | invalid (other validation errs → 400) | error (anything unexpected)
+served at /metrics next to the http ones, merged across workers when METRICS_MULTIPROC_DIR is set
+"""
+import time
+from functools import wraps
+from contextvars import ContextVar
+from src.models import InsufficientFunds, InactiveError
+from src.utils.metrics import REGISTRY
+
+_current_op = ContextVar('money_op', default=None) # outermost tracked op on this thread/greenlet
+
+OP_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+
+money_ops = REGISTRY.counter('banking_money_ops_total', 'Money movement calls by outcome', ('operation', 'outcome'))
+money_op_seconds = REGISTRY.histogram('banking_money_op_seconds', 'Money movement latency incl. commit', ('operation', 'outcome'), OP_BUCKETS)
+
+
+def outcome_of(exc):
+    if exc is None: return 'ok'
+    if isinstance(exc, InsufficientFunds): return 'insufficient_funds'
+    if isinstance(exc, InactiveError): return 'inactive'
+    if isinstance(exc, ValueError): return 'invalid'
+    return 'error'
+
+
+def track_money_op(operation): # decorator | one sample per call, retries inside count as one
+    # nested tracked calls (loan payment → withdraw) belong to the outer op → no sample of their own
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_op.get() is not None: return fn(*args, **kwargs)
+            token = _current_op.set(operation)
+            t0 = time.perf_counter()
+            exc = None
+            try: return fn(*args, **kwargs)
+            except Exception as e:
+                exc = e
+                raise
+            finally:
+                _current_op.reset(token)
+                outcome = outcome_of(exc)
+                money_ops.inc(operation=operation, outcome=outcome)
+                money_op_seconds.observe(time.perf_counter() - t0, operation=operation, outcome=outcome)
+        return wrapper
+    return deco
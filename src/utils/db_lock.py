@@ -0,0 +1,21 @@
+""" cross process mutex on the db itself -- pg session advisory lock
+
+held on its own autocommit conn so the guarded work can commit freely on db.session.
+sqlite → no-op (single local file, dev only)
+"""
+from contextlib import contextmanager
+from sqlalchemy import text
+
+BOOTSTRAP_LOCK_ID = 727100001 # any app wide constant | pg_locks.objid shows it
+
+
+@contextmanager
+def advisory_lock(engine, key=BOOTSTRAP_LOCK_ID):
+    if engine.dialect.name != 'postgresql':
+        yield
+        return
+
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:k)"), {'k': key}) # blocks till the holder is done
+        try: yield
+        finally: conn.execute(text("SELECT pg_advisory_unlock(:k)"), {'k': key})
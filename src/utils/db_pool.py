@@ -0,0 +1,64 @@
+""" engine/pool options from env + pool telemetry -- retune per deploy w/o a code change
+
+sizes are per worker process. defaults follow the gunicorn worker class (WORKER_CLASS, WEB_THREADS):
+ - sync    → 1 request at a time: 2 conns (request + bg health refresh), no overflow
+ - gthread → one conn per thread + a little overflow
+ - gevent  → many greenlets: bigger pool n overflow, short timeout so starvation shows up as errors not hangs
+DB_POOL_SIZE / DB_MAX_OVERFLOW / DB_POOL_TIMEOUT / DB_POOL_RECYCLE override. sqlite keeps sqlalchemys defaults unless set.
+DB_CONNECT_TIMEOUT (secs, postgres) → a db that doesnt answer fails new conns fast instead of waiting out the tcp timeout
+DB_POOL_PRE_PING=0 drops the per checkout round trip → a dead conn then fails its first statement,
+sqlalchemy invalidates the pool n the next checkout reconnects (app answers that one request w 503)
+"""
+import os
+import time
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from src.utils.metrics import REGISTRY
+
+WORKER_PROFILES = { # worker class → (pool_size, max_overflow, pool_timeout secs)
+    'sync': lambda threads: (2, 0, 10),
+    'gthread': lambda threads: (threads, 2, 10),
+    'gevent': lambda threads: (10, 10, 5),
+}
+WAIT_BUCKETS = (.0005, .001, .005, .01, .05, .1, .5, 1, 5, 10)
+
+checkout_seconds = REGISTRY.histogram('db_pool_checkout_seconds', 'Time to get a pooled connection (wait + connect + pre_ping)', buckets=WAIT_BUCKETS)
+checkout_timeouts = REGISTRY.counter('db_pool_timeouts_total', 'Checkouts that gave up after pool_timeout -- starvation')
+
+
+def _flag(name, default):
+    val = os.environ.get(name)
+    return default if val is None else val.strip().lower() not in ('0', 'false', 'no', 'off', '')
+
+
+class TimedQueuePool(QueuePool): # QueuePool + checkout wait histogram n timeout counter
+    def connect(self):
+        t0 = time.perf_counter()
+        try: return super().connect()
+        except PoolTimeout:
+            checkout_timeouts.inc()
+            raise
+        finally: checkout_seconds.observe(time.perf_counter() - t0)
+
+
+def engine_options(db_url):
+    opts = {'pool_pre_ping': _flag('DB_POOL_PRE_PING', True), 'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 300))}
+    if ':memory:' in db_url: return opts # sqlite in memory → singleton pool, nothing to size
+
+    opts['poolclass'] = TimedQueuePool
+    if db_url.startswith('postgresql'): opts['connect_args'] = {'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5))}
+    if not db_url.startswith('sqlite'):
+        threads = int(os.environ.get('WEB_THREADS', 4))
+        size, overflow, timeout = WORKER_PROFILES.get(os.environ.get('WORKER_CLASS', 'sync'), WORKER_PROFILES['sync'])(threads)
+        opts.update(pool_size=size, max_overflow=overflow, pool_timeout=timeout)
+    for opt, env in (('pool_size', 'DB_POOL_SIZE'), ('max_overflow', 'DB_MAX_OVERFLOW'), ('pool_timeout', 'DB_POOL_TIMEOUT')):
+        if os.environ.get(env): opts[opt] = int(os.environ[env])
+    return opts
+
+
+def init_pool_metrics(engine): # gauges read the live pool at scrape time | last engine wins (one per worker in prod)
+    def stat(fn): return lambda: {(): fn(engine.pool)} if isinstance(engine.pool, QueuePool) else {}
+    REGISTRY.gauge('db_pool_size', 'Configured pool size').fn = stat(lambda p: p.size())
+    REGISTRY.gauge('db_pool_checked_out', 'Connections currently checked out').fn = stat(lambda p: p.checkedout())
+    REGISTRY.gauge('db_pool_checked_in', 'Idle connections in the pool').fn = stat(lambda p: p.checkedin())
+    REGISTRY.gauge('db_pool_overflow', 'Connections open beyond pool_size (negative → pool not filled yet)').fn = stat(lambda p: p.overflow())
@@ -0,0 +1,77 @@
+""" probe helpers -- readiness ping w a hard timeout + table counts cached off the request path
+
+/livez  → no io, process is up
+/readyz → SELECT 1 on a pooled conn, the whole probe (pool wait + connect + query) bounded by READY_TIMEOUT_MS:
+           it runs on one probe thread n the request stops waiting at the deadline. a probe still stuck on the db
+           fails the next ones at once → readiness flips fast instead of hanging for pool_timeout / tcp connect timeout
+/health/details → counts refreshed by a bg thread at most once per DETAILS_TTL, probes never wait on COUNT(*)
+"""
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as ProbeTimeout
+from sqlalchemy import text, func
+
+READY_TIMEOUT_MS = int(os.environ.get('READY_TIMEOUT_MS', 2000))
+DETAILS_TTL = int(os.environ.get('HEALTH_DETAILS_TTL', 60)) # secs
+
+logger = logging.getLogger(__name__)
+
+
+_probe_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='readyz')
+_probe_lock = threading.Lock()
+_probe_inflight = None
+
+
+def _ping(engine, timeout_ms):
+    with engine.connect() as conn:
+        if conn.dialect.name == 'postgresql': conn.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}")) # scoped to this probe txn
+        conn.execute(text("SELECT 1"))
+
+
+def ping_database(db, timeout_ms=READY_TIMEOUT_MS): # raises on failure or deadline | ms on success
+    global _probe_inflight
+    t0 = time.perf_counter()
+    with _probe_lock:
+        if _probe_inflight is not None and not _probe_inflight.done(): raise ProbeTimeout("previous readiness probe still waiting on the db")
+        _probe_inflight = fut = _probe_pool.submit(_ping, db.engine, timeout_ms) # engine resolved here → probe thread needs no app ctx
+    try: fut.result(timeout=timeout_ms / 1000)
+    except ProbeTimeout: raise ProbeTimeout(f"db did not answer within {timeout_ms}ms") from None
+    return round((time.perf_counter() - t0) * 1000, 2)
+
+
+class HealthDetails:
+    def __init__(self, app, db, models, ttl=DETAILS_TTL, clock=time.monotonic):
+        self.app = app
+        self.db = db
+        self.models = models # name → model w a pk to count
+        self.ttl = ttl
+        self.clock = clock
+        self.snapshot = None
+        self._refreshed = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self): # never blocks on the db | kicks one refresh when stale
+        with self._lock:
+            stale = self._refreshed is None or self.clock() - self._refreshed >= self.ttl
+            if stale and not self._refreshing:
+                self._refreshing = True
+                threading.Thread(target=self._refresh, daemon=True).start()
+            return self.snapshot
+
+    def _refresh(self):
+        try:
+            with self.app.app_context():
+                counts = {name: self.db.session.query(func.count()).select_from(model).scalar() for name, model in self.models.items()}
+                self.db.session.remove()
+            snapshot = {'counts': counts, 'refreshed_at': datetime.utcnow().isoformat()}
+        except Exception as e:
+            logger.error(f" !!! health details refresh failed -- {e} !!! ")
+            snapshot = {'error': str(e), 'refreshed_at': datetime.utcnow().isoformat()}
+        with self._lock:
+            self.snapshot = snapshot
+            self._refreshed = self.clock() # failures wait out the ttl too → no hammering a sick db
+            self._refreshing = False
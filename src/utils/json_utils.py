@@ -1,20 +1,248 @@
+""" json file storage -- streaming reads + a crash safe, append friendly store for the json deployment mode
+
+each data file is a snapshot (<name>.json, plain array) + a write ahead log (<name>.json.log, one entry per line):
+ - save → only the records that changed get appended as {"put": rec} / {"del": key} → O(changes) io, not O(file)
+ - read → snapshot + log replayed, kept in memory per file n only the new log tail is read on later calls
+ - every COMPACT_EVERY entries the state is folded into a new snapshot via tmp file + fsync + rename, then the log is emptied
+a crash mid append leaves at most one torn last line (skipped on replay), a crash mid compaction leaves the old snapshot
+or the new one n the log on top -- replaying puts/dels by key is idempotent either way.
+appends n compaction hold an flock on the log → several gunicorn workers can share a data dir
+"""
 import os
 import json
+import itertools
 import logging
+import threading
+from contextlib import contextmanager
 from flask import current_app
 
+try: import fcntl
+except ImportError: fcntl = None # windows dev box → single process, no cross process lock
 
-def load_json(file_name):
-    """ returns: list -- data from json file as A LIST OF DICTS """
+READ_CHUNK = 1 << 16 # chars per read while streaming
+COMPACT_EVERY = int(os.environ.get('JSON_COMPACT_EVERY', 1000)) # log entries before folding them into the snapshot
+LOG_FSYNC = os.environ.get('JSON_LOG_FSYNC', '1') != '0' # 0 → faster saves, a power cut may drop the last few
+
+KEYS = {'users.json': 'user_id', 'accounts.json': 'account_id', 'transactions.json': 'transaction_id', 'loans.json': 'loan_id'} # file → record key
+
+_decoder = json.JSONDecoder()
+
+
+def iter_json(file_path, chunk_size=READ_CHUNK):
+    """ yields records one at a time -- memory stays ~ one record + one read chunk
+    accepts a top level array ([{..}, {..}]) or NDJSON (one object per line), picked from the 1st non blank char """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        buf = f.read(chunk_size)
+        pos = len(buf) - len(buf.lstrip())
+        if buf[pos:pos + 1] == '[': yield from _iter_array(f, buf, pos + 1, chunk_size)
+        else: yield from _iter_ndjson(f, buf)
+
+
+def _iter_ndjson(f, head):
+    for block in itertools.chain([head + f.readline()], f): # head chunk may end mid line → finish that line 1st
+        for line in block.splitlines():
+            if line.strip(): yield json.loads(line)
+
+
+def _iter_array(f, buf, pos, chunk_size):
+    eof = False
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n,': pos += 1
+        if pos < len(buf):
+            if buf[pos] == ']': return
+            try:
+                obj, end = _decoder.raw_decode(buf, pos)
+                if end < len(buf) or eof: # a value touching the buffer edge may be cut short (numbers) → read more 1st
+                    yield obj
+                    pos = end
+                    continue
+            except json.JSONDecodeError:
+                if eof: raise
+        elif eof: raise json.JSONDecodeError("unterminated array", buf, pos)
+
+        more = f.read(chunk_size)
+        if not more: eof = True
+        buf, pos = buf[pos:] + more, 0 # drop whats alr yielded
+
+
+def _fsync_dir(path): # makes a rename durable | not possible on windows
+    try: fd = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+    except OSError: return
+    try: os.fsync(fd)
+    except OSError: pass
+    finally: os.close(fd)
+
+
+def write_atomic(file_path, data): # tmp file + fsync + rename → readers see the old file or the new one, never half of it
+    tmp = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, file_path)
+    finally:
+        if os.path.exists(tmp): os.remove(tmp)
+    _fsync_dir(file_path)
+
+
+class JsonStore:
+    """ one data file = snapshot + append log, state cached in memory as key → record (dict order = file order)
+    records w/o the key field (hand edited files..) are kept by position n force a full snapshot write on save """
+
+    def __init__(self, file_path, key):
+        self.path = file_path
+        self.log_path = file_path + '.log'
+        self.key = key
+        self.records = {}
+        self._snap = None # (inode, mtime, size) of the snapshot records were built from
+        self._offset = 0 # log bytes alr replayed
+        self._entries = 0 # log entries on top of the snapshot
+        self._torn = False # log ends mid line (crashed writer) → next append starts a fresh line
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        try: st = os.stat(self.path)
+        except FileNotFoundError: return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _keyof(self, rec, pos):
+        k = rec.get(self.key) if isinstance(rec, dict) else None
+        return k if isinstance(k, str) else ('#', pos)
+
+    def _reload(self):
+        self._snap = self._stat()
+        recs = iter_json(self.path) if self._snap else []
+        self.records = {self._keyof(r, i): r for i, r in enumerate(recs)}
+        self._offset = self._entries = 0
+        self._torn = False
+
+    def _replay(self):
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(self._offset)
+                tail = f.read()
+        except FileNotFoundError: tail = b''
+        if not tail: return
+        done = tail.rfind(b'\n') + 1 # only whole lines -- a torn last line may still be mid write
+        for line in tail[:done].splitlines():
+            if not line.strip(): continue
+            try: entry = json.loads(line)
+            except ValueError: logging.error(f"skipping torn log entry in {self.log_path}"); continue
+            if 'put' in entry: self.records[self._keyof(entry['put'], len(self.records))] = entry['put']
+            else: self.records.pop(entry['del'], None)
+            self._entries += 1
+        self._offset += done
+        self._torn = done < len(tail)
+
+    def refresh(self): # cheap when nothing changed: 2 stats
+        with self._lock:
+            while True:
+                snap = self._stat()
+                if snap != self._snap: self._reload()
+                try: logSize = os.path.getsize(self.log_path)
+                except FileNotFoundError: logSize = 0
+                if logSize < self._offset: self._reload() # compacted by another process
+                self._replay()
+                if self._stat() == self._snap: return # snapshot swapped while replaying → go again
+
+    def version(self): # changes w any write to the snapshot or the log, from any process
+        try: st = os.stat(self.log_path); log = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError: log = None
+        return self._stat(), log
+
+    def load(self):
+        self.refresh()
+        return [dict(r) if isinstance(r, dict) else r for r in self.records.values()] # copies → callers mutating them cant skew the next diff
+
+    @contextmanager
+    def _locked_log(self):
+        fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl: fcntl.flock(fd, fcntl.LOCK_EX)
+            self.refresh() # under the lock → sees every write that came before ours
+            with self._lock: yield fd
+        finally: os.close(fd) # closing drops the flock
+
+    def _append(self, fd, entries):
+        if not entries: return
+        data = ''.join(json.dumps(e, separators=(',', ':')) + '\n' for e in entries).encode('utf-8')
+        if self._torn: data = b'\n' + data
+        os.write(fd, data) # O_APPEND → lands at the end even w other writers
+        if LOG_FSYNC: os.fsync(fd)
+        for e in entries:
+            if 'put' in e: self.records[e['put'][self.key]] = e['put']
+            else: self.records.pop(e['del'], None)
+        self._offset += len(data)
+        self._entries += len(entries)
+        self._torn = False
+        if self._entries >= COMPACT_EVERY: self._compact(fd)
+
+    def _compact(self, fd, data=None):
+        if data is None: data = list(self.records.values())
+        write_atomic(self.path, data)
+        os.ftruncate(fd, 0) # same inode → the flock others wait on stays valid
+        if LOG_FSYNC: os.fsync(fd)
+        self._snap = self._stat()
+        self.records = {self._keyof(r, i): r for i, r in enumerate(data)}
+        self._offset = self._entries = 0
+        self._torn = False
+
+    def save(self, data): # full list (what the managers hold) → diffed against the current state, changes appended
+        with self._locked_log() as fd:
+            new = {self._keyof(rec, i): rec for i, rec in enumerate(data)}
+            if not all(isinstance(k, str) for k in itertools.chain(new, self.records)): return self._compact(fd, [dict(r) if isinstance(r, dict) else r for r in data]) # cant address those in the log → rewrite
+            entries = [{'put': dict(rec)} for k, rec in new.items() if self.records.get(k) != rec] # copies → caller mutating its list later cant touch the cache
+            entries += [{'del': k} for k in self.records if k not in new]
+            self._append(fd, entries)
+
+    # guard(version) runs under the log lock once caught up → callers can validate against the latest state from every process
+    # (raise → nothing written) | returns the version right after our write → nobody else's write hides in it
+    def put(self, rec, guard=None):
+        if not isinstance(rec.get(self.key), str): raise ValueError(f"record needs a string {self.key}")
+        with self._locked_log() as fd:
+            if guard: guard(self.version())
+            self._append(fd, [{'put': dict(rec)}])
+            return self.version()
+
+    def delete(self, key, guard=None):
+        with self._locked_log() as fd:
+            if guard: guard(self.version())
+            if key in self.records: self._append(fd, [{'del': key}])
+            return self.version()
+
+    def compact(self):
+        with self._locked_log() as fd: self._compact(fd)
+
+
+_stores = {}
+_storesLock = threading.Lock()
+
+
+def _data_path(file_name):
     try: data_folder = current_app.config['DATA_FOLDER']
     except RuntimeError: # not in flask context → use default
         data_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
+    return os.path.join(data_folder, file_name)
+
+
+def get_store(file_name): # None for files w/o a known record key → plain atomic rewrites
+    key = KEYS.get(file_name)
+    if key is None: return None
+    path = os.path.abspath(_data_path(file_name))
+    with _storesLock:
+        if path not in _stores: _stores[path] = JsonStore(path, key)
+        return _stores[path]
+
 
-    file_path = os.path.join(data_folder, file_name)
+def load_json(file_name):
+    """ returns: list -- data from json file as A LIST OF DICTS (array or ndjson file) + any logged changes on top """
+    file_path = _data_path(file_name)
 
     try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f: return json.load(f)
+        store = get_store(file_name)
+        if store and (os.path.exists(file_path) or os.path.exists(store.log_path)): return store.load()
+        if os.path.exists(file_path): return list(iter_json(file_path))
         else: # create empty file if dne
             with open(file_path, 'w') as f: f.write('[]')
             return []
@@ -23,15 +251,32 @@ def load_json(file_name):
         return []
 
 
-def save_json(file_name, data): #return bool
-    try: data_folder = current_app.config['DATA_FOLDER']
-    except RuntimeError: data_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data')
-
-    file_path = os.path.join(data_folder, file_name)
+def save_json(file_name, data): #return bool | known data files → only changed records hit the disk
+    file_path = _data_path(file_name)
 
     try:
-        with open(file_path, 'w') as f: json.dump(data, f, indent=2)
+        store = get_store(file_name)
+        if store: store.save(data)
+        else: write_atomic(file_path, data)
         return True
     except Exception as e:
         logging.error(f"error saving json to {file_path}: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+
+def save_record(file_name, record): # O(1) -- one log line
+    try:
+        get_store(file_name).put(record)
+        return True
+    except Exception as e:
+        logging.error(f"error saving record to {file_name}: {str(e)}")
+        return False
+
+
+def delete_record(file_name, key):
+    try:
+        get_store(file_name).delete(key)
+        return True
+    except Exception as e:
+        logging.error(f"error deleting record from {file_name}: {str(e)}")
+        return False
@@ -1,7 +1,6 @@
 import os
 import time
 import random
-import requests
 import threading
 import logging
 from datetime import datetime
@@ -9,7 +8,7 @@ from datetime import datetime
 class KeepAlive:
     def __init__(self, app_url=None):
         self.app_url = app_url or os.environ.get('RENDER_EXTERNAL_URL') or 'https://bankingsystem-0ybm.onrender.com/'
-        self.endpoint = '/health'
+        self.endpoint = '/livez' # just needs a request to land, no db work
         self.enabled = self._should_enable()
         self.running = False
         self.thread = None
@@ -37,6 +36,7 @@ class KeepAlive:
             self.logger.info("| STOPPED | keep alive stopped")
     
     def _keep_alive_loop(self):
+        import requests # lazy -- ~100ms of import only worth paying where keepalive actually runs
         while self.running:
             try:
                 ping = requests.get(
@@ -0,0 +1,261 @@
+""" minimal prometheus metrics -- counters + histograms w labels, rendered in the text exposition format
+
+no client lib dep; just what /metrics needs. values live in plain dicts per process, one short lock per metric.
+METRICS_MULTIPROC_DIR set (gunicorn) → each worker dumps its own values to <dir>/<pid>-<uid>.json every FLUSH_SECS
+n whichever worker serves /metrics sums every file → one view across workers w no cross process locking.
+uid is fresh per process → a recycled pid never lands in a dead workers file.
+worker exits → the master (gunicorn.conf.py child_exit) folds its counters/histograms into archive.json n drops the file
+→ totals survive restarts, gauges of dead workers go, the dir doesnt grow per restart | wipe the dir on deploy
+"""
+import os
+import json
+import time
+import atexit
+import threading
+import uuid
+from bisect import bisect_left
+
+MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')
+FLUSH_SECS = float(os.environ.get('METRICS_FLUSH_SECS', 5))
+
+DEFAULT_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+
+
+def _fmt(v): return '+Inf' if v == float('inf') else repr(float(v))
+def _escape(v): return str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {} # label values tuple → value
+        self._lock = threading.Lock()
+        self._registry = None
+
+    def _empty(self): # same def, no values -- merge target
+        twin = object.__new__(type(self))
+        twin.__dict__.update(self.__dict__, _values={}, _lock=threading.Lock(), _registry=None)
+        return twin
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames): raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def clear(self):
+        with self._lock: self._values.clear()
+
+    def render(self): return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock: self._values[key] = self._values.get(key, 0) + amount
+        if self._registry: self._registry.touch()
+
+    def _merge(self, key, value): self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels): return self._values.get(self._key(labels), 0)
+
+    def _samples(self): return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, amount, **labels):
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, amount) # 1st bucket w le >= amount
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            counts[idx] += 1
+            self._values[key] = (counts, total + amount)
+        if self._registry: self._registry.touch()
+
+    def _merge(self, key, value):
+        counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+        self._values[key] = ([a + b for a, b in zip(counts, value[0])], total + value[1])
+
+    def count(self, **labels):
+        hit = self._values.get(self._key(labels))
+        return sum(hit[0]) if hit else 0
+
+    def _samples(self):
+        out = []
+        for key, (counts, total) in sorted(self._values.items()):
+            running = 0
+            for le, c in zip(self.buckets, counts): # buckets are cumulative in the exposition format
+                running += c
+                out.append(f"{self.name}_bucket{_labels(self.labelnames, key, [('le', _fmt(le))])} {_fmt(running)}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_fmt(total)}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, key)} {_fmt(running)}")
+        return out
+
+
+class Gauge(_Metric): # point in time value | fn → read live at scrape/flush instead of set()
+    kind = 'gauge'
+
+    def __init__(self, name, help, labelnames=(), fn=None):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock: self._values[key] = value
+
+    def value(self, **labels):
+        self._collect()
+        return self._values.get(self._key(labels), 0)
+
+    def _collect(self):
+        if self.fn is None: return
+        fresh = {tuple(str(v) for v in k): val for k, val in self.fn().items()}
+        with self._lock: self._values = fresh
+
+    def _merge(self, key, value): self._values[key] = self._values.get(key, 0) + value # live workers summed
+
+    def _samples(self): return [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in sorted(self._values.items())]
+
+
+ARCHIVE = 'archive.json' # {'merged': [folded file names], 'metrics': dump} | counters + histograms of exited workers
+
+
+def _alive(pid):
+    try: os.kill(pid, 0)
+    except ProcessLookupError: return False
+    except OSError: return True # exists, just not ours
+    return True
+
+
+class Registry:
+    def __init__(self, multiproc_dir=MULTIPROC_DIR, flush_secs=FLUSH_SECS):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self.multiproc_dir = multiproc_dir
+        self.flush_secs = flush_secs
+        self._dirty = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._flusher_pid = None
+        self._file = (None, None) # (pid, path) → new uid after a fork
+
+    def register(self, metric): # idempotent by name → create_app can run many times (tests)
+        with self._lock:
+            metric = self._metrics.setdefault(metric.name, metric)
+            if self.multiproc_dir: metric._registry = self
+            return metric
+
+    def touch(self): # called per update in multiproc mode | starts this workers flusher once (pid check → survives fork)
+        self._dirty.set()
+        if self._flusher_pid != os.getpid():
+            with self._lock:
+                if self._flusher_pid == os.getpid(): return
+                self._flusher_pid = os.getpid()
+                threading.Thread(target=self._flush_loop, daemon=True).start()
+                atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            self._dirty.wait()
+            self._dirty.clear()
+            self.flush()
+            time.sleep(self.flush_secs) # coalesce → at most one write per FLUSH_SECS
+
+    def snapshot(self): # name → {kind, values} | kind lets the master fold files w/o the metric defs loaded
+        res = {}
+        for m in self._metrics.values():
+            if isinstance(m, Gauge): m._collect()
+            with m._lock: res[m.name] = {'kind': m.kind, 'values': [[list(k), v] for k, v in m._values.items()]}
+        return res
+
+    def _path(self):
+        if self._file[0] != os.getpid(): self._file = (os.getpid(), os.path.join(self.multiproc_dir, f"{os.getpid()}-{uuid.uuid4().hex}.json"))
+        return self._file[1]
+
+    def flush(self): # tmp file + rename → readers never see a half written dump
+        if not self.multiproc_dir: return
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        with self._flush_lock: # flusher thread vs a /metrics scrape in this worker
+            _write_json(self._path(), self.snapshot())
+
+    def mark_process_dead(self, pid): # gunicorn master, child_exit → fold the workers files into the archive, then drop them
+        if not self.multiproc_dir or not os.path.isdir(self.multiproc_dir): return
+        files = os.listdir(self.multiproc_dir)
+        dead = [f for f in files if f.endswith('.json') and f.split('-')[0] == str(pid)]
+        if not dead: return
+        archive = _read_json(os.path.join(self.multiproc_dir, ARCHIVE)) or {'merged': [], 'metrics': {}}
+        for fname in dead:
+            for name, m in (_read_json(os.path.join(self.multiproc_dir, fname)) or {}).items():
+                if m['kind'] == 'gauge': continue # no conns left to count
+                into = archive['metrics'].setdefault(name, {'kind': m['kind'], 'values': []})
+                vals = {tuple(k): v for k, v in into['values']}
+                for key, value in m['values']:
+                    key = tuple(key)
+                    if key not in vals: vals[key] = value
+                    elif m['kind'] == 'histogram': vals[key] = [[a + b for a, b in zip(vals[key][0], value[0])], vals[key][1] + value[1]]
+                    else: vals[key] += value
+                into['values'] = [[list(k), v] for k, v in vals.items()]
+        archive['merged'] = [f for f in archive['merged'] if f in files] + dead # names still on disk → readers skip them
+        _write_json(os.path.join(self.multiproc_dir, ARCHIVE), archive) # archive first → a scrape counts the worker once or, for a moment, not at all
+        for fname in dead: os.unlink(os.path.join(self.multiproc_dir, fname))
+
+    def _merged(self):
+        for attempt in range(2): # a file folded into the archive under us → read again w the new archive
+            merged = {name: m._empty() for name, m in self._metrics.items()}
+            files = os.listdir(self.multiproc_dir)
+            archive = _read_json(os.path.join(self.multiproc_dir, ARCHIVE)) or {'merged': [], 'metrics': {}}
+            dumps, vanished = [(archive['metrics'], True)], False
+            for fname in files:
+                if not fname.endswith('.json') or fname == ARCHIVE or fname in archive['merged']: continue
+                try:
+                    with open(os.path.join(self.multiproc_dir, fname)) as f: dumps.append((json.load(f), _alive(int(fname.split('-')[0])) if fname.split('-')[0].isdigit() else True))
+                except FileNotFoundError: vanished = True
+                except (OSError, ValueError): continue # worker mid crash → skip, next scrape catches up
+            if not vanished: break
+        for dump, alive in dumps:
+            for name, m in dump.items():
+                if name not in merged: continue # metric dropped from code since that file was written
+                if isinstance(merged[name], Gauge) and not alive: continue # dead workers hold no conns | counters keep their totals
+                for key, value in m['values']: merged[name]._merge(tuple(key), value)
+        return merged.values()
+
+    def counter(self, name, help, labelnames=()): return self.register(Counter(name, help, labelnames))
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS): return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name, help, labelnames=(), fn=None): return self.register(Gauge(name, help, labelnames, fn))
+
+    def render(self):
+        metrics = self._metrics.values()
+        for m in metrics:
+            if isinstance(m, Gauge): m._collect()
+        if self.multiproc_dir:
+            self.flush() # own values fresh, peers as of their last flush
+            metrics = self._merged()
+        return '\n'.join(line for m in metrics for line in m.render()) + '\n'
+
+
+def _read_json(path):
+    try:
+        with open(path) as f: return json.load(f)
+    except (OSError, ValueError): return None
+
+def _write_json(path, data):
+    with open(path + '.tmp', 'w') as f: json.dump(data, f)
+    os.replace(path + '.tmp', path)
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
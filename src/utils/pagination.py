@@ -0,0 +1,15 @@
+import base64
+from datetime import datetime
+
+
+def encode_cursor(created_at, row_id):
+    """ opaque keyset cursor -- (created_at, id) of the last row on a page """
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor): # raises ValueError on anything that isnt one of ours
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|', 1)
+        return datetime.fromisoformat(created_at), row_id
+    except Exception: raise ValueError("invalid cursor")
@@ -0,0 +1,118 @@
+""" bcrypt off the request thread -- bounded process pool w a queue-depth cap
+
+~250ms of cpu per hash/check → a login burst would otherwise pin every worker.
+past POOL_SIZE running + QUEUE_DEPTH waiting jobs calls fail fast w HasherBusy (→ 503 + Retry-After)
+sized per gunicorn worker for gthread (gunicorn.conf.py): pool = cores / workers → bcrypt procs across all workers ≈ cores,
+running + queued capped at half the threads (pool size included) → the other half always free for non login requests.
+pool procs start via forkserver/spawn → never forked from a worker that alr runs request threads.
+a pool whose child died (oom kill..) is dropped n rebuilt on the next call
+work factor comes from BCRYPT_ROUNDS, or BCRYPT_CALIBRATE → calibrate_from_env() measures it ONCE (gunicorn master,
+gunicorn.conf.py) n exports it → every worker uses the same cost. hashes below that cost get rehashed on next
+successful login (see UserManager.authenticate_user) | stronger ones are left alone → no rehash ping pong
+"""
+import os
+import time
+import logging
+import threading
+import multiprocessing
+import bcrypt
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1)) # gunicorn worker count
+_THREADS = int(os.environ.get('WEB_THREADS', 4)) if os.environ.get('WORKER_CLASS') == 'gthread' else 1
+_SLOTS = max(_THREADS // 2, 1) # running + queued bcrypt jobs per worker
+POOL_SIZE = min(int(os.environ.get('BCRYPT_POOL_SIZE', max(1, (os.cpu_count() or 1) // _WORKERS))), _SLOTS) # 0 → hash inline, no pool
+QUEUE_DEPTH = int(os.environ.get('BCRYPT_QUEUE_DEPTH', max(_SLOTS - POOL_SIZE, 0)))
+_MP_CONTEXT = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+RETRY_AFTER = int(os.environ.get('BCRYPT_RETRY_AFTER', 2)) # secs
+ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12)) # 12 == bcrypt lib default
+MIN_ROUNDS, MAX_ROUNDS = 10, 16
+
+logger = logging.getLogger(__name__)
+
+
+class HasherBusy(Exception):
+    def __init__(self, retry_after=RETRY_AFTER):
+        super().__init__("password hashing pool saturated")
+        self.retry_after = retry_after
+
+
+# module level → picklable for the pool
+def _hash(password, rounds): return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+def _check(password, hashed): return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+class PasswordHasher:
+    def __init__(self, pool_size=POOL_SIZE, queue_depth=QUEUE_DEPTH):
+        self.pool_size = pool_size
+        self._slots = threading.BoundedSemaphore(max(pool_size, 1) + queue_depth)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+
+    def _executor(self): # lazy n per process -- a pool inherited over gunicorns fork has no live workers
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.pool_size, mp_context=multiprocessing.get_context(_MP_CONTEXT))
+                self._pid = os.getpid()
+            return self._pool
+
+    def _drop(self, pool): # broken pools never recover → next _executor() builds a fresh one
+        with self._lock:
+            if self._pool is pool: self._pool = None
+        pool.shutdown(wait=False)
+
+    def _submit(self, fn, *args):
+        pool = self._executor()
+        try: return pool.submit(fn, *args).result()
+        except BrokenProcessPool:
+            self._drop(pool)
+            raise
+
+    def run(self, fn, *args):
+        if self.pool_size <= 0: return fn(*args)
+        if not self._slots.acquire(blocking=False): raise HasherBusy()
+        try:
+            try: return self._submit(fn, *args)
+            except BrokenProcessPool: return self._submit(fn, *args) # one retry on a fresh pool
+        finally: self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pid == os.getpid(): self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+hasher = PasswordHasher()
+
+def hash_password(password): return hasher.run(_hash, password, ROUNDS)
+def check_password(password, hashed): return hasher.run(_check, password, hashed)
+
+def hash_rounds(hashed): return int(hashed.split('$')[2]) # $2b$<cost>$<salt+hash>
+def needs_rehash(hashed):
+    try: return hash_rounds(hashed) < ROUNDS
+    except (IndexError, ValueError): return False # not a bcrypt hash -- nothing to upgrade
+
+def set_rounds(rounds):
+    global ROUNDS
+    ROUNDS = max(4, min(int(rounds), 31)) # bcrypts own limits
+
+
+def calibrate_from_env(): # once per deploy | no-op when BCRYPT_ROUNDS is set (config, or an earlier calibration in this process tree)
+    if not os.environ.get('BCRYPT_CALIBRATE') or os.environ.get('BCRYPT_ROUNDS'): return ROUNDS
+    set_rounds(calibrate_rounds(int(os.environ.get('BCRYPT_TARGET_MS', 250))))
+    os.environ['BCRYPT_ROUNDS'] = str(ROUNDS) # forked/spawned workers n later create_app calls inherit it
+    return ROUNDS
+
+
+def calibrate_rounds(target_ms, min_rounds=MIN_ROUNDS, max_rounds=MAX_ROUNDS, probe_rounds=8):
+    """ highest cost whose hash stays under target_ms on this box | each +1 round doubles the work """
+    t0 = time.perf_counter()
+    _hash('calibration-probe', probe_rounds)
+    probe_ms = (time.perf_counter() - t0) * 1000
+
+    rounds = min_rounds
+    while rounds < max_rounds and probe_ms * 2 ** (rounds + 1 - probe_rounds) <= target_ms: rounds += 1
+    logger.info(f" === bcrypt calibrated -- {rounds} rounds ≈ {probe_ms * 2 ** (rounds - probe_rounds):.0f}ms (target {target_ms}ms) === ")
+    return rounds
@@ -0,0 +1,60 @@
+""" opt-in (DB_METRICS=1) sql count + db time per request -- catches N+1 regressions in prod
+
+every response gets X-DB-Queries / X-DB-Time-ms, per route histograms land in the /metrics registry (prometheus text).
+route label is the url rule (/api/v1/accounts/<account_id>) not the path → bounded cardinality.
+streamed bodies (statements) run their sql after the headers go out → only the pre-stream queries are counted
+"""
+import os
+import time
+from flask import g, request, has_request_context, Response, jsonify
+from sqlalchemy import event
+from src.utils.metrics import REGISTRY, CONTENT_TYPE
+
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+db_queries = REGISTRY.histogram('http_request_db_queries', 'SQL statements issued per request', ('method', 'route'), QUERY_BUCKETS)
+db_seconds = REGISTRY.histogram('http_request_db_seconds', 'Time spent executing SQL per request', ('method', 'route'))
+req_seconds = REGISTRY.histogram('http_request_duration_seconds', 'Request wall time', ('method', 'route', 'status'))
+
+
+def _before_cursor(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_t0', []).append(time.perf_counter())
+
+def _after_cursor(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_t0'].pop()
+    if has_request_context() and 'db_queries' in g:
+        g.db_queries += 1
+        g.db_time += elapsed
+
+def _on_error(ctx): # failed statement never reaches after_cursor_execute → drop its start mark
+    stack = ctx.connection.info.get('query_t0') if ctx.connection is not None else None
+    if stack: stack.pop()
+
+
+def _start_request():
+    g.db_queries, g.db_time, g.req_t0 = 0, 0.0, time.perf_counter()
+
+def _finish_request(resp):
+    if 'db_queries' not in g: return resp
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    resp.headers['X-DB-Queries'] = str(g.db_queries)
+    resp.headers['X-DB-Time-ms'] = f"{g.db_time * 1000:.2f}"
+    db_queries.observe(g.db_queries, method=request.method, route=route)
+    db_seconds.observe(g.db_time, method=request.method, route=route)
+    req_seconds.observe(time.perf_counter() - g.req_t0, method=request.method, route=route, status=resp.status_code)
+    return resp
+
+
+def metrics_view():
+    token = os.environ.get('METRICS_TOKEN') # set → scrapers must send it as a bearer token
+    if token and request.headers.get('Authorization') != f"Bearer {token}": return jsonify(error="unauthorized"), 401
+    return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+
+def init_query_metrics(app, db):
+    with app.app_context(): engine = db.engine
+    event.listen(engine, 'before_cursor_execute', _before_cursor)
+    event.listen(engine, 'after_cursor_execute', _after_cursor)
+    event.listen(engine, 'handle_error', _on_error)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
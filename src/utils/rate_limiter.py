@@ -0,0 +1,111 @@
+""" login throttling -- token buckets per client ip n per username, checked before any db/bcrypt work
+
+a rejected attempt costs a dict lookup (or one redis round trip) instead of ~250ms of bcrypt.
+backend is pluggable: anything w take(key, capacity, rate) -> (allowed, retry_after)
+ - MemoryBackend → per process, default (n gunicorn workers → n x the budget)
+ - RedisBackend  → shared across workers/hosts, RATE_LIMIT_STORAGE=redis://...  (needs the redis pkg)
+"""
+import os
+import math
+import time
+import threading
+from collections import OrderedDict
+
+STORAGE = os.environ.get('RATE_LIMIT_STORAGE', 'memory')
+IP_BURST = int(os.environ.get('LOGIN_IP_BURST', 30))
+IP_PER_MIN = float(os.environ.get('LOGIN_IP_PER_MIN', 30))
+USER_BURST = int(os.environ.get('LOGIN_USER_BURST', 5))
+USER_PER_MIN = float(os.environ.get('LOGIN_USER_PER_MIN', 5))
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after=1):
+        super().__init__("too many login attempts")
+        self.retry_after = retry_after
+
+
+class MemoryBackend:
+    def __init__(self, max_keys=100000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets = OrderedDict() # key → (tokens, last refill ts, capacity, rate) | lru order, oldest first
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        now = self.clock()
+        with self._lock:
+            tokens, ts, _, _ = self._buckets.pop(key, (capacity, now, capacity, rate))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            allowed = tokens >= 1
+            if allowed: tokens -= 1
+            self._buckets[key] = (tokens, now, capacity, rate) # → newest end
+            self._evict(now)
+        return allowed, 0 if allowed else math.ceil((1 - tokens) / rate)
+
+    def reset(self, key):
+        with self._lock: self._buckets.pop(key, None)
+
+    def clear(self):
+        with self._lock: self._buckets.clear()
+
+    def _evict(self, now): # from the lru end only → O(1) amortized per take, never a full scan
+        while self._buckets:
+            tokens, ts, capacity, rate = next(iter(self._buckets.values()))
+            if len(self._buckets) <= self.max_keys and tokens + (now - ts) * rate < capacity: break # oldest still carries state
+            self._buckets.popitem(last=False) # refilled to full (its own capacity/rate) → no state | or over max_keys → lru goes
+
+
+class RedisBackend:
+    # refill + take in one atomic step | key expires once it would be full again anyway
+    SCRIPT = """
+local capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = math.min(capacity, (tonumber(b[1]) or capacity) + (now - (tonumber(b[2]) or now)) * rate)
+local allowed = 0
+if tokens >= 1 then tokens = tokens - 1; allowed = 1 end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url, prefix='ratelimit:'):
+        import redis # optional dep -- only when a shared store is configured
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(self.SCRIPT)
+
+    def take(self, key, capacity, rate):
+        allowed, tokens = self._take(keys=[self.prefix + key], args=[capacity, rate, time.time()])
+        return bool(allowed), 0 if allowed else math.ceil((1 - float(tokens)) / rate)
+
+    def reset(self, key): self.client.delete(self.prefix + key)
+
+    def clear(self): # every bucket under our prefix | SCAN → doesnt block redis like KEYS would
+        keys = list(self.client.scan_iter(match=self.prefix + '*', count=1000))
+        if keys: self.client.delete(*keys)
+
+
+def make_backend(storage=STORAGE):
+    if storage.startswith(('redis://', 'rediss://')): return RedisBackend(storage)
+    if storage == 'memory': return MemoryBackend()
+    raise ValueError(f"unknown rate limit storage: {storage}")
+
+
+class LoginLimiter:
+    def __init__(self, backend=None, ip_limit=(IP_BURST, IP_PER_MIN), user_limit=(USER_BURST, USER_PER_MIN)):
+        self.backend = backend or make_backend()
+        self.ip_limit = ip_limit
+        self.user_limit = user_limit
+
+    def check(self, ip, username): # raises RateLimited | ip first → a sprayer cant drain other ppls username buckets for free
+        for key, (burst, per_min) in ((f"ip:{ip}", self.ip_limit), (f"user:{self._norm(username)}", self.user_limit)):
+            if burst <= 0: continue # 0 → limit disabled
+            allowed, retry_after = self.backend.take(key, burst, per_min / 60)
+            if not allowed: raise RateLimited(retry_after=retry_after)
+
+    def login_succeeded(self, username): self.backend.reset(f"user:{self._norm(username)}") # legit user isnt left half locked out
+
+    def _norm(self, username): return str(username).strip().lower()
+
+
+login_limiter = LoginLimiter()
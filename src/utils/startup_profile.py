@@ -0,0 +1,93 @@
+""" cold start report -- per phase wall time + per module import time as one structured log line
+
+on w `python run.py --profile-startup` or PROFILE_STARTUP=1 (gunicorn). stdlib only → import it before anything else
+so the import hook sees flask/sqlalchemy/... load. off → phase() is a bare yield n no hook is installed
+"""
+import os
+import sys
+import json
+import time
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger('startup_profile')
+
+
+class _TimedLoader: # wraps the real loader → times exec_module (module body incl. its own imports)
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def __getattr__(self, attr): return getattr(self._loader, attr)
+
+    def exec_module(self, module):
+        prof = self._profiler
+        prof._stack.append(0.0) # children total
+        t0 = time.perf_counter()
+        try: self._loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - t0
+            children = prof._stack.pop()
+            if prof._stack: prof._stack[-1] += total
+            prof.imports[self._name] = (total * 1000, (total - children) * 1000)
+
+
+class _ImportTimer: # meta path finder that defers to the real ones n swaps in a timing loader
+    def __init__(self, profiler): self._profiler = profiler
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'): continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None: continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'): spec.loader = _TimedLoader(spec.loader, name, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.phases = {} # name → ms
+        self.imports = {} # module → (cumulative ms, self ms)
+        self._stack = []
+        self._t0 = None
+        self._hook = None
+
+    def enable(self):
+        if self.enabled: return
+        self.enabled = True
+        self._t0 = time.perf_counter()
+        self._hook = _ImportTimer(self)
+        sys.meta_path.insert(0, self._hook)
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        t0 = time.perf_counter()
+        try: yield
+        finally: self.phases[name] = round((time.perf_counter() - t0) * 1000, 2)
+
+    def report(self, top=25):
+        if not self.enabled: return None
+        if self._hook in sys.meta_path: sys.meta_path.remove(self._hook) # startup over → stop wrapping loaders
+
+        # top level pkgs (flask, sqlalchemy, ...) by cumulative | modules by self time
+        pkgs = {name: cum for name, (cum, _) in self.imports.items() if '.' not in name}
+        res = {
+            'event': 'startup_profile',
+            'total_ms': round((time.perf_counter() - self._t0) * 1000, 2),
+            'phases_ms': self.phases,
+            'modules_imported': len(self.imports),
+            'top_packages_ms': {n: round(ms, 2) for n, ms in sorted(pkgs.items(), key=lambda kv: -kv[1])[:top]},
+            'top_modules_self_ms': {n: round(s, 2) for n, (_, s) in sorted(self.imports.items(), key=lambda kv: -kv[1][1])[:top]},
+        }
+        logger.info(json.dumps(res))
+        return res
+
+
+startup_profiler = StartupProfiler()
+if os.environ.get('PROFILE_STARTUP'): startup_profiler.enable()
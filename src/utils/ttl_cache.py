@@ -0,0 +1,41 @@
+""" small thread safe TTL + LRU cache -- bounded by entry count, entries expire ttl secs after set
+
+per process → each gunicorn worker has its own copy; ttl bounds how stale a peer worker can get
+"""
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    def __init__(self, maxsize=1024, ttl=60, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._data = OrderedDict() # key → (expires_at, value) | oldest used first
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None: return default
+            if hit[0] <= self.clock():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return hit[1]
+
+    def set(self, key, value):
+        if self.maxsize <= 0 or self.ttl <= 0: return # disabled
+        with self._lock:
+            self._data[key] = (self.clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize: self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock: self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock: self._data.clear()
+
+    def __len__(self): return len(self._data)
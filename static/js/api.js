@@ -46,8 +46,11 @@ class BankAPI {
     async withdraw(accountId, amount, description = ''){ return this.request('POST', `/accounts/${accountId}/withdraw`, { amount,description});}
     async transfer(fromAccountId, toAccountId, amount, description = '') { return this.request('POST', '/accounts/transfer', { from_account_id: fromAccountId,to_account_id: toAccountId,amount,description});}
 
-    async getAccountTransactions(accountId){ return this.request('GET', `/accounts/${accountId}/transactions`);}
-    async getUserTransactions(){ return this.request('GET', '/accounts/user/transactions');}
+    // transac history is keyset paginated -- one page per call, pass back next_cursor for the next one (null → last page)
+    async getAccountTransactions(accountId, cursor = null){ return this.getTransactionPage(`/accounts/${accountId}/transactions`, cursor);}
+    async getUserTransactions(cursor = null){ return this.getTransactionPage('/accounts/user/transactions', cursor);}
+
+    async getTransactionPage(endpoint, cursor = null){ return this.request('GET', cursor ? `${endpoint}?cursor=${encodeURIComponent(cursor)}` : endpoint);}
 
     async getLoans(){ return this.request('GET', '/loans');}
     async getLoan(loanId){ return this.request('GET', `/loans/${loanId}`);}
@@ -161,7 +161,7 @@ document.addEventListener('DOMContentLoaded', () => {
             }
             const transactionsData = await api.getUserTransactions();
             state.transactions = transactionsData.transactions || [];
-            transactionsComponent.setData(state.transactions, state.accounts);
+            transactionsComponent.setData(state.transactions, state.accounts, transactionsData.next_cursor);
         } catch (error){ console.error('Error loading transactions:', error);}
     }
 
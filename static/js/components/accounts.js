@@ -2,6 +2,7 @@ class AccountsComponent {
     constructor() {
         this.accounts = [];
         this.selectedAccount = null;
+        this.transactionsCursor = null;
         this.initEventListeners();
     }
 
@@ -16,6 +17,7 @@ class AccountsComponent {
         document.getElementById('deposit-btn').addEventListener('click',this.showDepositModal.bind(this));
         document.getElementById('withdraw-btn').addEventListener('click',this.showWithdrawModal.bind(this));
         document.getElementById('close-account-btn').addEventListener('click',this.handleCloseAccount.bind(this));
+        document.getElementById('modal-transactions-more').addEventListener('click',this.loadMoreTransactions.bind(this));
 
         // transaction forms
         document.getElementById('deposit-form').addEventListener('submit',this.handleDeposit.bind(this));
@@ -63,9 +65,10 @@ class AccountsComponent {
             const acc = await api.getAccount(accountId);
             this.selectedAccount = acc;
 
-            // get account transactions
+            // get account transactions -- 1st page, rest on "load more"
             const transactionsData = await api.getAccountTransactions(accountId);
             const transactions = transactionsData.transactions || [];
+            this.transactionsCursor = transactionsData.next_cursor;
 
             // update modal ui
             document.getElementById('modal-account-number').textContent = acc.account_number;
@@ -83,6 +86,7 @@ class AccountsComponent {
                     transactionsContainer.appendChild(this.createTransactionElement(transaction));
                 });
             } else { transactionsContainer.innerHTML = '<div class="empty-state">no transactions found</div>';}
+            document.getElementById('modal-transactions-more').style.display = this.transactionsCursor ? 'block' : 'none';
 
             // show modal
             document.getElementById('account-modal').style.display = 'block';
@@ -93,6 +97,22 @@ class AccountsComponent {
         } catch(error){ console.error('error viewing account details:', error); alert('failed to load account details');}
     }
 
+    async loadMoreTransactions() {
+        if (!this.selectedAccount || !this.transactionsCursor) return;
+        const moreBtn = document.getElementById('modal-transactions-more');
+        moreBtn.disabled = true;
+        try {
+            const page = await api.getAccountTransactions(this.selectedAccount.account_id, this.transactionsCursor);
+            const transactionsContainer = document.getElementById('modal-account-transactions');
+            (page.transactions || []).forEach(transaction => {
+                transactionsContainer.appendChild(this.createTransactionElement(transaction));
+            });
+            this.transactionsCursor = page.next_cursor;
+            moreBtn.style.display = this.transactionsCursor ? 'block' : 'none';
+        } catch(error){ console.error('error loading more transactions:', error);}
+        finally{ moreBtn.disabled = false;}
+    }
+
     showNewAccountModal() {
         // reset form
         document.getElementById('new-account-form').reset();
@@ -2,6 +2,7 @@ class TransactionsComponent {
     constructor() {
         this.transactions = [];
         this.accounts = [];
+        this.nextCursor = null;
         this.initEventListeners();
     }
 
@@ -9,14 +10,30 @@ class TransactionsComponent {
         // filter controls
         document.getElementById('transaction-account').addEventListener('change',this.filterTransactions.bind(this));
         document.getElementById('transaction-type').addEventListener('change',this.filterTransactions.bind(this));
+        document.getElementById('transactions-more').addEventListener('click',this.loadMore.bind(this));
     }
 
-    setData(transactions, accounts) {
+    setData(transactions, accounts, nextCursor = null) {
         this.transactions = transactions || [];
         this.accounts = accounts || [];
+        this.nextCursor = nextCursor;
         this.updateTransactionsUI();
     }
 
+    // next page only when asked for -- full history never loads up front
+    async loadMore() {
+        if(!this.nextCursor) return;
+        const moreBtn = document.getElementById('transactions-more');
+        moreBtn.disabled = true;
+        try {
+            const page = await api.getUserTransactions(this.nextCursor);
+            this.transactions.push(...(page.transactions || []));
+            this.nextCursor = page.next_cursor;
+            this.filterTransactions();
+        } catch(error){ console.error('error loading more transactions:', error);}
+        finally{ moreBtn.disabled = false;}
+    }
+
     updateTransactionsUI() {
         // populate account filter
         const accountSelect = document.getElementById('transaction-account');
@@ -53,6 +70,8 @@ class TransactionsComponent {
             filteredTransactions.forEach(transaction =>{ transactionsList.appendChild(this.createTransactionElement(transaction));});
         }
         else{ transactionsList.innerHTML = '<div class="empty-state">No transactions found</div>';}
+
+        document.getElementById('transactions-more').style.display = this.nextCursor ? 'block' : 'none';
     }
 
     createTransactionElement(transaction){
@@ -1,7 +1,21 @@
 import pytest
 import os
 import json
+from contextlib import contextmanager
+from sqlalchemy import event
 from src.app import create_app
+from src.models import db, User
+from src.utils.jwt_auth import generate_token
+from src.utils.rate_limiter import login_limiter
+
+os.environ.setdefault("AUTO_INIT_DB", "0") # fixtures create_all themselves → no alembic run per test app
+
+@pytest.fixture(autouse=True)
+def fresh_login_limiter():
+    ''' every test client shares 127.0.0.1 → start each test w full buckets '''
+    login_limiter.backend.clear()
+    yield
+
 
 @pytest.fixture
 def app():
@@ -12,6 +26,7 @@ def app():
         "JWT_SECRET_KEY" : "test-jwt-key",
         "DATA_FODLER" : os.path.join(os.path.dirname(__file__), "test_data")
     })
+    with app.app_context(): db.create_all() # create_app no longer bootstraps
 
     # create a test data dir
     os.makedirs(app.config['DATA_FODLER'], exist_ok=True)
@@ -47,4 +62,48 @@ def auth_header(client):
     })
 
     data = json.loads(resp.data)
-    return {"Authorization": f"Bearer {data['token']}"}
\ No newline at end of file
+    return {"Authorization": f"Bearer {data['token']}"}
+
+@pytest.fixture
+def db_app(tmp_path, monkeypatch):
+    ''' app bound to a throwaway sqlite db -- for tests that go through the real orm '''
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app()
+    app.config.update({
+        "TESTING" : True,
+        "JWT_SECRET_KEY" : "test-jwt-key",
+    })
+
+    with app.app_context():
+        db.create_all()
+        yield app
+
+
+@pytest.fixture
+def metrics_public(monkeypatch):
+    ''' /metrics is only registered w a token or METRICS_PUBLIC=1 → request before the app fixture '''
+    monkeypatch.setenv("METRICS_PUBLIC", "1")
+
+
+@pytest.fixture
+def db_user(db_app):
+    ''' plain user in the throwaway db + jwt header for them '''
+    user = User(username="dbUser", password="$2b$12$not_a_real_hash", email="dbuser@example.com", full_name="Db User")
+    db.session.add(user)
+    db.session.commit()
+
+    with db_app.test_request_context(): token = generate_token(user.user_id, user.username, user.role)
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def sql_log(db_app):
+    ''' ctx manager collecting every statement sent to the db while open -- for query count asserts (catches N+1s) '''
+    @contextmanager
+    def capture():
+        seen = []
+        def hook(conn, cursor, statement, *args): seen.append(statement)
+        event.listen(db.engine, "before_cursor_execute", hook)
+        try: yield seen
+        finally: event.remove(db.engine, "before_cursor_execute", hook)
+    return capture
@@ -0,0 +1,109 @@
+import json
+import pytest
+from flask import Flask
+from src.core.Repository import JsonRepository
+from src.core.Account import Account
+from src.core.Transaction import Transaction
+from src.core.User import User
+from src.utils import json_utils
+from src.utils.json_utils import save_json
+
+HASH = "$2b$12$not_a_real_hash"
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    app = Flask(__name__)
+    app.config["DATA_FOLDER"] = str(tmp_path)
+    with app.app_context(): yield tmp_path
+
+
+@pytest.fixture
+def accounts(data_dir):
+    save_json("accounts.json", [Account("u1", "Checking", 10, account_id="a1").to_dict(),
+                                Account("u1", "Savings", 20, account_id="a2").to_dict(),
+                                Account("u2", "Savings", 30, account_id="a3").to_dict()])
+    return JsonRepository("accounts.json", Account, "account_id", multi=("user_id",))
+
+
+class TestJsonRepository:
+    def test_lookups(self, accounts):
+        assert accounts.get("a2").balance == 20.0
+        assert accounts.get("nope") is None
+        assert [a.account_id for a in accounts.find("user_id", "u1")] == ["a1", "a2"]
+        assert accounts.find("user_id", "ghost") == []
+        assert len(accounts.all()) == 3
+
+    def test_file_loaded_once(self, accounts, monkeypatch):
+        accounts.get("a1")
+        calls = []
+        real = json_utils.JsonStore.load
+        monkeypatch.setattr(json_utils.JsonStore, "load", lambda self: calls.append(1) or real(self))
+        for _ in range(100): accounts.get("a3")
+        assert calls == []
+
+    def test_write_through_updates_indexes(self, accounts, data_dir):
+        acc = accounts.get("a1")
+        acc.user_id = "u2"
+        acc.deposit(5)
+        assert accounts.save(acc)
+        assert [a.account_id for a in accounts.find("user_id", "u1")] == ["a2"]
+        assert [a.account_id for a in accounts.find("user_id", "u2")] == ["a3", "a1"]
+        assert json.loads((data_dir / "accounts.json.log").read_text().splitlines()[-1])["put"]["balance"] == 15.0 # one log line
+        assert accounts.delete("a3")
+        assert not accounts.delete("a3")
+        assert [a.account_id for a in accounts.find("user_id", "u2")] == ["a1"]
+
+    def test_returned_objects_are_copies(self, accounts):
+        accounts.get("a1").deposit(100)
+        assert accounts.get("a1").balance == 10.0
+
+    def test_reloads_on_outside_write(self, accounts):
+        accounts.get("a1")
+        other = JsonRepository("accounts.json", Account, "account_id", multi=("user_id",)) # ~ another worker
+        other.save(Account("u9", "Checking", 1, account_id="a9"))
+        assert accounts.get("a9").user_id == "u9"
+        assert [a.account_id for a in accounts.find("user_id", "u9")] == ["a9"]
+
+    def test_write_racing_other_worker_not_lost(self, accounts, data_dir):
+        accounts.get("a1")
+        other = json_utils.JsonStore(str(data_dir / "accounts.json"), "account_id") # another worker, lands after our last look
+        other.put(Account("u9", "Checking", 1, account_id="X").to_dict())
+        accounts._fresh = lambda: None # race window: the write lands between our freshness check n our append
+        assert accounts.save(Account("u1", "Checking", 2, account_id="Y"))
+        assert [a.account_id for a in accounts.all()] == ["a1", "a2", "a3", "X", "Y"]
+        assert [a.account_id for a in accounts.find("user_id", "u9")] == ["X"]
+
+    def test_unique_enforced_across_workers(self, data_dir):
+        mine = JsonRepository("users.json", User, "user_id", unique=("username",))
+        theirs = JsonRepository("users.json", User, "user_id", unique=("username",))
+        mine.all()
+        theirs.save(User("bob", HASH, "b@x.com", "Bob", user_id="u1"))
+        mine._fresh = lambda: None # stale view of the file
+        with pytest.raises(ValueError): mine.save(User("bob", HASH, "b2@x.com", "Bob 2", user_id="u2"))
+        assert [u.user_id for u in theirs.all()] == ["u1"] # nothing written
+
+    def test_unique_index(self, data_dir):
+        users = JsonRepository("users.json", User, "user_id", unique=("username",))
+        users.save(User("bob", HASH, "b@x.com", "Bob", user_id="u1"))
+        assert users.find_one("username", "bob").user_id == "u1"
+        with pytest.raises(ValueError): users.save(User("bob", HASH, "b2@x.com", "Bob 2", user_id="u2"))
+        renamed = users.get("u1")
+        renamed.username = "robert"
+        users.save(renamed)
+        assert users.find_one("username", "bob") is None
+        assert users.find_one("username", "robert").user_id == "u1"
+
+    def test_save_io_error_returns_false(self, accounts, monkeypatch):
+        def boom(rec, guard=None): raise OSError("disk full")
+        accounts.all() # binds the store
+        monkeypatch.setattr(accounts._store, "put", boom)
+        assert accounts.save(Account("u1", "Checking", 1, account_id="a9")) is False
+        assert accounts.get("a9") is None
+
+    def test_transactions_by_either_account(self, data_dir):
+        trs = JsonRepository("transactions.json", Transaction, "transaction_id", multi=("account_id", "destination_account_id"))
+        trs.save(Transaction("a1", "transfer", 5, destination_account_id="a2", transaction_id="t1"))
+        trs.save(Transaction("a2", "deposit", 1, transaction_id="t2"))
+        assert [t.transaction_id for t in trs.find("account_id", "a2")] == ["t2"]
+        assert [t.transaction_id for t in trs.find("destination_account_id", "a2")] == ["t1"]
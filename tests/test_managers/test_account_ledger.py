@@ -0,0 +1,137 @@
+import pytest
+from unittest.mock import patch
+from src.managers.AccountManager import AccountManager
+from sqlalchemy import text
+from src.models import db, User, Account, Transaction
+
+
+@pytest.fixture
+def accs(db_app):
+    user = User(username="ledgerUser", password="$2b$12$not_a_real_hash", email="ledger@example.com", full_name="Ledger User")
+    db.session.add(user)
+    db.session.commit()
+
+    acc_manager = AccountManager()
+    from_id = acc_manager.create_account({"user_id": user.user_id, "account_type": "Checking", "balance": 1000.0})
+    to_id = acc_manager.create_account({"user_id": user.user_id, "account_type": "Savings"})
+    return from_id, to_id
+
+
+class TestAccountLedger:
+    ''' balance changes n their ledger rows -- against real orm '''
+
+    def _ledger(self, account_id): return Transaction.query.filter_by(account_id=account_id).all()
+
+    def test_create_account_initial_deposit_single_commit(self, db_app):
+        user = User(username="u2", password="$2b$12$not_a_real_hash", email="u2@example.com", full_name="U Two")
+        db.session.add(user)
+        db.session.commit()
+
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            accId = AccountManager().create_account({"user_id": user.user_id, "account_type": "Checking", "balance": 250.0})
+
+        assert commit.call_count == 1
+        ledger = self._ledger(accId)
+        assert len(ledger) == 1
+        assert float(ledger[0].amount) == 250.0
+
+    def test_deposit_single_commit(self, accs):
+        from_id, _ = accs
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            new_balance = AccountManager().deposit(from_id, 500.0, "test deposit")
+
+        assert commit.call_count == 1
+        assert new_balance == 1500.0
+        assert [t.description for t in self._ledger(from_id)].count("test deposit") == 1
+
+    def test_withdraw_single_commit(self, accs):
+        from_id, _ = accs
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            new_balance = AccountManager().withdraw(from_id, 300.0, "test withdrawal")
+
+        assert commit.call_count == 1
+        assert new_balance == 700.0
+        assert any(t.transaction_type == "withdrawal" for t in self._ledger(from_id))
+
+    def test_transfer_single_commit(self, accs):
+        from_id, to_id = accs
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            assert AccountManager().transfer(from_id, to_id, 400.0, "test transfer") is True
+
+        assert commit.call_count == 1
+        assert float(db.session.get(Account, from_id).balance) == 600.0
+        assert float(db.session.get(Account, to_id).balance) == 400.0
+        trs = [t for t in self._ledger(from_id) if t.transaction_type == "transfer"]
+        assert len(trs) == 1 and trs[0].destination_account_id == to_id
+
+    def test_failed_commit_leaves_no_partial_state(self, accs):
+        ''' balance n ledger row go in the same commit → both rolled back together '''
+        from_id, _ = accs
+        n_before = len(self._ledger(from_id))
+
+        with patch.object(db.session, 'commit', side_effect=RuntimeError("db down")):
+            with pytest.raises(RuntimeError): AccountManager().deposit(from_id, 500.0)
+
+        db.session.expire_all()
+        assert float(db.session.get(Account, from_id).balance) == 1000.0
+        assert len(self._ledger(from_id)) == n_before
+
+
+class TestAtomicBalanceUpdates:
+    ''' balance math happens in the UPDATE, not on a python copy of the row '''
+
+    def _set_balance_elsewhere(self, account_id, balance): # simulates another worker committing in between
+        with db.engine.begin() as conn:
+            conn.execute(text("UPDATE accounts SET balance = :b WHERE account_id = :id"), {"b": balance, "id": account_id})
+
+    def test_withdraw_ignores_stale_loaded_balance(self, accs):
+        from_id, _ = accs
+        acc_manager = AccountManager()
+        assert float(acc_manager.get_account_by_id(from_id).balance) == 1000.0 # now sitting in identity map
+
+        self._set_balance_elsewhere(from_id, 100.0)
+
+        with pytest.raises(ValueError) as e: acc_manager.withdraw(from_id, 200.0)
+        assert "insufficient funds" in str(e.value).lower()
+        assert float(db.session.get(Account, from_id).balance) == 100.0
+
+    def test_deposit_does_not_lose_concurrent_update(self, accs):
+        from_id, _ = accs
+        acc_manager = AccountManager()
+        acc_manager.get_account_by_id(from_id)
+
+        self._set_balance_elsewhere(from_id, 2000.0)
+
+        assert acc_manager.deposit(from_id, 50.0) == 2050.0
+
+    def test_withdraw_exact_balance(self, accs):
+        from_id, _ = accs
+        assert AccountManager().withdraw(from_id, 1000.0) == 0.0
+
+    def test_withdraw_errors(self, accs):
+        from_id, _ = accs
+        acc_manager = AccountManager()
+
+        with pytest.raises(ValueError) as e: acc_manager.withdraw("dne-id", 10.0)
+        assert "account not found" in str(e.value).lower()
+
+        acc_manager.update_account(from_id, {"active": False})
+        with pytest.raises(ValueError) as e: acc_manager.withdraw(from_id, 10.0)
+        assert "cannot withdraw from inactive account" in str(e.value).lower()
+
+    def test_transfer_to_inactive_rolls_back_debit(self, accs):
+        from_id, to_id = accs
+        acc_manager = AccountManager()
+        acc_manager.update_account(to_id, {"active": False})
+
+        with pytest.raises(ValueError) as e: acc_manager.transfer(from_id, to_id, 100.0)
+        assert "inactive account" in str(e.value).lower()
+
+        db.session.expire_all()
+        assert float(db.session.get(Account, from_id).balance) == 1000.0
+        assert not Transaction.query.filter_by(transaction_type="transfer").all()
+
+    def test_transfer_insufficient_funds(self, accs):
+        from_id, to_id = accs
+        with pytest.raises(ValueError) as e: AccountManager().transfer(from_id, to_id, 1000.01)
+        assert "insufficient funds" in str(e.value).lower()
@@ -0,0 +1,123 @@
+import pytest
+from unittest.mock import patch
+from src.managers.AccountManager import AccountManager
+from src.models import db, Account, Transaction
+
+
+class TestBatchTransfer:
+    @pytest.fixture
+    def accs(self, db_user):
+        user, _ = db_user
+        acc_manager = AccountManager()
+        src = acc_manager.create_account({"user_id": user.user_id, "account_type": "Checking", "balance": 1000.0})
+        dests = [acc_manager.create_account({"user_id": user.user_id, "account_type": "Savings"}) for _ in range(3)]
+        return src, dests
+
+    def _balance(self, account_id):
+        db.session.expire_all()
+        return float(db.session.get(Account, account_id).balance)
+
+    def test_batch_transfer(self, accs):
+        src, dests = accs
+        res = AccountManager().batch_transfer(src, [{"to_account_id": d, "amount": 100.0} for d in dests], "payroll")
+
+        assert [r["status"] for r in res] == ["ok"] * 3
+        assert self._balance(src) == 700.0
+        assert all(self._balance(d) == 100.0 for d in dests)
+
+        trs = Transaction.query.filter_by(account_id=src, transaction_type="transfer").all()
+        assert len(trs) == 3
+        assert {t.transaction_id for t in trs} == {r["transaction_id"] for r in res}
+        assert all(t.description == "payroll" for t in trs)
+
+    def test_batch_transfer_single_commit(self, accs):
+        src, dests = accs
+        with patch.object(db.session, 'commit', wraps=db.session.commit) as commit:
+            AccountManager().batch_transfer(src, [{"to_account_id": d, "amount": 5.0} for d in dests * 50])
+        assert commit.call_count == 1
+        assert all(self._balance(d) == 250.0 for d in dests) # repeated dests get summed
+
+    def test_bad_items_reported_rest_applied(self, accs):
+        src, dests = accs
+        AccountManager().update_account(dests[2], {"active": False})
+
+        res = AccountManager().batch_transfer(src, [
+            {"to_account_id": dests[0], "amount": 50.0},
+            {"to_account_id": "dne-id", "amount": 50.0},
+            {"to_account_id": dests[1], "amount": -5},
+            {"to_account_id": dests[2], "amount": 50.0},
+            {"amount": 50.0},
+            {"to_account_id": dests[1], "amount": "abc"},
+        ])
+
+        assert [r["status"] for r in res] == ["ok", "failed", "failed", "failed", "failed", "failed"]
+        assert "not found" in res[1]["error"]
+        assert "positive" in res[2]["error"].lower()
+        assert "inactive" in res[3]["error"]
+        assert "to_account_id" in res[4]["error"]
+        assert res[5]["error"] == "invalid amount"
+        assert self._balance(src) == 950.0
+
+    def test_malformed_items_rejected_per_item(self, accs):
+        src, dests = accs
+        res = AccountManager().batch_transfer(src, [
+            {"to_account_id": dests[0], "amount": float("nan")},
+            {"to_account_id": dests[0], "amount": float("inf")},
+            {"to_account_id": dests[0], "amount": "50"},
+            {"to_account_id": dests[0], "amount": True},
+            {"to_account_id": [dests[0]], "amount": 5.0},
+            {"to_account_id": {"id": dests[0]}, "amount": 5.0},
+            {"to_account_id": dests[0], "amount": 1e20},
+            {"to_account_id": dests[0], "amount": 1, "description": 42},
+            {"to_account_id": dests[0], "amount": 1, "description": ["x"]},
+            {"to_account_id": dests[0], "amount": 1, "description": "x" * 501},
+            {"to_account_id": dests[0], "amount": 5},
+        ])
+        assert [r["status"] for r in res] == ["failed"] * 10 + ["ok"]
+        assert [r["error"] for r in res[:4]] == ["invalid amount"] * 4
+        assert "string" in res[4]["error"] and "string" in res[5]["error"]
+        assert res[6]["error"] == "invalid amount"
+        assert all("description" in r["error"] for r in res[7:10])
+        assert self._balance(src) == 995.0
+
+    def test_route_rejects_bad_shapes(self, db_app, db_user, accs):
+        _, header = db_user
+        src, dests = accs
+        client = db_app.test_client()
+        url = "/api/v1/accounts/transfers/batch"
+        bodies = [
+            [1, 2],
+            {"from_account_id": [src], "transfers": [{"to_account_id": dests[0], "amount": 1}]},
+            {"from_account_id": src, "transfers": {"to_account_id": dests[0]}},
+            {"from_account_id": src, "transfers": ["x"]},
+            {"from_account_id": src, "transfers": [{"to_account_id": [dests[0]], "amount": 1}]},
+        ]
+        for body in bodies: assert client.post(url, headers=header, json=body).status_code == 400, body
+        assert client.post(url, headers=header, data='{"from_account_id": "%s", "transfers": [{"to_account_id": "%s", "amount": NaN}]}' % (src, dests[0]), content_type="application/json").get_json()["results"][0]["error"] == "invalid amount"
+        assert client.post(url, headers=header, data="not json", content_type="application/json").status_code == 400
+        assert self._balance(src) == 1000.0
+
+    def test_total_over_balance_fails_whole_batch(self, accs):
+        src, dests = accs
+        with pytest.raises(ValueError) as e:
+            AccountManager().batch_transfer(src, [{"to_account_id": d, "amount": 400.0} for d in dests])
+
+        assert "insufficient funds" in str(e.value).lower()
+        assert self._balance(src) == 1000.0
+        assert all(self._balance(d) == 0.0 for d in dests)
+        assert not Transaction.query.filter_by(transaction_type="transfer").all()
+
+    def test_batch_route(self, db_app, db_user, accs):
+        _, header = db_user
+        src, dests = accs
+        client = db_app.test_client()
+
+        resp = client.post("/api/v1/accounts/transfers/batch", headers=header, json={"from_account_id": src, "transfers": [{"to_account_id": d, "amount": 25} for d in dests] + [{"to_account_id": "dne-id", "amount": 1}]})
+
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["succeeded"] == 3 and data["failed"] == 1
+        assert len(data["results"]) == 4
+
+        resp = client.post("/api/v1/accounts/transfers/batch", headers=header, json={"from_account_id": src, "transfers": []})
+        assert resp.status_code == 400
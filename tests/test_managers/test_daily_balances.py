@@ -0,0 +1,84 @@
+import pytest
+from datetime import datetime, date, time
+from unittest.mock import patch
+from src.managers.AccountManager import AccountManager
+from src.models import db, Account, DailyBalance
+
+
+class _Clock: # stands in for datetime in AccountManager so transacs land on chosen days
+    now_value = None
+
+    @classmethod
+    def utcnow(cls): return cls.now_value
+
+    @staticmethod
+    def combine(*args): return datetime.combine(*args)
+
+
+class TestDailyBalances:
+    @pytest.fixture
+    def accs(self, db_user):
+        user, _ = db_user
+        acc_manager = AccountManager()
+        with self._at(datetime(2025, 3, 1, 9)):
+            a = acc_manager.create_account({"user_id": user.user_id, "account_type": "Checking", "balance": 100.0})
+            b = acc_manager.create_account({"user_id": user.user_id, "account_type": "Savings"})
+        with self._at(datetime(2025, 3, 1, 15)): acc_manager.deposit(a, 50.0)
+        with self._at(datetime(2025, 3, 3, 10)): acc_manager.transfer(a, b, 30.0)
+        with self._at(datetime(2025, 3, 3, 18)): acc_manager.withdraw(a, 20.0)
+        with self._at(datetime(2025, 3, 6, 12)): acc_manager.batch_transfer(a, [{"to_account_id": b, "amount": 10.0}])
+        return a, b
+
+    def _at(self, when):
+        _Clock.now_value = when
+        return patch('src.managers.AccountManager.datetime', _Clock)
+
+    def _snapshots(self, account_id):
+        return {s.day: float(s.balance) for s in DailyBalance.query.filter_by(account_id=account_id)}
+
+    def test_snapshots_kept_per_active_day(self, accs):
+        a, b = accs
+        assert self._snapshots(a) == {date(2025, 3, 1): 150.0, date(2025, 3, 3): 100.0, date(2025, 3, 6): 90.0}
+        assert self._snapshots(b) == {date(2025, 3, 3): 30.0, date(2025, 3, 6): 40.0}
+
+    @pytest.mark.parametrize("as_of,expected", [
+        (datetime(2025, 2, 28, 23), 0.0),  # before acc existed
+        (datetime(2025, 3, 1, 12), 100.0), # mid day → back from that days snapshot
+        (datetime.combine(date(2025, 3, 1), time.max), 150.0),
+        (datetime(2025, 3, 3, 12), 120.0), # prev snapshot + part of the day
+        (datetime(2025, 3, 5, 0), 100.0),  # quiet day → carries last snapshot
+        (datetime.combine(date(2025, 3, 6), time.max), 90.0),
+        (datetime(2026, 1, 1), 90.0),
+    ])
+    def test_balance_as_of(self, accs, as_of, expected):
+        a, _ = accs
+        assert AccountManager().get_balance_as_of(a, as_of) == expected
+
+    def test_balance_as_of_destination_side(self, accs):
+        _, b = accs
+        assert AccountManager().get_balance_as_of(b, datetime(2025, 3, 6, 11)) == 30.0
+        assert AccountManager().get_balance_as_of(b, datetime(2025, 3, 6, 13)) == 40.0
+
+    def test_balance_as_of_without_ledger_history(self, db_user):
+        user, _ = db_user
+        acc_manager = AccountManager()
+        with self._at(datetime(2025, 3, 1, 9)): a = acc_manager.create_account({"user_id": user.user_id, "account_type": "Checking"})
+        db.session.execute(db.update(Account).where(Account.account_id == a).values(balance=500.0)) # imported/seeded → no ledger row
+        db.session.commit()
+        assert acc_manager.get_balance_as_of(a, datetime(2025, 3, 2)) == 500.0 # no snapshot at all → live balance
+
+        with self._at(datetime(2025, 3, 4, 10)): acc_manager.deposit(a, 25.0)
+        with self._at(datetime(2025, 3, 6, 10)): acc_manager.deposit(a, 5.0)
+        assert acc_manager.get_balance_as_of(a, datetime(2025, 3, 2)) == 500.0 # back from the 3/4 snapshot, not up from 0
+        assert acc_manager.get_balance_as_of(a, datetime(2025, 3, 5)) == 525.0
+
+    def test_as_of_route(self, db_app, db_user, accs):
+        _, header = db_user
+        a, _ = accs
+        client = db_app.test_client()
+
+        data = client.get(f"/api/v1/accounts/{a}/balance?as_of=2025-03-03", headers=header).get_json()
+        assert data["balance"] == 100.0
+
+        assert client.get(f"/api/v1/accounts/{a}/balance", headers=header).get_json()["balance"] == 90.0
+        assert client.get(f"/api/v1/accounts/{a}/balance?as_of=nope", headers=header).status_code == 400
@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import patch
+from src.managers.AccountManager import AccountManager
+from src.managers.LoanManager import LoanManager
+from src.models import db, User, InsufficientFunds, InactiveError
+from src.utils.business_metrics import money_ops, money_op_seconds
+
+
+@pytest.fixture
+def accs(db_app):
+    user = User(username="metricsUser", password="$2b$12$not_a_real_hash", email="metrics@example.com", full_name="Metrics User")
+    db.session.add(user)
+    db.session.commit()
+
+    acc_manager = AccountManager()
+    from_id = acc_manager.create_account({"user_id": user.user_id, "account_type": "Checking", "balance": 100.0})
+    to_id = acc_manager.create_account({"user_id": user.user_id, "account_type": "Savings"})
+    return user, from_id, to_id
+
+
+def delta(operation, outcome, fn):
+    before = money_ops.value(operation=operation, outcome=outcome), money_op_seconds.count(operation=operation, outcome=outcome)
+    try: fn()
+    except Exception: pass
+    after = money_ops.value(operation=operation, outcome=outcome), money_op_seconds.count(operation=operation, outcome=outcome)
+    return after[0] - before[0], after[1] - before[1]
+
+
+class TestMoneyMetrics:
+    def test_outcomes(self, accs):
+        _, from_id, to_id = accs
+        acc_manager = AccountManager()
+
+        assert delta("deposit", "ok", lambda: acc_manager.deposit(from_id, 10)) == (1, 1)
+        assert delta("withdraw", "insufficient_funds", lambda: acc_manager.withdraw(from_id, 10 ** 6)) == (1, 1)
+        assert delta("transfer", "invalid", lambda: acc_manager.transfer(from_id, to_id, -5)) == (1, 1)
+
+        acc_manager.close_account(to_id)
+        assert delta("transfer", "inactive", lambda: acc_manager.transfer(from_id, to_id, 5)) == (1, 1)
+
+        with patch.object(AccountManager, "_apply_balance_delta", side_effect=RuntimeError("db gone")):
+            assert delta("deposit", "error", lambda: acc_manager.deposit(from_id, 10)) == (1, 1)
+
+    def test_typed_errors_still_value_errors(self, accs):
+        _, from_id, _ = accs
+        with pytest.raises(InsufficientFunds) as e: AccountManager().withdraw(from_id, 10 ** 6)
+        assert isinstance(e.value, ValueError)
+        assert str(e.value) == "Insufficient funds"
+
+    def test_make_payment_outcomes(self, accs):
+        user, from_id, _ = accs
+        loan_manager = LoanManager()
+        loanId = loan_manager.create_loan_application({"user_id": user.user_id, "loan_type": "Personal", "amount": 500, "interest_rate": 5, "term_months": 12})
+
+        assert delta("make_payment", "inactive", lambda: loan_manager.make_payment(loanId, 10)) == (1, 1) # still pending
+        with pytest.raises(InactiveError): loan_manager.make_payment(loanId, 10)
+
+        loan_manager.approve_loan(loanId)
+        loan_manager.activate_loan(loanId)
+        assert delta("make_payment", "ok", lambda: loan_manager.make_payment(loanId, 10, account_id=from_id)) == (1, 1)
+        assert delta("make_payment", "insufficient_funds", lambda: loan_manager.make_payment(loanId, 400, account_id=from_id)) == (1, 1)
+
+        for outcome in ("ok", "insufficient_funds"): # the inner withdraw belongs to the payment → not a withdraw sample too
+            assert delta("withdraw", outcome, lambda: loan_manager.make_payment(loanId, 10 if outcome == "ok" else 400, account_id=from_id)) == (0, 0)
+        assert delta("withdraw", "ok", lambda: AccountManager().withdraw(from_id, 1)) == (1, 1) # tracking resets after the outer op
+
+    def test_exposed_on_metrics(self, metrics_public, db_app, accs):
+        _, from_id, _ = accs
+        AccountManager().deposit(from_id, 1)
+        body = db_app.test_client().get("/metrics").get_data(as_text=True)
+        assert 'banking_money_ops_total{operation="deposit",outcome="ok"}' in body
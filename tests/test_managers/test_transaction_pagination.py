@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime, timedelta
+from src.managers.AccountManager import AccountManager
+from src.models import db, Transaction
+
+
+class TestTransactionPagination:
+    @pytest.fixture
+    def acc_id(self, db_user):
+        user, _ = db_user
+        accId = AccountManager().create_account({"user_id": user.user_id, "account_type": "Checking"})
+        base = datetime(2025, 1, 1)
+        for i in range(25): # pairs share created_at → tie broken by transaction_id
+            db.session.add(Transaction(account_id=accId, transaction_type="deposit", amount=i+1, description=f"dep {i}", created_at=base + timedelta(minutes=i // 2)))
+        db.session.commit()
+        return accId
+
+    def test_pages_cover_history_once_in_order(self, acc_id):
+        acc_manager = AccountManager()
+        seen, cursor, pages = [], None, 0
+        while True:
+            rows, cursor = acc_manager.get_transactions_page(account_id=acc_id, limit=10, cursor=cursor)
+            seen.extend(rows)
+            pages += 1
+            if not cursor: break
+
+        assert pages == 3
+        assert len(seen) == 25
+        assert len({t.transaction_id for t in seen}) == 25
+        keys = [(t.created_at, t.transaction_id) for t in seen]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_limit_is_clamped(self, acc_id):
+        rows, cursor = AccountManager().get_transactions_page(account_id=acc_id, limit=-5)
+        assert len(rows) == 1 and cursor
+
+    def test_invalid_cursor(self, acc_id):
+        with pytest.raises(ValueError): AccountManager().get_transactions_page(account_id=acc_id, cursor="garbage")
+
+    def test_route_pagination(self, db_app, db_user, acc_id):
+        _, header = db_user
+        client = db_app.test_client()
+
+        first = client.get(f"/api/v1/accounts/{acc_id}/transactions?limit=20", headers=header).get_json()
+        assert len(first["transactions"]) == 20 and first["next_cursor"]
+
+        last = client.get(f"/api/v1/accounts/{acc_id}/transactions?limit=20&cursor={first['next_cursor']}", headers=header).get_json()
+        assert len(last["transactions"]) == 5 and last["next_cursor"] is None
+
+        user_page = client.get("/api/v1/accounts/user/transactions", headers=header).get_json()
+        assert len(user_page["transactions"]) == 25
+
+        assert client.get(f"/api/v1/accounts/{acc_id}/transactions?cursor=bad", headers=header).status_code == 400
+
+    def test_incoming_and_self_transfers_listed_once(self, db_user, acc_id):
+        user, _ = db_user
+        acc_manager = AccountManager()
+        other = acc_manager.create_account({"user_id": user.user_id, "account_type": "Savings", "balance": 100.0})
+        acc_manager.transfer(other, acc_id, 10.0, "incoming")
+        acc_manager.transfer(acc_id, acc_id, 1.0, "to self")
+
+        rows, _ = acc_manager.get_transactions_page(account_id=acc_id, limit=100)
+        descs = [t.description for t in rows]
+        assert len(rows) == 27
+        assert descs.count("incoming") == 1 and descs.count("to self") == 1
+        assert len(acc_manager.get_transactions(account_id=acc_id)) == 27
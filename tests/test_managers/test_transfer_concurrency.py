@@ -0,0 +1,103 @@
+import random
+import threading
+import pytest
+from unittest.mock import patch
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from src.managers.AccountManager import AccountManager
+from src.models import db, User, Account, Transaction
+
+
+class TestTransferConcurrency:
+    N_THREADS = 8
+    N_TRANSFERS = 250 # per thread → 2000 crossing transfers
+
+    @pytest.fixture
+    def acc_ids(self, db_app):
+        user = User(username="concUser", password="$2b$12$not_a_real_hash", email="conc@example.com", full_name="Conc User")
+        db.session.add(user)
+        db.session.commit()
+        acc_manager = AccountManager()
+        return [acc_manager.create_account({"user_id": user.user_id, "account_type": "Checking", "balance": 500.0}) for _ in range(4)]
+
+    def _total(self):
+        db.session.expire_all()
+        return round(float(db.session.query(func.sum(Account.balance)).scalar()), 2)
+
+    def test_crossing_transfers_keep_total_constant(self, db_app, acc_ids):
+        total_before = self._total()
+        done = []
+        errors = []
+
+        def worker(seed):
+            rnd = random.Random(seed)
+            ok = 0
+            with db_app.app_context():
+                acc_manager = AccountManager()
+                for _ in range(self.N_TRANSFERS):
+                    src, dst = rnd.sample(acc_ids, 2) # A→B n B→A both show up
+                    try:
+                        acc_manager.transfer(src, dst, rnd.choice([1.0, 5.0, 25.0, 120.0]))
+                        ok += 1
+                    except ValueError: pass # insufficient funds is a fine outcome
+                    except Exception as e: errors.append(e)
+                db.session.remove()
+            done.append(ok)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.N_THREADS)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+        assert not errors
+        assert self._total() == total_before
+        assert all(float(a.balance) >= 0 for a in Account.query.filter(Account.account_id.in_(acc_ids)))
+        assert Transaction.query.filter_by(transaction_type="transfer").count() == sum(done)
+
+    def test_transfer_legs_in_account_id_order(self, acc_ids):
+        a, b = sorted(acc_ids)[:2]
+        acc_manager = AccountManager()
+        seen = []
+        real = acc_manager._apply_balance_delta
+
+        def spy(accId, delta):
+            seen.append(accId)
+            return real(accId, delta)
+
+        with patch.object(acc_manager, '_apply_balance_delta', side_effect=spy):
+            acc_manager.transfer(b, a, 10.0)
+            acc_manager.transfer(a, b, 10.0)
+
+        assert seen == [a, b, a, b]
+
+    def test_retry_on_conflict(self, acc_ids):
+        a, b = acc_ids[:2]
+        acc_manager = AccountManager()
+        real = acc_manager._transfer_once
+        calls = []
+
+        def flaky(*args):
+            calls.append(1)
+            if len(calls) < 3: raise OperationalError("UPDATE accounts", {}, Exception("database is locked"))
+            return real(*args)
+
+        with patch.object(acc_manager, '_transfer_once', side_effect=flaky), patch('src.managers.AccountManager.time.sleep'):
+            assert acc_manager.transfer(a, b, 10.0) is True
+        assert len(calls) == 3
+
+    def test_retry_is_bounded(self, acc_ids):
+        a, b = acc_ids[:2]
+        acc_manager = AccountManager()
+        locked = OperationalError("UPDATE accounts", {}, Exception("database is locked"))
+
+        with patch.object(acc_manager, '_transfer_once', side_effect=locked) as once, patch('src.managers.AccountManager.time.sleep'):
+            with pytest.raises(OperationalError): acc_manager.transfer(a, b, 10.0)
+        assert once.call_count == AccountManager.MAX_CONFLICT_RETRIES + 1
+
+    def test_no_retry_on_other_db_errors(self, acc_ids):
+        a, b = acc_ids[:2]
+        acc_manager = AccountManager()
+        boom = OperationalError("UPDATE accounts", {}, Exception("no such table"))
+
+        with patch.object(acc_manager, '_transfer_once', side_effect=boom) as once:
+            with pytest.raises(OperationalError): acc_manager.transfer(a, b, 10.0)
+        assert once.call_count == 1
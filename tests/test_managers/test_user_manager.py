@@ -246,13 +246,13 @@ class TestUserManager:
         mock_save_json.assert_not_called()
 
     @patch('src.utils.json_utils.load_json')
-    def test_authenticate_user_success(self, mock_load_json, mock_users_data):
+    def test_authenticate_user_success(self, mock_load_json, mock_users_data, monkeypatch):
         mock_load_json.return_value = mock_users_data
 
         user = User.from_dict(mock_users_data[0])
         user.verify_password = MagicMock(return_value=True)
 
-        UserManager.get_user_by_username = MagicMock(return_value=user)
+        monkeypatch.setattr(UserManager, 'get_user_by_username', MagicMock(return_value=user)) # scoped to this test
 
         user_manager = UserManager()
         authenticated_user = user_manager.authenticate_user("tUser1", "password123")
@@ -262,14 +262,14 @@ class TestUserManager:
         user.verify_password.assert_called_once_with("password123")
 
     @patch('src.utils.json_utils.load_json')
-    def test_authenticate_user_wrong_password(self, mock_load_json, mock_users_data):
+    def test_authenticate_user_wrong_password(self, mock_load_json, mock_users_data, monkeypatch):
         """ auth process with wrong pwd """
         mock_load_json.return_value = mock_users_data
 
         user = User.from_dict(mock_users_data[0])
         user.verify_password = MagicMock(return_value=False)
 
-        UserManager.get_user_by_username = MagicMock(return_value=user)
+        monkeypatch.setattr(UserManager, 'get_user_by_username', MagicMock(return_value=user)) # scoped to this test
 
         user_manager = UserManager()
         authenticated_user = user_manager.authenticate_user("tUser1", "wrong_password")
@@ -278,11 +278,11 @@ class TestUserManager:
         user.verify_password.assert_called_once_with("wrong_password")
 
     @patch('src.utils.json_utils.load_json')
-    def test_authenticate_user_not_found(self, mock_load_json, mock_users_data):
+    def test_authenticate_user_not_found(self, mock_load_json, mock_users_data, monkeypatch):
         """ auth with nonexisting username"""
         mock_load_json.return_value = mock_users_data
 
-        UserManager.get_user_by_username = MagicMock(return_value=None)
+        monkeypatch.setattr(UserManager, 'get_user_by_username', MagicMock(return_value=None)) # scoped to this test
 
         user_manager = UserManager()
         authenticated_user = user_manager.authenticate_user("non_existent", "password123")
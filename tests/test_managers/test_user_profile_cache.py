@@ -0,0 +1,76 @@
+import pytest
+from src.managers.UserManager import UserManager, profile_cache
+from src.utils.ttl_cache import TTLCache
+from src.models import db
+
+
+class _Clock:
+    def __init__(self): self.now = 0.0
+    def __call__(self): return self.now
+
+
+def user_selects(statements): return [st for st in statements if st.lstrip().upper().startswith("SELECT") and "FROM users" in st]
+
+
+class TestTTLCache:
+    def test_expires_after_ttl(self):
+        clock = _Clock()
+        cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+        cache.set("a", 1)
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60, clock=_Clock())
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a") # a now most recent
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+    def test_zero_ttl_disables(self):
+        cache = TTLCache(maxsize=2, ttl=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+
+
+class TestUserProfileCache:
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        profile_cache.clear()
+        yield
+        profile_cache.clear()
+
+    def test_profile_hits_db_once(self, db_app, db_user, sql_log):
+        user, header = db_user
+        client = db_app.test_client()
+        db.session.expunge_all() # else the identity map answers w/o sql
+        with sql_log() as seen:
+            first = client.get("/api/v1/users/profile", headers=header)
+            second = client.get("/api/v1/users/profile", headers=header)
+
+        assert first.status_code == second.status_code == 200
+        assert first.get_json() == second.get_json()
+        assert second.get_json()["username"] == "dbUser"
+        assert len(user_selects(seen)) == 1
+
+    def test_update_and_delete_invalidate(self, db_app, db_user):
+        user, header = db_user
+        client = db_app.test_client()
+        client.get("/api/v1/users/profile", headers=header)
+
+        client.put("/api/v1/users/profile", headers=header, json={"full_name": "Renamed User"})
+        assert client.get("/api/v1/users/profile", headers=header).get_json()["full_name"] == "Renamed User"
+
+        assert UserManager().delete_user(user.user_id) is True
+        assert client.get("/api/v1/users/profile", headers=header).status_code == 404
+
+    def test_cached_copy_not_shared(self, db_app, db_user):
+        user, _ = db_user
+        profile = UserManager().get_user_profile(user.user_id)
+        profile["role"] = "admin"
+        assert UserManager().get_user_profile(user.user_id)["role"] == "user"
@@ -0,0 +1,154 @@
+import json
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import func
+import migrate_data
+from src.models import db, User, Account, Transaction, Loan, MigrationCheckpoint
+
+
+def write(path, rows):
+    path.write_text(json.dumps(rows))
+    return str(path)
+
+
+@pytest.fixture
+def files(tmp_path):
+    users = [
+        {"user_id": "u1", "username": "alice", "password": "$2b$12$not_a_real_hash", "email": "a@x.com", "full_name": "Alice", "created_at": "2025-01-01T00:00:00"},
+        {"user_id": "u2", "username": "bob", "password": "$2b$12$not_a_real_hash", "email": "b@x.com", "full_name": "Bob", "role": "admin", "created_at": "2025-01-01T00:00:00"},
+        {"user_id": "u1", "username": "alice", "password": "$2b$12$dupe", "email": "a2@x.com", "full_name": "Alice Dupe"},
+    ]
+    accounts = [
+        {"account_id": "a1", "user_id": "u1", "account_type": "Checking", "balance": 100.0, "account_number": "1000000001", "created_at": "2025-01-02T00:00:00"},
+        {"account_id": "a2", "user_id": "u2", "account_type": "Savings", "balance": 50.0, "account_number": "1000000002", "created_at": "2025-01-02T00:00:00", "active": False},
+        {"account_id": "a3", "user_id": "ghost", "account_type": "Savings", "balance": 0, "account_number": "1000000003", "created_at": "2025-01-02T00:00:00"},
+        {"account_id": "a4", "user_id": "u2", "account_type": "Savings", "balance": 0, "account_number": "1000000001", "created_at": "2025-01-02T00:00:00"}, # number taken → ON CONFLICT
+    ]
+    transactions = [{"transaction_id": f"t{i}", "account_id": "a1", "transaction_type": "deposit", "amount": 1.0, "description": None, "destination_account_id": None, "created_at": "2025-01-03T00:00:00"} for i in range(2500)]
+    transactions += [
+        {"transaction_id": "tx-a3", "account_id": "a3", "transaction_type": "deposit", "amount": 1.0, "created_at": "2025-01-03T00:00:00"},
+        {"transaction_id": "tx-dest", "account_id": "a1", "transaction_type": "transfer", "amount": 1.0, "destination_account_id": "nope", "created_at": "2025-01-03T00:00:00"},
+        {"transaction_id": "tx-bad", "account_id": "a1"},
+    ]
+    loans = [
+        {"loan_id": "l1", "user_id": "u1", "loan_type": "Auto", "amount": 1000.0, "interest_rate": 5.0, "term_months": 12, "status": "active", "created_at": "2025-01-04T00:00:00", "approved_at": "2025-01-05T00:00:00", "balance": 900.0},
+        {"loan_id": "l2", "user_id": "ghost", "loan_type": "Auto", "amount": 1000.0, "interest_rate": 5.0, "term_months": 12, "created_at": "2025-01-04T00:00:00"},
+    ]
+    return {name: write(tmp_path / f"{name}.json", rows) for name, rows in
+            (("users", users), ("accounts", accounts), ("transactions", transactions), ("loans", loans))}
+
+
+def run_all(files):
+    return (migrate_data.migrate_users(files["users"]), migrate_data.migrate_accounts(files["accounts"]),
+            migrate_data.migrate_transactions(files["transactions"]), migrate_data.migrate_loans(files["loans"]))
+
+
+class TestBulkImport:
+    def test_import_counts_and_values(self, db_app, files, monkeypatch):
+        monkeypatch.setattr(migrate_data, "CHUNK_SIZE", 1000) # several chunks for the ledger
+        users, accs, trs, loans = run_all(files)
+
+        assert users == (2, 1)
+        assert accs == (2, 2)
+        assert trs == (2500, 3)
+        assert loans == (1, 1)
+
+        assert db.session.get(User, "u2").role == "admin"
+        assert db.session.get(Account, "a2").active is False
+        assert float(db.session.get(Loan, "l1").balance) == 900.0
+        assert db.session.get(Loan, "l1").approved_at.day == 5
+
+    def test_rerun_is_idempotent(self, db_app, files):
+        run_all(files)
+        again = run_all(files)
+        assert [migrated for migrated, _ in again] == [0, 0, 0, 0]
+        assert db.session.query(func.count(Transaction.transaction_id)).scalar() == 2500
+
+    def test_no_per_row_queries(self, db_app, files, sql_log, monkeypatch):
+        monkeypatch.setattr(migrate_data, "CHUNK_SIZE", 1000)
+        migrate_data.migrate_users(files["users"])
+        migrate_data.migrate_accounts(files["accounts"])
+        with sql_log() as seen: migrate_data.migrate_transactions(files["transactions"])
+        assert len([st for st in seen if st.lstrip().upper().startswith("SELECT")]) == 1 + 3 # checkpoints + one acc id lookup per chunk
+        assert len([st for st in seen if st.lstrip().upper().startswith("INSERT")]) <= 3 * 2 # batched rows + checkpoint per chunk, not 2500 single rows
+
+    def test_plaintext_password_hashed(self, db_app, tmp_path):
+        path = write(tmp_path / "u.json", [{"user_id": "u9", "username": "plain", "password": "pwd123", "email": "p@x.com", "full_name": "Plain"}])
+        migrate_data.migrate_users(path)
+        assert db.session.get(User, "u9").verify_password("pwd123")
+
+    def test_ndjson_input_streams(self, db_app, files, tmp_path):
+        migrate_data.migrate_users(files["users"])
+        migrate_data.migrate_accounts(files["accounts"])
+        rows = [{"transaction_id": f"n{i}", "account_id": "a1", "transaction_type": "deposit", "amount": 2.0, "created_at": "2025-01-03T00:00:00"} for i in range(10)]
+        path = tmp_path / "transactions.ndjson"
+        path.write_text("\n".join(json.dumps(r) for r in rows))
+        assert not isinstance(migrate_data.load_json_data(str(path)), list) # lazy
+        assert migrate_data.migrate_transactions(str(path)) == (10, 0)
+
+
+class TestPipeline:
+    def test_checkpoint_per_chunk(self, db_app, files, monkeypatch):
+        monkeypatch.setattr(migrate_data, "CHUNK_SIZE", 1000)
+        run_all(files)
+        marks = MigrationCheckpoint.query.filter(MigrationCheckpoint.source.like("transactions:%@1000")).order_by(MigrationCheckpoint.chunk).all()
+        assert [(m.chunk, m.rows, m.inserted) for m in marks] == [(0, 1000, 1000), (1, 1000, 1000), (2, 503, 500)]
+
+    def test_resume_skips_committed_chunks(self, db_app, files, monkeypatch):
+        monkeypatch.setattr(migrate_data, "CHUNK_SIZE", 1000)
+        real = migrate_data.import_chunk
+        def crash_on_third(name, source, chunk_no, records):
+            if chunk_no == 2: raise RuntimeError("killed")
+            return real(name, source, chunk_no, records)
+        monkeypatch.setattr(migrate_data, "import_chunk", crash_on_third)
+        migrate_data.migrate_users(files["users"])
+        migrate_data.migrate_accounts(files["accounts"])
+        with pytest.raises(RuntimeError): migrate_data.migrate_transactions(files["transactions"])
+        assert db.session.query(func.count(Transaction.transaction_id)).scalar() == 2000
+
+        seen = []
+        monkeypatch.setattr(migrate_data, "import_chunk", lambda *job: seen.append(job[2]) or real(*job))
+        assert migrate_data.migrate_transactions(files["transactions"]) == (500, 3)
+        assert seen == [2] # chunks 0 n 1 alr committed
+        assert db.session.query(func.count(Transaction.transaction_id)).scalar() == 2500
+
+    def test_resume_w_other_chunk_size_refuses(self, db_app, files, monkeypatch):
+        monkeypatch.setattr(migrate_data, "CHUNK_SIZE", 1000)
+        real = migrate_data.import_chunk
+        def crash_on_second(name, source, chunk_no, records):
+            if chunk_no == 1: raise RuntimeError("killed")
+            return real(name, source, chunk_no, records)
+        monkeypatch.setattr(migrate_data, "import_chunk", crash_on_second)
+        migrate_data.migrate_users(files["users"])
+        migrate_data.migrate_accounts(files["accounts"])
+        with pytest.raises(RuntimeError): migrate_data.migrate_transactions(files["transactions"])
+
+        monkeypatch.setattr(migrate_data, "import_chunk", real)
+        monkeypatch.setattr(migrate_data, "CHUNK_SIZE", 2000)
+        with pytest.raises(ValueError, match="chunk size 1000"): migrate_data.migrate_transactions(files["transactions"])
+        assert db.session.query(func.count(Transaction.transaction_id)).scalar() == 1000 # nothing skipped silently
+
+        monkeypatch.setattr(migrate_data, "CHUNK_SIZE", 1000)
+        assert migrate_data.migrate_transactions(files["transactions"]) == (1500, 3)
+        assert db.session.query(func.count(Transaction.transaction_id)).scalar() == 2500
+
+    def test_failed_chunk_leaves_no_rows(self, db_app, files, monkeypatch):
+        migrate_data.migrate_users(files["users"])
+        def boom(obj): raise RuntimeError("boom")
+        monkeypatch.setattr(db.session, "add", boom) # checkpoint write fails after the rows went out
+        with pytest.raises(RuntimeError): migrate_data.migrate_accounts(files["accounts"])
+        assert db.session.query(func.count(Account.account_id)).scalar() == 0 # rows n checkpoint are one txn
+
+    def test_process_pool_keeps_fk_order(self, db_app, files, monkeypatch):
+        monkeypatch.setattr(migrate_data, "CHUNK_SIZE", 500)
+        res = migrate_data.run_pipeline(files, workers=2)
+        assert res == {"users": (2, 1), "accounts": (2, 2), "transactions": (2500, 3), "loans": (1, 1)}
+        assert db.session.query(func.count(Transaction.transaction_id)).scalar() == 2500
+        assert MigrationCheckpoint.query.count() == 1 + 1 + 6 + 1
+
+    def test_worker_app_skips_bootstrap(self, monkeypatch):
+        seen = []
+        monkeypatch.setenv("AUTO_INIT_DB", "1") # local dev setting in the parents env
+        monkeypatch.setattr(migrate_data, "create_app", lambda: seen.append(migrate_data.os.environ["AUTO_INIT_DB"]) or MagicMock())
+        migrate_data._init_worker()
+        assert seen == ["0"] # app built w bootstrap off → no alembic/seed per pool worker
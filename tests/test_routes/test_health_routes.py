@@ -0,0 +1,73 @@
+import time
+import threading
+import pytest
+from unittest.mock import patch
+from src.models import db, User
+from src.utils import health
+from src.utils.health import HealthDetails, ping_database
+
+
+class _Clock:
+    def __init__(self): self.now = 0.0
+    def __call__(self): return self.now
+
+
+def _wait_for(pred, secs=5):
+    end = time.time() + secs
+    while not pred() and time.time() < end: time.sleep(0.01)
+    return pred()
+
+
+class TestHealthRoutes:
+    def test_livez_does_no_io(self, db_app, sql_log):
+        with sql_log() as seen: resp = db_app.test_client().get("/livez")
+        assert resp.status_code == 200
+        assert seen == []
+
+    @pytest.mark.parametrize("path", ["/readyz", "/health"])
+    def test_readyz_pings_without_counting(self, db_app, sql_log, path):
+        with sql_log() as seen: resp = db_app.test_client().get(path)
+        assert resp.status_code == 200
+        assert resp.get_json()["database"] == "connected"
+        assert [st.strip().upper() for st in seen] == ["SELECT 1"]
+
+    def test_readyz_503_when_db_down(self, db_app):
+        with patch("src.app.ping_database", side_effect=Exception("connection refused")):
+            resp = db_app.test_client().get("/readyz")
+        assert resp.status_code == 503
+        assert resp.get_json()["status"] == "unhealthy"
+
+    def test_ping_fails_fast_when_db_hangs(self, db_app):
+        release = threading.Event()
+        with patch.object(health, "_ping", side_effect=lambda *a: release.wait(5)): # pool exhausted / connect hanging
+            t0 = time.perf_counter()
+            with pytest.raises(TimeoutError, match="100ms"): ping_database(db, timeout_ms=100)
+            assert time.perf_counter() - t0 < 0.5
+
+            t0 = time.perf_counter()
+            with pytest.raises(TimeoutError, match="still waiting"): ping_database(db, timeout_ms=100) # stuck probe → next fails at once
+            assert time.perf_counter() - t0 < 0.05
+            release.set()
+        assert _wait_for(lambda: health._probe_inflight.done())
+        assert ping_database(db, timeout_ms=1000) >= 0
+
+    def test_details_refresh_in_background(self, db_app, db_user):
+        first = db_app.test_client().get("/health/details").get_json()
+        assert first["status"] == "ok"
+        assert _wait_for(lambda: db_app.test_client().get("/health/details").get_json()["details"] is not None)
+        assert db_app.test_client().get("/health/details").get_json()["details"]["counts"]["users"] == 1
+
+
+class TestHealthDetails:
+    def test_refreshes_at_most_once_per_ttl(self, db_app):
+        clock = _Clock()
+        details = HealthDetails(db_app, db, {'users': User}, ttl=60, clock=clock)
+        with patch.object(details, '_refresh', wraps=details._refresh) as refresh:
+            details.get()
+            assert _wait_for(lambda: details.snapshot is not None)
+            for _ in range(5): details.get()
+            assert refresh.call_count == 1
+
+            clock.now = 60
+            details.get()
+            assert _wait_for(lambda: refresh.call_count == 2)
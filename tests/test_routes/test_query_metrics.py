@@ -0,0 +1,56 @@
+import pytest
+from src.utils.query_metrics import db_queries
+
+
+class TestQueryMetrics:
+    @pytest.fixture(autouse=True)
+    def metrics_on(self, monkeypatch):
+        monkeypatch.setenv("DB_METRICS", "1")
+        monkeypatch.setenv("METRICS_PUBLIC", "1")
+
+    def test_headers_count_statements(self, db_app, db_user, sql_log):
+        _, header = db_user
+        with sql_log() as seen: resp = db_app.test_client().get("/api/v1/accounts", headers=header)
+        assert resp.status_code == 200
+        assert int(resp.headers["X-DB-Queries"]) == len(seen) >= 1
+        assert float(resp.headers["X-DB-Time-ms"]) >= 0
+
+    def test_no_io_route_reports_zero(self, db_app):
+        resp = db_app.test_client().get("/livez")
+        assert resp.headers["X-DB-Queries"] == "0"
+
+    def test_metrics_endpoint_per_route(self, db_app, db_user):
+        _, header = db_user
+        before = db_queries.count(method="GET", route="/api/v1/accounts/<account_id>")
+        db_app.test_client().get("/api/v1/accounts/nope", headers=header)
+        assert db_queries.count(method="GET", route="/api/v1/accounts/<account_id>") == before + 1
+
+        resp = db_app.test_client().get("/metrics")
+        assert resp.status_code == 200
+        assert resp.content_type.startswith("text/plain; version=0.0.4")
+        assert 'http_request_db_queries_count{method="GET",route="/api/v1/accounts/<account_id>"}' in resp.get_data(as_text=True)
+
+    def test_metrics_token(self, db_app, monkeypatch):
+        monkeypatch.setenv("METRICS_TOKEN", "s3cret")
+        assert db_app.test_client().get("/metrics").status_code == 401
+        assert db_app.test_client().get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+
+class TestQueryMetricsOff:
+    def test_metrics_route_off_by_default(self, monkeypatch, request):
+        monkeypatch.delenv("METRICS_TOKEN", raising=False)
+        monkeypatch.delenv("METRICS_PUBLIC", raising=False)
+        resp = request.getfixturevalue("db_app").test_client().get("/metrics")
+        assert "banking_money_ops" not in resp.get_data(as_text=True) # spa fallback, no registry dump
+
+    def test_metrics_route_w_token(self, monkeypatch, request):
+        monkeypatch.delenv("METRICS_PUBLIC", raising=False)
+        monkeypatch.setenv("METRICS_TOKEN", "s3cret")
+        client = request.getfixturevalue("db_app").test_client()
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+    def test_off_by_default(self, db_app, monkeypatch):
+        monkeypatch.delenv("DB_METRICS", raising=False)
+        resp = db_app.test_client().get("/livez")
+        assert "X-DB-Queries" not in resp.headers
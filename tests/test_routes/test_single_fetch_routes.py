@@ -0,0 +1,88 @@
+import re
+import pytest
+from src.managers.AccountManager import AccountManager
+from src.managers.LoanManager import LoanManager
+from src.models import db
+
+
+def selects_from(table, statements): # SELECTs reading `table`
+    pat = re.compile(rf"^\s*SELECT\b.*\bFROM {table}\b", re.I | re.S)
+    return [st for st in statements if pat.search(st)]
+
+
+class TestSingleFetchRoutes:
+    ''' ownership check n manager share one row fetch per request '''
+
+    @pytest.fixture
+    def acc_id(self, db_user):
+        user, _ = db_user
+        return AccountManager().create_account({"user_id": user.user_id, "account_type": "Checking", "balance": 1000.0})
+
+    @pytest.fixture
+    def loan_id(self, db_user):
+        user, _ = db_user
+        loan_manager = LoanManager()
+        loanId = loan_manager.create_loan_application({"user_id": user.user_id, "loan_type": "Personal", "amount": 500, "interest_rate": 5, "term_months": 12})
+        loan_manager.approve_loan(loanId)
+        loan_manager.activate_loan(loanId)
+        return loanId
+
+    @pytest.mark.parametrize("path,body", [
+        ("deposit", {"amount": 10}),
+        ("withdraw", {"amount": 10}),
+    ])
+    def test_money_routes_fetch_account_once(self, db_app, db_user, sql_log, acc_id, path, body):
+        _, header = db_user
+        with sql_log() as seen:
+            resp = db_app.test_client().post(f"/api/v1/accounts/{acc_id}/{path}", headers=header, json=body)
+        assert resp.status_code == 200
+        assert len(selects_from("accounts", seen)) == 1
+
+    def test_close_fetches_account_once(self, db_app, db_user, sql_log, acc_id):
+        _, header = db_user
+        AccountManager().withdraw(acc_id, 1000.0)
+        db.session.remove() # fresh session like a new request
+        with sql_log() as seen:
+            resp = db_app.test_client().post(f"/api/v1/accounts/{acc_id}/close", headers=header)
+        assert resp.status_code == 200
+        assert len(selects_from("accounts", seen)) == 1
+
+    def test_update_loan_fetches_loan_once(self, db_app, db_user, sql_log):
+        user, header = db_user
+        loanId = LoanManager().create_loan_application({"user_id": user.user_id, "loan_type": "Auto", "amount": 500, "interest_rate": 5, "term_months": 12})
+        db.session.remove()
+        with sql_log() as seen:
+            resp = db_app.test_client().put(f"/api/v1/loans/{loanId}", headers=header, json={"purpose": "car"})
+        assert resp.status_code == 200
+        assert len(selects_from("loans", seen)) == 1
+
+    def test_loan_payment_single_fetch_and_atomic(self, db_app, db_user, sql_log, acc_id, loan_id):
+        _, header = db_user
+        db.session.remove()
+        with sql_log() as seen:
+            resp = db_app.test_client().post(f"/api/v1/loans/{loan_id}/payment", headers=header, json={"amount": 100, "account_id": acc_id})
+        assert resp.status_code == 200
+        assert resp.get_json()["balance"] == 400.0
+        assert len(selects_from("loans", seen)) == 1 and len(selects_from("accounts", seen)) == 1
+        assert float(AccountManager().get_account_by_id(acc_id).balance) == 900.0
+
+    def test_loan_payment_failure_leaves_account_untouched(self, db_app, db_user, acc_id, loan_id):
+        _, header = db_user
+        LoanManager().make_payment(loan_id, 500.0) # paid off → next payment must fail
+        resp = db_app.test_client().post(f"/api/v1/loans/{loan_id}/payment", headers=header, json={"amount": 100, "account_id": acc_id})
+        assert resp.status_code == 400
+        db.session.expire_all()
+        assert float(AccountManager().get_account_by_id(acc_id).balance) == 1000.0
+
+    def test_user_transactions_single_query(self, db_app, db_user, sql_log, acc_id):
+        user, header = db_user
+        acc_manager = AccountManager()
+        other = acc_manager.create_account({"user_id": user.user_id, "account_type": "Savings"})
+        for _ in range(5): acc_manager.transfer(acc_id, other, 1.0)
+        db.session.remove()
+
+        with sql_log() as seen:
+            resp = db_app.test_client().get("/api/v1/accounts/user/transactions", headers=header)
+        assert resp.status_code == 200
+        assert len(resp.get_json()["transactions"]) == 6 # initial deposit + 5 transfers, each once
+        assert len(seen) == 1 # accs resolved in a subquery, no N+1
@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime
+from src.managers.AccountManager import AccountManager
+from src.models import db, Transaction
+
+
+class TestStatementRoutes:
+    @pytest.fixture
+    def acc_id(self, db_user):
+        user, _ = db_user
+        accId = AccountManager().create_account({"user_id": user.user_id, "account_type": "Checking"})
+        for day in (1, 2, 3, 4):
+            db.session.add(Transaction(account_id=accId, transaction_type="deposit", amount=day*10, description=f"day {day}", created_at=datetime(2025, 3, day, 12)))
+        db.session.commit()
+        return accId
+
+    def test_ndjson_statement(self, db_app, db_user, acc_id):
+        _, header = db_user
+        resp = db_app.test_client().get(f"/api/v1/accounts/{acc_id}/statement", headers=header)
+
+        assert resp.status_code == 200
+        assert resp.is_streamed
+        assert resp.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        assert [r["description"] for r in rows] == ["day 1", "day 2", "day 3", "day 4"] # oldest first
+
+    def test_csv_statement_date_range(self, db_app, db_user, acc_id):
+        _, header = db_user
+        resp = db_app.test_client().get(f"/api/v1/accounts/{acc_id}/statement?format=csv&from=2025-03-02&to=2025-03-03", headers=header)
+
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/csv"
+        assert "attachment" in resp.headers["Content-Disposition"]
+        rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+        assert [r["description"] for r in rows] == ["day 2", "day 3"] # bare `to` date includes that whole day
+        assert float(rows[0]["amount"]) == 20.0
+
+    def test_csv_statement_empty_has_header(self, db_app, db_user, acc_id):
+        _, header = db_user
+        resp = db_app.test_client().get(f"/api/v1/accounts/{acc_id}/statement?format=csv&from=2030-01-01", headers=header)
+        assert resp.get_data(as_text=True).strip() == "transaction_id,account_id,transaction_type,amount,description,destination_account_id,created_at"
+
+    def test_statement_bad_params(self, db_app, db_user, acc_id):
+        _, header = db_user
+        client = db_app.test_client()
+        assert client.get(f"/api/v1/accounts/{acc_id}/statement?format=xml", headers=header).status_code == 400
+        assert client.get(f"/api/v1/accounts/{acc_id}/statement?from=yesterday", headers=header).status_code == 400
+        assert client.get("/api/v1/accounts/dne-id/statement", headers=header).status_code == 404
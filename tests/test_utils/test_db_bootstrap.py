@@ -0,0 +1,79 @@
+import logging
+from alembic.script import ScriptDirectory
+from alembic.config import Config
+from sqlalchemy import inspect, text
+from src.app import create_app, bootstrap_database, bootstrap_once, check_schema_version, MIGRATIONS_DIR
+from src.models import db, User, SCHEMA_VERSION
+from src.utils.jwt_auth import generate_token
+
+
+def _fresh_app(tmp_path, monkeypatch, auto_init="0"):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'boot.db'}")
+    monkeypatch.setenv("AUTO_INIT_DB", auto_init)
+    return create_app()
+
+
+class TestDbBootstrap:
+    def test_schema_version_is_migrations_head(self):
+        cfg = Config()
+        cfg.set_main_option("script_location", MIGRATIONS_DIR)
+        assert ScriptDirectory.from_config(cfg).get_current_head() == SCHEMA_VERSION
+
+    def test_create_app_does_no_ddl(self, tmp_path, monkeypatch, caplog):
+        with caplog.at_level(logging.WARNING, logger="src.app"): app = _fresh_app(tmp_path, monkeypatch)
+        with app.app_context(): assert inspect(db.engine).get_table_names() == []
+        assert f"CODE EXPECTS {SCHEMA_VERSION}" in caplog.text
+
+    def test_bootstrap_migrates_seeds_once(self, tmp_path, monkeypatch):
+        app = _fresh_app(tmp_path, monkeypatch)
+        with app.app_context():
+            first = bootstrap_database()
+            assert first["status"] == "initialized"
+            assert check_schema_version() == SCHEMA_VERSION
+            assert User.query.count() == 2
+
+            second = bootstrap_database()
+            assert second["status"] == "already_initialized"
+            assert User.query.count() == 2
+
+    def test_init_db_cli(self, tmp_path, monkeypatch):
+        app = _fresh_app(tmp_path, monkeypatch)
+        res = app.test_cli_runner().invoke(args=["init-db"])
+        assert res.exit_code == 0, res.output
+        with app.app_context():
+            with db.engine.connect() as conn: assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == SCHEMA_VERSION
+
+    def test_boot_only_checks_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("AUTO_INIT_DB", raising=False)
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'boot.db'}")
+        app = create_app() # every worker / cli call / import pool process → no alembic, no seed
+        with app.app_context(): assert inspect(db.engine).get_table_names() == []
+
+    def test_auto_init_opt_in(self, tmp_path, monkeypatch):
+        app = _fresh_app(tmp_path, monkeypatch, auto_init="1")
+        with app.app_context(): assert check_schema_version() == SCHEMA_VERSION
+
+    def test_bootstrap_once(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'boot.db'}")
+        assert bootstrap_once()["status"] == "initialized" # gunicorn on_starting → before workers fork
+        app = _fresh_app(tmp_path, monkeypatch)
+        with app.app_context():
+            assert check_schema_version() == SCHEMA_VERSION
+            assert User.query.count() == 2
+
+    def test_init_endpoint_admin_post_only(self, tmp_path, monkeypatch):
+        app = _fresh_app(tmp_path, monkeypatch)
+        app.config["JWT_SECRET_KEY"] = "test-jwt-key"
+        client = app.test_client()
+        with app.test_request_context():
+            admin = {"Authorization": f"Bearer {generate_token('u1', 'root', 'admin')}"}
+            user = {"Authorization": f"Bearer {generate_token('u2', 'joe', 'user')}"}
+
+        assert client.get("/init-database", headers=admin).get_json(silent=True) is None # GET → spa fallback, runs nothing
+        assert client.post("/init-database").status_code == 401
+        assert client.post("/init-database", headers=user).status_code == 403
+        with app.app_context(): assert inspect(db.engine).get_table_names() == []
+
+        resp = client.post("/init-database", headers=admin)
+        assert resp.status_code == 200
+        assert resp.get_json()["status"] == "initialized"
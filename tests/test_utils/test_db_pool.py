@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeout
+from src.models import db
+from src.managers.UserManager import UserManager
+from src.utils.db_pool import engine_options, TimedQueuePool, checkout_timeouts, checkout_seconds
+from src.utils.metrics import REGISTRY
+
+PG = "postgresql://u:p@db/bank"
+
+
+class TestEngineOptions:
+    @pytest.fixture(autouse=True)
+    def clean_env(self, monkeypatch):
+        for var in ("WORKER_CLASS", "WEB_THREADS", "DB_POOL_SIZE", "DB_MAX_OVERFLOW", "DB_POOL_TIMEOUT", "DB_POOL_RECYCLE", "DB_POOL_PRE_PING", "DB_CONNECT_TIMEOUT"):
+            monkeypatch.delenv(var, raising=False)
+
+    def test_sync_default(self):
+        opts = engine_options(PG)
+        assert (opts["pool_size"], opts["max_overflow"], opts["pool_timeout"]) == (2, 0, 10)
+        assert opts["pool_pre_ping"] is True and opts["pool_recycle"] == 300
+        assert opts["poolclass"] is TimedQueuePool
+
+    def test_worker_class_profiles_and_overrides(self, monkeypatch):
+        monkeypatch.setenv("WORKER_CLASS", "gthread")
+        monkeypatch.setenv("WEB_THREADS", "8")
+        assert engine_options(PG)["pool_size"] == 8
+
+        monkeypatch.setenv("DB_POOL_SIZE", "3")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "0")
+        opts = engine_options(PG)
+        assert opts["pool_size"] == 3 and opts["max_overflow"] == 2
+        assert opts["pool_pre_ping"] is False
+
+    def test_connect_timeout_postgres_only(self, monkeypatch):
+        assert engine_options(PG)["connect_args"] == {"connect_timeout": 5}
+        monkeypatch.setenv("DB_CONNECT_TIMEOUT", "2")
+        assert engine_options(PG)["connect_args"] == {"connect_timeout": 2}
+        assert "connect_args" not in engine_options("sqlite:///x.db")
+
+    def test_sqlite_keeps_defaults(self):
+        assert "pool_size" not in engine_options("sqlite:///x.db")
+        assert "poolclass" not in engine_options("sqlite:///:memory:")
+
+
+class TestPoolTelemetry:
+    def test_timeout_counted(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'p.db'}", poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+        before, waits = checkout_timeouts.value(), checkout_seconds.count()
+        held = engine.connect()
+        try:
+            with pytest.raises(PoolTimeout): engine.connect()
+        finally: held.close()
+        assert checkout_timeouts.value() == before + 1
+        assert checkout_seconds.count() == waits + 2
+
+    def test_gauges_read_live_pool(self, metrics_public, db_app):
+        with db.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert REGISTRY._metrics["db_pool_checked_out"].value() == 1
+            body = db_app.test_client().get("/metrics").get_data(as_text=True)
+        assert "db_pool_checked_out " in body and "db_pool_overflow " in body
+        assert REGISTRY._metrics["db_pool_checked_out"].value() == 0
+
+    def test_invalidated_connection_503(self, db_app, db_user):
+        _, header = db_user
+        gone = DBAPIError("SELECT 1", {}, Exception("server closed the connection"), connection_invalidated=True)
+        with patch.object(UserManager, "get_user_profile", side_effect=gone):
+            resp = db_app.test_client().get("/api/v1/users/profile", headers=header)
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "1"
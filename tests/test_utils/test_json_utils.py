@@ -0,0 +1,138 @@
+import os
+import json
+import pytest
+from flask import Flask
+from src.utils import json_utils
+from src.utils.json_utils import iter_json, load_json, save_json, save_record, delete_record, JsonStore
+
+RECORDS = [
+    {"id": 1, "amount": 1234567.25, "note": "has ] and , and \\n inside", "tags": [1, [2, 3]]},
+    {"id": 2, "amount": 7, "nested": {"a": [], "b": {}}},
+    {"id": 3, "amount": -0.5, "note": "ünïcode ✓"},
+]
+
+
+class TestIterJson:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 1 << 16])
+    def test_array_any_chunking(self, tmp_path, chunk_size):
+        path = tmp_path / "a.json"
+        path.write_text(json.dumps(RECORDS, indent=2), encoding="utf-8")
+        assert list(iter_json(path, chunk_size=chunk_size)) == RECORDS
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+    def test_ndjson(self, tmp_path, chunk_size):
+        path = tmp_path / "a.ndjson"
+        path.write_text("\n".join(json.dumps(r) for r in RECORDS) + "\n\n", encoding="utf-8")
+        assert list(iter_json(path, chunk_size=chunk_size)) == RECORDS
+
+    def test_number_split_at_chunk_edge(self, tmp_path):
+        path = tmp_path / "n.json"
+        path.write_text("[12345, 678]")
+        assert list(iter_json(path, chunk_size=4)) == [12345, 678] # '[123' must not yield 123
+
+    def test_empty_inputs(self, tmp_path):
+        (tmp_path / "e.json").write_text("  [ ]  ")
+        (tmp_path / "z.json").write_text("")
+        assert list(iter_json(tmp_path / "e.json")) == []
+        assert list(iter_json(tmp_path / "z.json")) == []
+
+    def test_streams_before_bad_tail(self, tmp_path):
+        path = tmp_path / "t.json"
+        path.write_text(json.dumps(RECORDS)[:-40]) # truncated mid record
+        it = iter_json(path, chunk_size=16)
+        assert next(it) == RECORDS[0]
+        with pytest.raises(json.JSONDecodeError): list(it)
+
+    def test_load_json_reads_ndjson(self, tmp_path):
+        (tmp_path / "loans.json").write_text("\n".join(json.dumps(r) for r in RECORDS))
+        app = Flask(__name__)
+        app.config["DATA_FOLDER"] = str(tmp_path)
+        with app.app_context(): assert load_json("loans.json") == RECORDS
+
+
+def acc(i, balance=0.0): return {"account_id": f"a{i}", "user_id": "u1", "balance": balance}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    app = Flask(__name__)
+    app.config["DATA_FOLDER"] = str(tmp_path)
+    with app.app_context(): yield tmp_path
+
+
+def log_lines(data_dir, name="accounts.json"): return (data_dir / f"{name}.log").read_text().splitlines()
+
+
+class TestJsonStore:
+    def test_save_appends_only_changes(self, data_dir):
+        accs = [acc(i) for i in range(50)]
+        assert save_json("accounts.json", accs)
+        assert len(log_lines(data_dir)) == 50
+
+        accs[7]["balance"] = 99.0
+        del accs[3]
+        assert save_json("accounts.json", accs)
+        assert log_lines(data_dir)[50:] == ['{"put":{"account_id":"a7","user_id":"u1","balance":99.0}}', '{"del":"a3"}']
+        assert save_json("accounts.json", accs) # nothing changed → nothing written
+        assert len(log_lines(data_dir)) == 52
+        assert load_json("accounts.json") == accs
+
+    def test_other_process_sees_appends(self, data_dir):
+        save_json("accounts.json", [acc(1), acc(2)])
+        other = JsonStore(str(data_dir / "accounts.json"), "account_id") # fresh cache ~ another worker
+        assert [a["account_id"] for a in other.load()] == ["a1", "a2"]
+        save_record("accounts.json", acc(3))
+        delete_record("accounts.json", "a1")
+        assert [a["account_id"] for a in other.load()] == ["a2", "a3"]
+
+    def test_compaction_writes_snapshot_n_empties_log(self, data_dir, monkeypatch):
+        monkeypatch.setattr(json_utils, "COMPACT_EVERY", 10)
+        for i in range(12): save_record("accounts.json", acc(i))
+        snapshot = json.loads((data_dir / "accounts.json").read_text())
+        assert [a["account_id"] for a in snapshot] == [f"a{i}" for i in range(10)]
+        assert len(log_lines(data_dir)) == 2
+        assert not [f for f in os.listdir(data_dir) if f.endswith(".tmp")]
+
+        other = JsonStore(str(data_dir / "accounts.json"), "account_id")
+        assert len(other.load()) == 12
+        for i in range(12, 20): save_record("accounts.json", acc(i)) # compacted again under others feet
+        assert [a["account_id"] for a in other.load()] == [f"a{i}" for i in range(20)]
+
+    def test_torn_last_line_skipped(self, data_dir):
+        save_json("accounts.json", [acc(1)])
+        with open(data_dir / "accounts.json.log", "a") as f: f.write('{"put":{"account_id":"a2","bal') # crash mid append
+        fresh = JsonStore(str(data_dir / "accounts.json"), "account_id")
+        assert fresh.load() == [acc(1)]
+        fresh.put(acc(3))
+        assert JsonStore(str(data_dir / "accounts.json"), "account_id").load() == [acc(1), acc(3)]
+
+    def test_crash_mid_compaction_keeps_old_snapshot(self, data_dir, monkeypatch):
+        save_json("loans.json", [{"loan_id": "l1"}])
+        json_utils.get_store("loans.json").compact()
+        save_record("loans.json", {"loan_id": "l2"})
+        def crash(src, dst): raise OSError("power cut")
+        monkeypatch.setattr(json_utils.os, "replace", crash)
+        with pytest.raises(OSError): json_utils.get_store("loans.json").compact()
+        monkeypatch.undo()
+        assert json.loads((data_dir / "loans.json").read_text()) == [{"loan_id": "l1"}]
+        assert JsonStore(str(data_dir / "loans.json"), "loan_id").load() == [{"loan_id": "l1"}, {"loan_id": "l2"}]
+
+    def test_caller_mutation_doesnt_leak_into_cache(self, data_dir):
+        accs = [acc(1)]
+        save_json("accounts.json", accs)
+        loaded = load_json("accounts.json")
+        loaded[0]["balance"] = 5.0
+        accs[0]["balance"] = 7.0
+        assert load_json("accounts.json") == [acc(1)]
+        save_json("accounts.json", loaded)
+        assert load_json("accounts.json") == [acc(1, 5.0)]
+
+    def test_unknown_file_rewritten_atomically(self, data_dir):
+        assert save_json("settings.json", [{"x": 1}])
+        assert json.loads((data_dir / "settings.json").read_text()) == [{"x": 1}]
+        assert not (data_dir / "settings.json.log").exists()
+
+    def test_keyless_records_fall_back_to_snapshot(self, data_dir):
+        assert save_json("loans.json", RECORDS) # no loan_id → cant be logged
+        assert json.loads((data_dir / "loans.json").read_text()) == RECORDS
+        assert load_json("loans.json") == RECORDS
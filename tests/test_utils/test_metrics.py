@@ -0,0 +1,95 @@
+import os
+import json
+import time
+import pytest
+from src.utils.metrics import Registry
+
+
+class TestMetrics:
+    def test_counter_render(self):
+        reg = Registry()
+        c = reg.counter("jobs_total", "jobs run", ("outcome",))
+        c.inc(outcome="ok")
+        c.inc(2, outcome='bad "one"')
+        assert c.value(outcome="ok") == 1
+        assert reg.render().splitlines() == [
+            "# HELP jobs_total jobs run",
+            "# TYPE jobs_total counter",
+            'jobs_total{outcome="bad \\"one\\""} 2.0',
+            'jobs_total{outcome="ok"} 1.0',
+        ]
+
+    def test_histogram_buckets_cumulative(self):
+        reg = Registry()
+        h = reg.histogram("lat_seconds", "latency", ("route",), buckets=(0.1, 1))
+        for v in (0.05, 0.1, 0.5, 3): h.observe(v, route="/x")
+        lines = reg.render().splitlines()
+        assert 'lat_seconds_bucket{route="/x",le="0.1"} 2.0' in lines
+        assert 'lat_seconds_bucket{route="/x",le="1.0"} 3.0' in lines
+        assert 'lat_seconds_bucket{route="/x",le="+Inf"} 4.0' in lines
+        assert 'lat_seconds_sum{route="/x"} 3.65' in lines
+        assert 'lat_seconds_count{route="/x"} 4.0' in lines
+
+    def test_register_is_idempotent_and_labels_checked(self):
+        reg = Registry()
+        assert reg.counter("a_total", "a") is reg.counter("a_total", "a")
+        with pytest.raises(ValueError): reg.counter("b_total", "b", ("x",)).inc(y="1")
+
+
+class TestMultiprocMetrics:
+    def test_scrape_merges_worker_files(self, tmp_path):
+        reg = Registry(multiproc_dir=str(tmp_path), flush_secs=60)
+        c = reg.counter("ops_total", "ops", ("outcome",))
+        h = reg.histogram("op_seconds", "op latency", buckets=(0.1, 1))
+        c.inc(outcome="ok")
+        h.observe(0.05)
+
+        # another worker's last flush
+        (tmp_path / "99999-abc.json").write_text(json.dumps({
+            "ops_total": {"kind": "counter", "values": [[["ok"], 2], [["error"], 1]]},
+            "op_seconds": {"kind": "histogram", "values": [[[], [[0, 1, 0], 0.5]]]},
+            "gone_total": {"kind": "counter", "values": [[[], 7]]},
+        }))
+        lines = reg.render().splitlines()
+
+        assert 'ops_total{outcome="ok"} 3.0' in lines
+        assert 'ops_total{outcome="error"} 1.0' in lines
+        assert 'op_seconds_bucket{le="0.1"} 1.0' in lines
+        assert 'op_seconds_bucket{le="1.0"} 2.0' in lines
+        assert 'op_seconds_sum 0.55' in lines
+        assert not any(l.startswith("gone_total") for l in lines)
+        assert c.value(outcome="ok") == 1 # local values untouched by the merge
+
+    def test_updates_flushed_in_background(self, tmp_path):
+        reg = Registry(multiproc_dir=str(tmp_path), flush_secs=60)
+        reg.counter("bg_total", "bg").inc()
+        end = time.time() + 5
+        while not list(tmp_path.glob(f"{os.getpid()}-*.json")) and time.time() < end: time.sleep(0.01)
+        path, = tmp_path.glob(f"{os.getpid()}-*.json")
+        assert json.loads(path.read_text())["bg_total"] == {"kind": "counter", "values": [[[], 1]]}
+
+    def test_gauges_summed_over_live_workers_only(self, tmp_path):
+        reg = Registry(multiproc_dir=str(tmp_path), flush_secs=60)
+        reg.gauge("conns", "open conns", fn=lambda: {(): 2})
+        (tmp_path / "1-a.json").write_text(json.dumps({"conns": {"kind": "gauge", "values": [[[], 3]]}})) # pid 1 → alive
+        (tmp_path / "999999999-b.json").write_text(json.dumps({"conns": {"kind": "gauge", "values": [[[], 50]]}})) # long gone
+        assert "conns 5.0" in reg.render().splitlines()
+
+    def test_dead_worker_folded_into_archive(self, tmp_path):
+        reg = Registry(multiproc_dir=str(tmp_path), flush_secs=60)
+        reg.counter("ops_total", "ops")
+        reg.histogram("op_seconds", "op latency", buckets=(0.1, 1))
+        reg.gauge("conns", "open conns", fn=lambda: {})
+        dump = {"ops_total": {"kind": "counter", "values": [[[], 2]]},
+                "op_seconds": {"kind": "histogram", "values": [[[], [[1, 0, 0], 0.05]]]},
+                "conns": {"kind": "gauge", "values": [[[], 4]]}}
+        for name in ("4242-old.json", "4242-older.json"): (tmp_path / name).write_text(json.dumps(dump)) # 2 incarnations of pid 4242
+
+        reg.mark_process_dead(4242)
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["archive.json"]
+
+        (tmp_path / "4242-new.json").write_text(json.dumps({"ops_total": {"kind": "counter", "values": [[[], 1]]}})) # pid recycled
+        lines = reg.render().splitlines()
+        assert "ops_total 5.0" in lines # totals kept, nothing overwritten
+        assert "op_seconds_count 2.0" in lines
+        assert not any(l.startswith("conns ") for l in lines)
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import subprocess
+import threading
+import pytest
+from unittest.mock import patch
+from concurrent.futures.process import BrokenProcessPool
+from src.utils import password_hasher
+from src.utils.password_hasher import PasswordHasher, HasherBusy
+from src.managers.UserManager import UserManager
+from src.models import db, User
+
+
+def _slow(secs): time.sleep(secs); return secs
+
+
+class TestPasswordHasher:
+    def test_hash_and_check_through_pool(self):
+        hasher = PasswordHasher(pool_size=1, queue_depth=0)
+        try:
+            hashed = hasher.run(password_hasher._hash, "pwd123", 4)
+            assert hashed.startswith("$2b$")
+            assert hasher.run(password_hasher._check, "pwd123", hashed) is True
+            assert hasher.run(password_hasher._check, "wrong", hashed) is False
+        finally: hasher.shutdown()
+
+    def test_inline_when_pool_disabled(self):
+        hasher = PasswordHasher(pool_size=0, queue_depth=0)
+        assert hasher.run(password_hasher._check, "pwd123", password_hasher._hash("pwd123", 4)) is True
+
+    def test_saturated_pool_sheds(self):
+        hasher = PasswordHasher(pool_size=1, queue_depth=1)
+        try:
+            busy = [threading.Thread(target=hasher.run, args=(_slow, 1.0)) for _ in range(2)] # 1 running + 1 queued
+            for t in busy: t.start()
+            time.sleep(0.3)
+
+            t0 = time.perf_counter()
+            with pytest.raises(HasherBusy): hasher.run(_slow, 0)
+            assert time.perf_counter() - t0 < 0.1 # rejected w/o waiting
+
+            for t in busy: t.join()
+            assert hasher.run(_slow, 0) == 0 # slots freed again
+        finally: hasher.shutdown()
+
+    def test_broken_pool_rebuilt(self):
+        hasher = PasswordHasher(pool_size=1, queue_depth=0)
+        try:
+            with pytest.raises(BrokenProcessPool): hasher.run(os._exit, 1) # child dies → retried once, dies again
+            assert hasher.run(_slow, 0) == 0
+        finally: hasher.shutdown()
+
+    def test_slots_capped_at_half_the_threads(self):
+        env = dict(os.environ, WORKER_CLASS="gthread", WEB_THREADS="4", BCRYPT_POOL_SIZE="8") # 8 cores / 1 worker
+        env.pop("BCRYPT_QUEUE_DEPTH", None)
+        out = subprocess.run([sys.executable, "-c", "from src.utils import password_hasher as p; print(p.POOL_SIZE, p.QUEUE_DEPTH, p._MP_CONTEXT)"],
+                             env=env, capture_output=True, text=True, check=True).stdout.split()
+        assert int(out[0]) + int(out[1]) <= 2 # pool alone mustnt take every thread
+        assert out[2] in ("forkserver", "spawn")
+
+    def test_login_returns_503_when_saturated(self, db_app):
+        db_app.test_client().post("/api/v1/users/register", json={"username": "busyUser", "password": "pwd123", "email": "busy@example.com", "full_name": "Busy User"})
+
+        with patch.object(password_hasher.hasher, 'run', side_effect=HasherBusy(retry_after=3)):
+            resp = db_app.test_client().post("/api/v1/users/login", json={"username": "busyUser", "password": "pwd123"})
+            reg = db_app.test_client().post("/api/v1/users/register", json={"username": "busy2", "password": "pwd123", "email": "busy2@example.com", "full_name": "Busy Two"})
+
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "3"
+        assert reg.status_code == 503
+
+        ok = db_app.test_client().post("/api/v1/users/login", json={"username": "busyUser", "password": "pwd123"})
+        assert ok.status_code == 200
+
+
+class TestWorkFactor:
+    def test_hash_uses_configured_rounds(self, monkeypatch):
+        monkeypatch.setattr(password_hasher, 'ROUNDS', 5)
+        hashed = password_hasher.hash_password("pwd123")
+        assert password_hasher.hash_rounds(hashed) == 5
+        assert password_hasher.needs_rehash(hashed) is False
+        assert password_hasher.needs_rehash(password_hasher._hash("pwd123", 4)) is True
+        assert password_hasher.needs_rehash("not-bcrypt") is False
+        assert password_hasher.needs_rehash(password_hasher._hash("pwd123", 6)) is False # stronger than configured → left alone
+
+    def test_calibrate_once_n_share(self, monkeypatch):
+        monkeypatch.setattr(password_hasher, 'ROUNDS', 12)
+        monkeypatch.setenv("BCRYPT_CALIBRATE", "1")
+        monkeypatch.setenv("BCRYPT_ROUNDS", "") # unset, but restored (removed) after the test
+        with patch.object(password_hasher, 'calibrate_rounds', return_value=11) as calib:
+            assert password_hasher.calibrate_from_env() == 11
+            assert os.environ["BCRYPT_ROUNDS"] == "11" # exported → forked workers skip calibrating
+            assert password_hasher.calibrate_from_env() == 11
+        assert calib.call_count == 1
+
+    def test_calibrate_stays_in_bounds(self):
+        assert password_hasher.calibrate_rounds(0, min_rounds=10, max_rounds=14) == 10
+        assert password_hasher.calibrate_rounds(10 ** 9, min_rounds=10, max_rounds=14) == 14
+
+    def test_calibrate_picks_cost_under_target(self):
+        with patch.object(password_hasher.time, 'perf_counter', side_effect=[0.0, 0.004]): # probe: 4ms @ cost 8
+            assert password_hasher.calibrate_rounds(250, min_rounds=4, max_rounds=16) == 13 # 4ms * 2^5 = 128ms | 14 → 256ms
+
+    def test_login_upgrades_stale_hash(self, db_app, monkeypatch):
+        user = User(username="oldHash", password=password_hasher._hash("pwd123", 4), email="old@example.com", full_name="Old Hash")
+        db.session.add(user)
+        db.session.commit()
+        monkeypatch.setattr(password_hasher, 'ROUNDS', 5)
+
+        assert UserManager().authenticate_user("oldHash", "pwd123") is not None
+        stored = db.session.get(User, user.user_id).password
+        assert password_hasher.hash_rounds(stored) == 5
+        assert password_hasher.check_password("pwd123", stored) is True
+
+        assert UserManager().authenticate_user("oldHash", "wrong") is None
+        assert db.session.get(User, user.user_id).password == stored # no rehash on failed login
@@ -0,0 +1,117 @@
+import pytest
+from unittest.mock import patch
+from src.utils.rate_limiter import MemoryBackend, RedisBackend, LoginLimiter, RateLimited, login_limiter, make_backend
+from src.managers.UserManager import UserManager
+
+
+class _Clock:
+    def __init__(self): self.now = 1000.0
+    def __call__(self): return self.now
+
+
+class TestMemoryBackend:
+    def test_burst_then_refill(self):
+        clock = _Clock()
+        backend = MemoryBackend(clock=clock)
+        assert [backend.take("k", 3, 1.0)[0] for _ in range(4)] == [True, True, True, False]
+        assert backend.take("k", 3, 1.0) == (False, 1)
+
+        clock.now += 1
+        assert backend.take("k", 3, 1.0)[0] is True
+        assert backend.take("other", 3, 1.0)[0] is True # keys independent
+
+    def test_retry_after_reflects_refill_rate(self):
+        backend = MemoryBackend(clock=_Clock())
+        backend.take("k", 1, 1 / 60)
+        assert backend.take("k", 1, 1 / 60) == (False, 60)
+
+    def test_prune_drops_full_buckets(self):
+        clock = _Clock()
+        backend = MemoryBackend(max_keys=2, clock=clock)
+        backend.take("a", 2, 1.0)
+        backend.take("b", 2, 1.0)
+        clock.now += 5
+        backend.take("c", 2, 1.0)
+        assert set(backend._buckets) == {"c"}
+
+    def test_full_uses_each_buckets_own_limits(self):
+        clock = _Clock()
+        backend = MemoryBackend(clock=clock)
+        backend.take("user:a", 5, 10.0)
+        backend.take("ip:1", 30, 0.5)
+        clock.now += 1
+        backend.take("user:b", 5, 10.0) # ip bucket needs 2s to refill → kept, not judged by the user bucket's rate
+        assert list(backend._buckets) == ["ip:1", "user:b"]
+
+    def test_over_max_keys_evicts_lru(self):
+        backend = MemoryBackend(max_keys=2, clock=_Clock())
+        backend.take("a", 2, 1.0)
+        backend.take("b", 2, 1.0)
+        backend.take("a", 2, 1.0)
+        backend.take("c", 2, 1.0)
+        assert list(backend._buckets) == ["a", "c"]
+
+    def test_unknown_storage(self):
+        with pytest.raises(ValueError): make_backend("memcached://x")
+
+
+class TestLoginLimiter:
+    def test_username_limit_ignores_case(self):
+        limiter = LoginLimiter(backend=MemoryBackend(clock=_Clock()), ip_limit=(100, 60), user_limit=(2, 1))
+        limiter.check("1.1.1.1", "Victim")
+        limiter.check("2.2.2.2", "victim ")
+        with pytest.raises(RateLimited) as e: limiter.check("3.3.3.3", "VICTIM")
+        assert e.value.retry_after == 60
+
+    def test_success_resets_username_bucket(self):
+        limiter = LoginLimiter(backend=MemoryBackend(clock=_Clock()), ip_limit=(100, 60), user_limit=(1, 1))
+        limiter.check("1.1.1.1", "me")
+        limiter.login_succeeded("me")
+        limiter.check("1.1.1.1", "me")
+
+    def test_zero_burst_disables(self):
+        limiter = LoginLimiter(backend=MemoryBackend(clock=_Clock()), ip_limit=(0, 0), user_limit=(0, 0))
+        for _ in range(50): limiter.check("1.1.1.1", "me")
+
+    def test_login_route_sheds_before_authenticate(self, db_app):
+        client = db_app.test_client()
+        with patch.object(login_limiter, 'user_limit', (2, 1)), patch.object(UserManager, 'authenticate_user', return_value=None) as auth:
+            codes = [client.post("/api/v1/users/login", json={"username": "someone", "password": "guess"}).status_code for _ in range(4)]
+            resp = client.post("/api/v1/users/login", json={"username": "someone", "password": "guess"})
+
+        assert codes == [401, 401, 429, 429]
+        assert auth.call_count == 2 # rejected attempts never reach the db/bcrypt
+        assert resp.headers["Retry-After"] == "60"
+
+    def test_ip_bucket_per_client_behind_proxy(self, monkeypatch, request):
+        monkeypatch.setenv("TRUSTED_PROXY_HOPS", "1")
+        client = request.getfixturevalue("db_app").test_client()
+        with patch.object(login_limiter, 'ip_limit', (1, 1)), patch.object(UserManager, 'authenticate_user', return_value=None):
+            first = client.post("/api/v1/users/login", json={"username": "a", "password": "x"}, headers={"X-Forwarded-For": "9.9.9.1"})
+            other = client.post("/api/v1/users/login", json={"username": "b", "password": "x"}, headers={"X-Forwarded-For": "9.9.9.2"})
+            again = client.post("/api/v1/users/login", json={"username": "c", "password": "x"}, headers={"X-Forwarded-For": "9.9.9.1"})
+        assert (first.status_code, other.status_code, again.status_code) == (401, 401, 429) # same proxy ip, separate buckets
+
+    def test_forwarded_for_ignored_by_default(self, monkeypatch, request):
+        monkeypatch.delenv("TRUSTED_PROXY_HOPS", raising=False)
+        monkeypatch.delenv("RENDER", raising=False)
+        client = request.getfixturevalue("db_app").test_client()
+        with patch.object(login_limiter, 'ip_limit', (1, 1)), patch.object(UserManager, 'authenticate_user', return_value=None):
+            first = client.post("/api/v1/users/login", json={"username": "a", "password": "x"}, headers={"X-Forwarded-For": "9.9.9.1"})
+            forged = client.post("/api/v1/users/login", json={"username": "b", "password": "x"}, headers={"X-Forwarded-For": "9.9.9.2"})
+        assert (first.status_code, forged.status_code) == (401, 429) # direct hits → a forged header doesnt buy a fresh bucket
+
+
+class _FakeRedis:
+    def __init__(self, keys): self.keys = set(keys)
+    def scan_iter(self, match, count): return [k for k in self.keys if k.startswith(match[:-1])]
+    def delete(self, *keys): self.keys -= set(keys)
+
+
+class TestRedisBackend:
+    def test_clear_drops_only_own_prefix(self):
+        backend = object.__new__(RedisBackend) # no redis server here → skip __init__
+        backend.prefix = "ratelimit:"
+        backend.client = _FakeRedis({"ratelimit:ip:1", "ratelimit:user:bob", "session:42"})
+        backend.clear()
+        assert backend.client.keys == {"session:42"}
@@ -0,0 +1,39 @@
+import sys
+import json
+import logging
+import subprocess
+from src.utils.startup_profile import StartupProfiler
+
+
+class TestStartupProfiler:
+    def test_disabled_is_noop(self):
+        prof = StartupProfiler()
+        with prof.phase("anything"): pass
+        assert prof.phases == {}
+        assert prof.report() is None
+
+    def test_records_phases_and_imports(self, tmp_path, monkeypatch, caplog):
+        (tmp_path / "prof_pkg_outer.py").write_text("import time\ntime.sleep(0.02)\nimport prof_pkg_inner\n")
+        (tmp_path / "prof_pkg_inner.py").write_text("import time\ntime.sleep(0.03)\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        prof = StartupProfiler()
+        prof.enable()
+        try:
+            with prof.phase("load"): import prof_pkg_outer
+        finally:
+            with caplog.at_level(logging.INFO, logger="startup_profile"): res = prof.report()
+            for m in ("prof_pkg_outer", "prof_pkg_inner"): sys.modules.pop(m, None)
+
+        assert prof._hook not in sys.meta_path
+        assert res["phases_ms"]["load"] >= 50
+        outer_cum, outer_self = prof.imports["prof_pkg_outer"]
+        inner_cum, _ = prof.imports["prof_pkg_inner"]
+        assert outer_cum >= 50 and inner_cum >= 30
+        assert 20 <= outer_self < outer_cum # inner's time not double counted as outer's own
+        assert json.loads(caplog.records[-1].getMessage())["event"] == "startup_profile"
+
+    def test_app_import_skips_deferred_deps(self):
+        code = "import sys, src.app; print(sorted(m for m in ('requests', 'flask_migrate', 'alembic') if m in sys.modules))"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        assert out.strip().splitlines()[-1] == "[]"